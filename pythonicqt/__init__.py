@@ -1,4 +1,10 @@
-from pythonicqt.debounce import debounce
+from pythonicqt.debounce import (debounce, throttle, coalesce, connect_debounced,
+                                 connect_throttled, debounce_stats)
 from pythonicqt.models.listmodel import ListModel
 __all__ = [debounce,
+           throttle,
+           coalesce,
+           connect_debounced,
+           connect_throttled,
+           debounce_stats,
            ListModel]
\ No newline at end of file
@@ -1,65 +1,1118 @@
-"""module contains datastructures needed to create the @debounce decorator."""
+"""module contains datastructures needed to create the @debounce decorator.
+
+The timers only depend on Qt for their default TimerQueue, they can also run
+on an asyncio loop or on a ManualTimerQueue, see get_queue.
+"""
+import abc
+import bisect
+import heapq
+import inspect
+import itertools
+import math
+import threading
 import time
-from functools import wraps, partial
+import types
+import weakref
+import six
+from collections import OrderedDict
+from functools import partial, update_wrapper
 from pythonicqt.Qt import QtCore
 
-class DebounceTimer(QtCore.QTimer):
-    """Used with the debounce decorator, used for delaying/throttling calls."""
-    def __init__(self, msecs, fire_on_first=False, ignore_delayed=False):
-        self.is_setup = False
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+#time.monotonic is not affected by changes of the system clock, python 2 falls back to time.time.
+_clock = getattr(time, 'monotonic', time.time)
+_isawaitable = getattr(inspect, 'isawaitable', lambda value: False)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class BaseTimerQueue(object):
+    """Runs the pending calls of DebounceTimers when their deadlines pass.
+
+    The deadlines are kept in a heap and the queue only asks its event loop
+    for a wake up, for the earliest deadline, while a call is pending, so
+    debounced functions do not wake the event loop while they are idle.
+    Subclasses connect the queue to an event loop with _start and _stop.
+
+    Keyword Args:
+        clock (Optional[callable]): Returns the current time in seconds,
+            time.monotonic by default.
+    """
+
+    def __init__(self, clock=None):
+        self.clock = _clock if clock is None else clock
+        self._heap = []
+        self._counter = itertools.count()
+        self._wakeup = None
+
+    @property
+    def active(self):
+        """True while a wake up is requested from the event loop."""
+        return self._wakeup is not None
+
+    @abc.abstractmethod
+    def _start(self, seconds):
+        """Asks the event loop to call _run in seconds, replacing the previous request."""
+
+    @abc.abstractmethod
+    def _stop(self):
+        """Drops the wake up request."""
+
+    def spawn(self, awaitable):
+        """Runs the awaitable an async target returned on the asyncio loop
+        running in this thread, returns its future.
+
+        Raises:
+            TypeError: if no asyncio loop is running, pass the loop as the
+                backend to run async targets on a loop that is started later.
+        """
+        loop = _running_loop()
+        if loop is None:
+            close = getattr(awaitable, 'close', None)
+            if close is not None:
+                #avoids the never awaited warning of coroutines.
+                close()
+            raise TypeError("async targets need a running asyncio loop or an asyncio "
+                            "loop as the backend")
+        return asyncio.ensure_future(awaitable, loop=loop)
+
+    def schedule(self, entry, deadline):
+        """Makes sure entry._expire is called once deadline passes.
+
+        Moving a deadline later only updates entry.deadline, the entry is
+        pushed again when its old deadline comes up. Only an earlier deadline
+        pushes a new heap record right away.
+        """
+        entry.deadline = deadline
+        record = entry._record
+        if record is not None and record[0] <= deadline:
+            return
+        self._push(entry, deadline)
+        if self._heap[0] is entry._record:
+            self._arm()
+
+    def unschedule(self, entry):
+        """Drops the deadline of entry, re-arming the wake up for the next
+        deadline if entry was the earliest one."""
+        entry.deadline = None
+        record = entry._record
+        if record is None:
+            return
+        entry._record = None
+        if self._heap and self._heap[0] is record:
+            self._arm()
+
+    def _push(self, entry, deadline):
+        record = (deadline, next(self._counter), entry)
+        entry._record = record
+        heapq.heappush(self._heap, record)
+
+    def _arm(self):
+        """Drops cancelled records and requests a wake up for the earliest deadline."""
+        heap = self._heap
+        while heap and (heap[0][2]._record is not heap[0] or heap[0][2].deadline is None):
+            record = heapq.heappop(heap)
+            if record[2]._record is record:
+                record[2]._record = None
+        if not heap:
+            if self._wakeup is not None:
+                self._wakeup = None
+                self._stop()
+            return
+        self._wakeup = heap[0][0]
+        self._start(max(0.0, heap[0][0] - self.clock()))
+
+    def _run(self):
+        """Calls the entries whose deadline passed and requests the next wake up."""
+        heap = self._heap
+        now = self.clock()
+        try:
+            while heap and heap[0][0] <= now:
+                record = heapq.heappop(heap)
+                entry = record[2]
+                if entry._record is not record:
+                    continue
+                entry._record = None
+                if entry.deadline is None:
+                    continue
+                if entry.deadline > now:
+                    self._push(entry, entry.deadline)
+                else:
+                    entry._expire()
+        finally:
+            self._arm()
+
+    def __len__(self):
+        """Returns the number of entries waiting for their deadline."""
+        return sum(1 for record in self._heap
+                   if record[2]._record is record and record[2].deadline is not None)
+
+
+class TimerQueue(BaseTimerQueue):
+    """A BaseTimerQueue woken up by one single shot QTimer.
+
+    Use for_thread to get the queue of the current thread, the thread needs
+    a running Qt event loop.
+    """
+    _local = threading.local()
+
+    def __init__(self, clock=None):
+        super(TimerQueue, self).__init__(clock)
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run)
+
+    @classmethod
+    def for_thread(cls):
+        """Returns the queue of the current thread, creating it if needed."""
+        queue = getattr(cls._local, 'queue', None)
+        if queue is None:
+            queue = cls._local.queue = cls()
+        return queue
+
+    def _start(self, seconds):
+        self._timer.start(int(math.ceil(seconds * 1000)))
+
+    def _stop(self):
+        self._timer.stop()
+
+
+class AsyncioTimerQueue(BaseTimerQueue):
+    """A BaseTimerQueue woken up by an asyncio event loop, it uses the time of
+    the loop. Use for_loop to get the queue of a loop.
+
+    Args:
+        loop: The asyncio event loop.
+    """
+    _queues = weakref.WeakKeyDictionary()
+
+    def __init__(self, loop):
+        super(AsyncioTimerQueue, self).__init__(loop.time)
+        self.loop = loop
+        self._handle = None
+
+    @classmethod
+    def for_loop(cls, loop):
+        """Returns the queue of an event loop, creating it if needed."""
+        queue = cls._queues.get(loop)
+        if queue is None:
+            queue = cls._queues[loop] = cls(loop)
+        return queue
+
+    def _start(self, seconds):
+        self._stop()
+        self._handle = self.loop.call_later(seconds, self._run)
+
+    def _stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def spawn(self, awaitable):
+        """Runs the awaitable an async target returned on the loop, returns its future."""
+        return asyncio.ensure_future(awaitable, loop=self.loop)
+
+
+class ManualTimerQueue(BaseTimerQueue):
+    """A BaseTimerQueue without an event loop, its time only moves when advance
+    is called, which makes the timing of debounced calls deterministic in tests.
+
+        queue = ManualTimerQueue()
+        search = debounce(msecs=300, backend=queue)(search)
+        search('a')
+        queue.advance(300)
+        #search('a') ran.
+
+    Attributes:
+        time (float): The current time of the queue, in seconds.
+    """
+
+    def __init__(self):
+        super(ManualTimerQueue, self).__init__(self._now)
+        self.time = 0.0
+
+    def _now(self):
+        return self.time
+
+    def _start(self, seconds):
+        pass
+
+    def _stop(self):
+        pass
+
+    def advance(self, msecs):
+        """Moves the time forward by msecs, running the calls that come due in order."""
+        end = self.time + msecs / 1000.0
+        while self._wakeup is not None and self._wakeup <= end:
+            self.time = max(self.time, self._wakeup)
+            self._run()
+        self.time = end
+
+
+def get_queue(backend=None):
+    """Returns the BaseTimerQueue of a backend for the current thread.
+
+    Args:
+        backend: 'qt', 'asyncio', an asyncio event loop or a BaseTimerQueue.
+            'asyncio' uses the loop running in the thread, None picks it if
+            there is one, else qt.
+
+    Raises:
+        ValueError: if the backend is unknown.
+        RuntimeError: if the backend is 'asyncio' and no asyncio loop is running.
+    """
+    if isinstance(backend, BaseTimerQueue):
+        return backend
+    if asyncio is not None and isinstance(backend, asyncio.AbstractEventLoop):
+        return AsyncioTimerQueue.for_loop(backend)
+    loop = _running_loop()
+    if backend is None:
+        backend = 'qt' if loop is None else 'asyncio'
+    if backend == 'qt':
+        return TimerQueue.for_thread()
+    elif backend == 'asyncio' and asyncio is not None:
+        if loop is None:
+            raise RuntimeError("backend='asyncio' needs a running asyncio loop, pass "
+                               "the loop itself to use it before it runs")
+        return AsyncioTimerQueue.for_loop(loop)
+    raise ValueError("unknown debounce backend {!r}".format(backend))
+
+
+def _running_loop():
+    """Returns the asyncio loop running in this thread, or None."""
+    if asyncio is None:
+        return None
+    try:
+        return asyncio.get_running_loop()
+    except (AttributeError, RuntimeError):
+        return None
+
+
+class Histogram(object):
+    """Counts millisecond observations in buckets with fixed upper bounds.
+
+    Attributes:
+        bounds (tuple): The upper bound of every bucket, the last bucket holds
+            everything above the last bound.
+        counts (list): The number of observations of each bucket.
+        count (int): The number of observations.
+        total (float): The sum of the observations.
+        max (float): The largest observation.
+    """
+    bounds = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, msecs):
+        """Adds an observation."""
+        self.counts[bisect.bisect_left(self.bounds, msecs)] += 1
+        self.count += 1
+        self.total += msecs
+        if msecs > self.max:
+            self.max = msecs
+
+    @property
+    def mean(self):
+        """The mean of the observations, 0 without any."""
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self):
+        """Returns the histogram as plain python values, for exporting."""
+        buckets = OrderedDict(zip(self.bounds, self.counts))
+        buckets['inf'] = self.counts[-1]
+        return {'count': self.count, 'total': self.total, 'mean': self.mean,
+                'max': self.max, 'buckets': buckets}
+
+
+class DebounceStats(object):
+    """The statistics of one debounced function, shared by all of its instances.
+
+    Attributes:
+        name (str): The qualified name of the function.
+        msecs (int): The delay the function is debounced with.
+        calls (int): The calls received.
+        executed (int): The calls that ran.
+        immediate (int): The calls that ran right away, without a delay.
+        dropped (int): The calls dropped by ignore_delayed.
+        replaced (int): The pending calls replaced by a later call before they ran.
+        cancelled (int): The pending calls dropped with cancel.
+        delay (Histogram): The milliseconds from the call that started a
+            wait to the call that ended it.
+        execution (Histogram): The milliseconds the function ran, for async
+            functions only until the awaitable is returned.
+    """
+    counters = ('calls', 'executed', 'immediate', 'dropped', 'replaced', 'cancelled')
+
+    def __init__(self, name, msecs=None):
+        self.name = name
+        self.msecs = msecs
+        self.reset()
+
+    def reset(self):
+        """Sets the counters back to zero."""
+        for counter in self.counters:
+            setattr(self, counter, 0)
+        self.delay = Histogram()
+        self.execution = Histogram()
+
+    def as_dict(self):
+        """Returns the statistics as plain python values, for exporting."""
+        stats = dict((counter, getattr(self, counter)) for counter in self.counters)
+        stats.update(name=self.name, msecs=self.msecs, delay=self.delay.as_dict(),
+                     execution=self.execution.as_dict())
+        return stats
+
+
+class StatsRegistry(object):
+    """Keeps the DebounceStats of every debounced function, by name.
+
+    Recording is off until enable is called, until then the timers only
+    check the enabled attribute, use debounce_stats, the registry of the
+    timers.
+
+        debounce_stats.enable()
+        ...
+        for name, stats in debounce_stats.snapshot().items():
+            log(name, stats['calls'], stats['executed'], stats['delay']['mean'])
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Starts recording."""
+        self.enabled = True
+
+    def disable(self):
+        """Stops recording, the statistics are kept."""
+        self.enabled = False
+
+    def get(self, name, msecs=None):
+        """Returns the DebounceStats of a name, creating it if needed."""
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, DebounceStats(name, msecs))
+        return stats
+
+    def snapshot(self):
+        """Returns a dictionary of name -> the as_dict of its statistics."""
+        return dict((name, stats.as_dict()) for name, stats in list(self._stats.items()))
+
+    def reset(self):
+        """Sets the statistics of every name back to zero."""
+        for stats in list(self._stats.values()):
+            stats.reset()
+
+    def __iter__(self):
+        return iter(list(self._stats.values()))
+
+    def __len__(self):
+        return len(self._stats)
+
+
+debounce_stats = StatsRegistry()
+
+
+def _qualified_name(function):
+    """Returns the name the statistics of function are kept under."""
+    name = getattr(function, '__qualname__', None) or getattr(function, '__name__', None)
+    if name is None:
+        return None
+    module = getattr(function, '__module__', None)
+    return name if module is None else '{}.{}'.format(module, name)
+
+
+class DebounceTimer(object):
+    """Holds the pending call of a debounced function, used with the debounce
+    decorator for delaying/throttling calls.
+
+    Nothing runs while no call is pending, the deadline of a pending call
+    is handed to the timer queue of the backend, see get_queue. A target
+    that returns an awaitable, like an async def function, is run with the
+    spawn method of the queue.
+
+    Args:
+        msecs (int): The number of milliseconds calls are delayed by.
+
+    Keyword Args:
+        fire_on_first (bool): See debounce.
+        ignore_delayed (bool): See debounce.
+        backend: See get_queue.
+        name (Optional[str]): The name the statistics of the timer are kept under
+            in debounce_stats, timers without a name are not recorded.
+    """
+
+    def __init__(self, msecs, fire_on_first=False, ignore_delayed=False, backend=None,
+                 name=None):
         self.msecs_interval = msecs
         self.seconds_interval = msecs / 1000.0
-        self.last_update = time.time() - self.seconds_interval - 1
-        self.delayed_call = False
+        self.last_update = None
+        self.delayed_call = None
         self.fire_on_first = fire_on_first
         self.ignore_delayed = ignore_delayed
+        self.backend = backend
+        self.name = name
+        self.method = None
+        self.deadline = None
+        self.pending_since = None
+        self._record = None
+        self._queue = None
+
+    def _stats(self):
+        """Returns the DebounceStats of the timer while recording is enabled, else None."""
+        if not debounce_stats.enabled or self.name is None:
+            return None
+        return debounce_stats.get(self.name, self.msecs_interval)
+
+    def _get_queue(self):
+        """Returns the queue of the backend, it is looked up again whenever
+        nothing is scheduled."""
+        if self._record is None:
+            self._queue = get_queue(self.backend)
+        return self._queue
+
+    def _invoke(self, since, function, *args, **kwargs):
+        """Calls function, spawning the awaitable an async function returns.
+        since is the time the call started to wait, None if it did not wait."""
+        stats = self._stats()
+        clock = _clock if self._queue is None else self._queue.clock
+        started = clock()
+        try:
+            result = function(*args, **kwargs)
+            if _isawaitable(result):
+                result = self._get_queue().spawn(result)
+            return result
+        finally:
+            self.last_update = clock()
+            if stats is not None:
+                stats.executed += 1
+                if since is None:
+                    stats.immediate += 1
+                    stats.delay.observe(0.0)
+                else:
+                    stats.delay.observe((started - since) * 1000)
+                stats.execution.observe((self.last_update - started) * 1000)
+
+    @property
+    def pending(self):
+        """True while a delayed call is waiting."""
+        return self.delayed_call is not None
+
+    def call(self, function, *args, **kwargs):
+        """Calls function now if fire_on_first allows it, else delays the call
+        until msecs after the most recent call."""
+        queue = self._get_queue()
+        now = queue.clock()
+        stats = self._stats()
+        if stats is not None:
+            stats.calls += 1
+        if self.fire_on_first and (self.last_update is None or
+                                   now - self.last_update > self.seconds_interval):
+            if stats is not None and self.pending:
+                stats.replaced += 1
+            self._clear()
+            self._invoke(None, function, *args, **kwargs)
+            return
+        if stats is not None:
+            if self.ignore_delayed:
+                stats.dropped += 1
+            elif self.pending:
+                stats.replaced += 1
+        if not self.ignore_delayed:
+            if self.delayed_call is None:
+                self.pending_since = now
+            self.delayed_call = partial(function, *args, **kwargs)
+        if self.delayed_call is not None:
+            queue.schedule(self, now + self.seconds_interval)
+
+    def _unschedule(self):
+        """Removes the deadline from the timer queue, so a cancelled or flushed
+        call does not wake the event loop."""
+        self.deadline = None
+        if self._record is not None:
+            self._queue.unschedule(self)
+
+    def _clear(self):
+        """Forgets the pending call."""
+        self.delayed_call = None
+        self._unschedule()
+
+    def cancel(self):
+        """Drops the pending call, if any."""
+        if self.pending:
+            stats = self._stats()
+            if stats is not None:
+                stats.cancelled += 1
+        self._clear()
 
-    def setup_parent(self, parent):
-        """Needs the parent before this object can be setup."""
-        self.is_setup = True
-        QtCore.QTimer.__init__(self, parent)
-        self.timeout.connect(self.call_function)
-        self.setInterval(self.msecs_interval)
-        self.start()
-        
-    def call_function(self, *args):
-        """On timeout calls the delayed function if neccessary."""
-        self.stop()
-        if self.delayed_call:
-            self.delayed_call()
-            self.delayed_call = False
-            self.last_update = time.time()
-        self.start(self.msecs_interval)
-
-def debounce(msecs, fire_on_first=False, ignore_delayed=False):
+    def flush(self):
+        """Makes the pending call now, if there is one, and returns its result."""
+        delayed_call = self.delayed_call
+        if delayed_call is None:
+            return None
+        self._clear()
+        return self._invoke(self.pending_since, delayed_call)
+
+    def _expire(self):
+        """Called by the timer queue when the deadline passed."""
+        self.flush()
+
+
+class CoalesceTimer(DebounceTimer):
+    """Collects the arguments of the calls of a coalesced function and calls
+    it once with the whole batch, used with the coalesce decorator.
+
+    Args:
+        msecs (int): The number of milliseconds after the most recent call
+            the batch is delivered.
+
+    Keyword Args:
+        max_batch (Optional[int]): See coalesce.
+        max_wait (Optional[int]): See coalesce.
+        key (Optional[callable]): See coalesce.
+        backend: See get_queue.
+        name (Optional[str]): See DebounceTimer.
+    """
+
+    def __init__(self, msecs, max_batch=None, max_wait=None, key=None, backend=None,
+                 name=None):
+        super(CoalesceTimer, self).__init__(msecs, backend=backend, name=name)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.key = key
+        self.first_call = None
+        self._entries = None
+        self._target = None
+
+    @property
+    def pending(self):
+        """True while a batch is waiting."""
+        return self._entries is not None
+
+    def add(self, entry, function, instance=None):
+        """Adds entry to the batch that will be passed to function, or to the
+        method function of instance."""
+        queue = self._get_queue()
+        now = queue.clock()
+        stats = self._stats()
+        if stats is not None:
+            stats.calls += 1
+        if self._entries is None:
+            self._entries = [] if self.key is None else OrderedDict()
+            self.first_call = self.pending_since = now
+        self._target = (function, instance)
+        if self.key is None:
+            self._entries.append(entry)
+        else:
+            key = self.key(entry)
+            if stats is not None and key in self._entries:
+                stats.replaced += 1
+            self._entries[key] = entry
+        if self.max_batch is not None and len(self._entries) >= self.max_batch:
+            self.flush()
+            return
+        deadline = now + self.seconds_interval
+        if self.max_wait is not None:
+            deadline = min(deadline, self.first_call + self.max_wait / 1000.0)
+        queue.schedule(self, deadline)
+
+    def _clear(self):
+        """Forgets the pending batch."""
+        self._entries = None
+        self._target = None
+        self._unschedule()
+
+    def flush(self):
+        """Delivers the pending batch now, if there is one, and returns the result."""
+        entries = self._entries
+        if entries is None:
+            return None
+        function, instance = self._target
+        self._clear()
+        batch = entries if self.key is None else list(entries.values())
+        if instance is None:
+            return self._invoke(self.pending_since, function, batch)
+        return self._invoke(self.pending_since, function, instance, batch)
+
+
+class ThrottleTimer(DebounceTimer):
+    """A DebounceTimer that makes at most one call every msecs.
+
+    A call made after a quiet period runs right away, later calls are
+    delayed until msecs after the previous one ran and only the most recent
+    of them is made. Unlike debouncing, calls that keep coming do not push
+    the delayed call back.
+    """
+
+    def call(self, function, *args, **kwargs):
+        """Calls function now if msecs passed since the last call, else delays the
+        call until then."""
+        queue = self._get_queue()
+        now = queue.clock()
+        stats = self._stats()
+        if stats is not None:
+            stats.calls += 1
+        if not self.pending and (self.last_update is None or
+                                 now - self.last_update >= self.seconds_interval):
+            self._invoke(None, function, *args, **kwargs)
+            return
+        if self.pending:
+            if stats is not None:
+                stats.replaced += 1
+        else:
+            self.pending_since = now
+        self.delayed_call = partial(function, *args, **kwargs)
+        queue.schedule(self, self.last_update + self.seconds_interval)
+
+
+class _Pending(object):
+    """The pending attribute of debounced methods, it is true while a call of
+    its timer is waiting and calling it returns the same."""
+    __slots__ = ('timer',)
+
+    def __init__(self, timer):
+        self.timer = timer
+
+    def __call__(self):
+        return self.timer.pending
+
+    def __bool__(self):
+        return self.timer.pending
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return repr(self.timer.pending)
+
+
+class Debounced(object):
+    """The callable the debounce decorator returns.
+
+    Decorated methods keep one DebounceTimer per instance. Accessing the
+    method through an instance returns a real bound method, so signals can
+    connect and disconnect it and PySide drops the connection when the
+    instance is deleted. Its cancel and flush act on the pending call of that
+    instance and its pending attribute tells whether one is waiting. Calling
+    the method through the class with an instance uses the timer of the
+    instance too. Decorated functions have a single DebounceTimer.
+    """
+
+    def __init__(self, func, msecs, fire_on_first=False, ignore_delayed=False, backend=None):
+        update_wrapper(self, func)
+        self.func = func
+        self.msecs = msecs
+        self.fire_on_first = fire_on_first
+        self.ignore_delayed = ignore_delayed
+        self.backend = backend
+        self.stats_name = _qualified_name(func)
+        self._owner = None
+        self._timer = None
+
+    def __set_name__(self, owner, name):
+        self._owner = owner
+
+    def timer(self, instance=None):
+        """Returns the DebounceTimer of an instance, or of the function."""
+        if instance is None:
+            if self._timer is None:
+                self._timer = self._new_timer(None)
+            return self._timer
+        try:
+            timers = instance._debounce_timers
+        except AttributeError:
+            timers = instance._debounce_timers = {}
+        timer = timers.get(self.func)
+        if timer is None:
+            timer = timers[self.func] = self._new_timer(instance)
+            timer.method = self._new_method(timer)
+            destroyed = getattr(instance, 'destroyed', None)
+            if destroyed is not None:
+                #a QObject must not be called after it is deleted.
+                destroyed.connect(timer.cancel)
+        return timer
+
+    def _new_timer(self, instance):
+        return DebounceTimer(self.msecs, fire_on_first=self.fire_on_first,
+                             ignore_delayed=self.ignore_delayed, backend=self.backend,
+                             name=self.stats_name)
+
+    def _new_method(self, timer):
+        """Returns the function the methods of an instance are bound from, it
+        carries the cancel, flush and pending of the timer of the instance."""
+        debounced = self
+
+        def method(instance, *args, **kwargs):
+            debounced._call(instance, args, kwargs)
+        update_wrapper(method, self.func)
+        method.cancel = timer.cancel
+        method.flush = timer.flush
+        method.pending = _Pending(timer)
+        method.timer = timer
+        return method
+
+    def _call(self, instance, args, kwargs):
+        """Hands a call of the function, or of a method of instance, to its timer."""
+        if instance is None:
+            self.timer().call(self.func, *args, **kwargs)
+        else:
+            self.timer(instance).call(self.func, instance, *args, **kwargs)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            if self._owner is None:
+                #python 2 has no __set_name__.
+                self._owner = owner
+            return self
+        return types.MethodType(self.timer(instance).method, instance)
+
+    def __call__(self, *args, **kwargs):
+        if self._owner is not None and args and isinstance(args[0], self._owner):
+            self._call(args[0], args[1:], kwargs)
+        else:
+            self._call(None, args, kwargs)
+
+    def cancel(self):
+        """Drops the pending call of the function."""
+        self.timer().cancel()
+
+    def flush(self):
+        """Makes the pending call of the function now, returns its result."""
+        return self.timer().flush()
+
+    @property
+    def pending(self):
+        """True while a call of the function is waiting."""
+        return self.timer().pending
+
+
+class Coalesced(Debounced):
+    """The callable the coalesce decorator returns, see Debounced."""
+
+    def __init__(self, func, msecs, max_batch=None, max_wait=None, key=None, backend=None):
+        super(Coalesced, self).__init__(func, msecs, backend=backend)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.key = key
+
+    def _new_timer(self, instance):
+        return CoalesceTimer(self.msecs, max_batch=self.max_batch,
+                             max_wait=self.max_wait, key=self.key, backend=self.backend,
+                             name=self.stats_name)
+
+    def _call(self, instance, args, kwargs):
+        if kwargs:
+            raise TypeError("{} only takes positional arguments".format(self.__name__))
+        entry = args[0] if len(args) == 1 else args
+        self.timer(instance).add(entry, self.func, instance)
+
+
+class Throttled(Debounced):
+    """The callable the throttle decorator returns, see Debounced."""
+
+    def _new_timer(self, instance):
+        return ThrottleTimer(self.msecs, backend=self.backend, name=self.stats_name)
+
+
+def debounce(msecs, fire_on_first=False, ignore_delayed=False, backend=None):
     """Decorator that prevents a function from being called more than once every
     time period between calls. Postpones execution when threshold is breached.
-    If fire_on_first is True, calls are immediately propagated after the time threshold 
+    If fire_on_first is True, calls are immediately propagated after the time threshold
     passes, else the first calls are allows made after an entire msecs period after the
-    most recent call. 
+    most recent call. If ignore_delayed is True, calls that would be postponed are dropped.
         @debounce(msecs=1)
         def my_fun(self):
             pass
+
+    The pending call of a method can be dropped or made right away:
+        self.my_fun.cancel()
+        self.my_fun.flush()
+
+    Pending calls share one single shot QTimer per thread that is only
+    armed while a call is pending, see TimerQueue. Inside a running asyncio
+    loop they use the loop instead, backend selects 'qt', 'asyncio', an
+    asyncio loop or a BaseTimerQueue such as ManualTimerQueue explicitly, see
+    get_queue. async def functions are run as tasks and flush returns the
+    task, they need a running asyncio loop, or an asyncio loop as the
+    backend, the Qt backend raises TypeError for them otherwise.
+
+    While debounce_stats is enabled, the calls of every decorated function
+    are counted under its qualified name, see StatsRegistry.
     """
     def wrap_wrapper(func):
-        @wraps(func)
-        def wrapper(instance, *args, **kwargs):
-            if not hasattr(instance, "__debounce_dict"):
-                instance.__debounce_dict = {}
-            if func not in instance.__debounce_dict:
-                new_timer = DebounceTimer(msecs, fire_on_first=fire_on_first, ignore_delayed=ignore_delayed)
-                instance.__debounce_dict[func] = new_timer
-                new_timer.setup_parent(instance)
-            debounce_timer = instance.__debounce_dict[func]
-            debounce_timer.stop()
-            difference = time.time() - debounce_timer.last_update 
-            if difference > debounce_timer.seconds_interval and debounce_timer.fire_on_first:
-                debounce_timer.delayed_call = False
-                func(instance, *args, **kwargs)
-                debounce_timer.last_update = time.time()
+        return Debounced(func, msecs, fire_on_first=fire_on_first,
+                         ignore_delayed=ignore_delayed, backend=backend)
+    return wrap_wrapper
+
+
+def throttle(msecs, backend=None):
+    """Decorator that calls a function at most once every msecs. A call after a
+    quiet period runs right away, the most recent of the calls that come
+    sooner runs msecs after the previous call, see ThrottleTimer.
+        @throttle(msecs=100)
+        def progress(self, value):
+            pass
+
+    cancel, flush, pending and backend work like they do for debounce.
+    """
+    def wrap_wrapper(func):
+        return Throttled(func, msecs, backend=backend)
+    return wrap_wrapper
+
+
+def coalesce(msecs, max_batch=None, max_wait=None, key=None, backend=None):
+    """Decorator that collects the arguments of every call and calls the function
+    once, msecs after the most recent call, with the list of them. A call with a
+    single argument adds that argument to the list, a call with several adds the
+    tuple of them.
+        @coalesce(msecs=16, key=lambda row: row)
+        def rows_changed(self, rows):
+            pass
+
+        self.rows_changed(4)
+        self.rows_changed(9)
+        #rows_changed(self, [4, 9]) is called once.
+
+    Keyword Args:
+        max_batch (Optional[int]): Delivers the batch right away once it has
+            this many entries.
+        max_wait (Optional[int]): The most milliseconds the first call of a batch
+            waits, even if calls keep coming.
+        key (Optional[callable]): Returns the key of an entry. Entries with the
+            same key replace each other, the last one wins and keeps the place of
+            the first one.
+
+    cancel, flush, pending and backend work like they do for debounce.
+    """
+    def wrap_wrapper(func):
+        return Coalesced(func, msecs, max_batch=max_batch, max_wait=max_wait, key=key,
+                         backend=backend)
+    return wrap_wrapper
+
+
+def _max_args(function):
+    """Returns the most positional arguments function takes, None if there is no limit."""
+    getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+    try:
+        spec = getargspec(function)
+    except TypeError:
+        return None
+    if spec.varargs is not None:
+        return None
+    count = len(spec.args)
+    if inspect.ismethod(function) and function.__self__ is not None:
+        count -= 1
+    return count
+
+
+def _index_range(args):
+    """Returns whether args start with the topLeft and bottomRight of a dataChanged."""
+    return (len(args) >= 2 and isinstance(args[0], QtCore.QModelIndex) and
+            isinstance(args[1], QtCore.QModelIndex))
+
+
+def merge_ranges(previous, args):
+    """Merges the arguments of two dataChanged emissions into the bounding range
+    of both, with the roles of both. An empty list of roles means every role.
+
+    Returns:
+        tuple: The merged arguments, or None if the ranges are of different parents.
+    """
+    top_left, bottom_right = previous[:2]
+    new_top_left, new_bottom_right = args[:2]
+    model = top_left.model()
+    parent = top_left.parent()
+    if new_top_left.model() != model or new_top_left.parent() != parent:
+        return None
+    merged = (model.index(min(top_left.row(), new_top_left.row()),
+                          min(top_left.column(), new_top_left.column()), parent),
+              model.index(max(bottom_right.row(), new_bottom_right.row()),
+                          max(bottom_right.column(), new_bottom_right.column()), parent))
+    if len(previous) > 2 and len(args) > 2:
+        roles, new_roles = previous[2], args[2]
+        if roles and new_roles:
+            roles = list(roles) + [role for role in new_roles if role not in roles]
+        else:
+            roles = []
+        return merged + (roles,) + tuple(args[3:])
+    return merged + tuple(args[2:])
+
+
+class DebouncedConnection(object):
+    """A connection of a signal to a slot that debounces or throttles the calls,
+    made with connect_debounced.
+
+    A slot that is a method of a QObject is held with a weak reference to the
+    object, and the connection disconnects itself when the object is destroyed.
+    Other slots, such as functions and lambdas, are kept until disconnect is
+    called, unless a receiver is given, which is also only weakly referenced.
+    Only the signal holds the connection, so it goes away with the sender.
+
+    Attributes:
+        signal: The connected signal.
+        merge (Optional[callable]): See connect_debounced.
+    """
+    _modes = {
+        'trailing': DebounceTimer,
+        'leading': lambda msecs, backend, name: DebounceTimer(msecs, fire_on_first=True,
+                                                              ignore_delayed=True,
+                                                              backend=backend, name=name),
+        'throttle': ThrottleTimer,
+        }
+    #the connections that are still connected, the signal keeps them alive.
+    _connected = weakref.WeakSet()
+
+    def __init__(self, signal, slot, msecs, mode='trailing', receiver=None, merge=None,
+                 backend=None):
+        if mode not in self._modes:
+            raise ValueError("mode must be one of {}, not {!r}".format(sorted(self._modes), mode))
+        self.signal = signal
+        self.merge = merge
+        self._timer = self._modes[mode](msecs, backend=backend, name=_qualified_name(slot))
+        self._max_args = _max_args(slot)
+        slot_self = getattr(slot, '__self__', None)
+        self._bound = isinstance(slot_self, QtCore.QObject)
+        if self._bound:
+            receiver = slot_self
+            #methods of Qt classes have no __func__, look them up on the class.
+            self._function = getattr(slot, '__func__', None) or getattr(type(slot_self),
+                                                                        slot.__name__)
+        else:
+            self._function = slot
+        self._receiver_ref = None if receiver is None else weakref.ref(receiver)
+        #Qt holds a function until the connection or the sender is gone, and
+        #the function holds the connection.
+        def emitted(*args):
+            self._emitted(*args)
+        self._emitted_slot = weakref.ref(emitted)
+        #the receiver must not keep the connection, or the connection the receiver.
+        connection_ref = weakref.ref(self)
+        def destroyed(*args):
+            connection = connection_ref()
+            if connection is not None:
+                #Qt already dropped the connections of the receiver.
+                connection._receiver_ref = None
+                connection.disconnect()
+        self._destroyed_slot = destroyed
+        if receiver is not None:
+            receiver.destroyed.connect(destroyed)
+        signal.connect(emitted)
+        self._connected.add(self)
+
+    @property
+    def pending(self):
+        """True while a delayed call of the slot is waiting."""
+        return self._timer.pending
+
+    def _merge(self, previous, args):
+        """Returns the arguments of the next call, given the pending ones, or None
+        if the pending call has to be made first."""
+        if self.merge is not None:
+            return self.merge(previous, args)
+        if _index_range(previous) and _index_range(args):
+            return merge_ranges(previous, args)
+        return args
+
+    def _emitted(self, *args):
+        timer = self._timer
+        if self._max_args is not None:
+            args = args[:self._max_args]
+        if timer.pending:
+            merged = self._merge(timer.delayed_call.args, args)
+            if merged is None:
+                timer.flush()
             else:
-                if not debounce_timer.ignore_delayed:
-                    debounce_timer.delayed_call = partial(func, instance, *args, **kwargs)
-            debounce_timer.start(debounce_timer.msecs_interval)
-        return wrapper
-    return wrap_wrapper
\ No newline at end of file
+                args = merged
+        timer.call(self._call_slot, *args)
+
+    def _call_slot(self, *args):
+        if not self._bound:
+            return self._function(*args)
+        receiver = self._receiver_ref()
+        if receiver is None:
+            self.disconnect()
+            return None
+        return self._function(receiver, *args)
+
+    def cancel(self):
+        """Drops the pending call of the slot."""
+        self._timer.cancel()
+
+    def flush(self):
+        """Makes the pending call of the slot now, returns its result."""
+        return self._timer.flush()
+
+    def disconnect(self):
+        """Disconnects the slot from the signal and drops the pending call."""
+        self._timer.cancel()
+        if self not in self._connected:
+            return
+        self._connected.discard(self)
+        emitted = self._emitted_slot()
+        try:
+            if emitted is not None:
+                self.signal.disconnect(emitted)
+        except (RuntimeError, TypeError):
+            #the sender is already destroyed.
+            pass
+        receiver = None if self._receiver_ref is None else self._receiver_ref()
+        if receiver is not None:
+            try:
+                receiver.destroyed.disconnect(self._destroyed_slot)
+            except (RuntimeError, TypeError):
+                pass
+
+
+def connect_debounced(signal, slot, msecs, mode='trailing', receiver=None, merge=None,
+                      backend=None):
+    """Connects signal to slot and rate limits the calls of the slot, without
+    changing the slot.
+        connection = connect_debounced(spin_box.valueChanged, self.update_label, 200)
+        connect_debounced(model.dataChanged, view_refresh, 16, mode='throttle')
+
+    Modes:
+        trailing: the slot is called msecs after the most recent emission, with
+            its arguments.
+        leading: the first emission calls the slot right away, emissions in the
+            next msecs are dropped.
+        throttle: the slot is called at most once every msecs, the first emission
+            right away and the most recent of the following ones msecs after it.
+
+    A delayed dataChanged keeps the bounding range of all of the ranges emitted
+    while it waited. The slot gets only as many arguments as it takes, like Qt
+    slots, so a lambda without arguments works.
+
+    Keyword Args:
+        mode (str): 'trailing', 'leading' or 'throttle'.
+        receiver (Optional[QObject]): The connection is dropped when the receiver
+            is destroyed. Methods of QObjects use their object by default.
+        merge (Optional[callable]): Returns the arguments of the delayed call from
+            the pending arguments and the new ones, or None to make the pending
+            call first. By default dataChanged ranges are merged and other
+            arguments are replaced.
+        backend: See get_queue.
+
+    Returns:
+        DebouncedConnection: with disconnect, cancel, flush and pending.
+
+    Raises:
+        ValueError: if mode is not one of the modes.
+    """
+    return DebouncedConnection(signal, slot, msecs, mode=mode, receiver=receiver, merge=merge,
+                               backend=backend)
+
+
+def connect_throttled(signal, slot, msecs, receiver=None, merge=None, backend=None):
+    """Connects signal to slot, calling the slot at most once every msecs,
+    see connect_debounced."""
+    return DebouncedConnection(signal, slot, msecs, mode='throttle', receiver=receiver,
+                               merge=merge, backend=backend)
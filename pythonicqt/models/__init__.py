@@ -1 +1,11 @@
-from pythonicqt.models.listmodel import ListModel
\ No newline at end of file
+from pythonicqt.models.listmodel import ListModel
+from pythonicqt.models.table_model import TableModel
+from pythonicqt.models.dictmodel import DictModel
+from pythonicqt.models.sparsemodel import SparseTableModel
+from pythonicqt.models.treemodel import TreeModel
+from pythonicqt.models.lazylistmodel import LazyListModel
+from pythonicqt.models.sortedlistmodel import SortedListModel
+from pythonicqt.models.filtermodel import FilterListModel
+from pythonicqt.models.mappedmodel import MappedListModel
+from pythonicqt.models.producer import ListProducer
+from pythonicqt.models.modelitems import ItemContainer, CompactItem
\ No newline at end of file
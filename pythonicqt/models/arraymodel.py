@@ -0,0 +1,285 @@
+"""This module contains the ArrayTableModel class, a table model backed
+by a numpy ndarray.
+
+numpy is only needed when this module is imported.
+"""
+
+import numpy
+import six
+from pythonicqt.Qt import QtCore
+from pythonicqt.baseclasses import QtMetaStitch
+
+
+@six.add_metaclass(QtMetaStitch)
+class ArrayTableModel(QtCore.QAbstractTableModel):
+    """A QAbstractTableModel that shows the cells of a numpy array.
+
+    Cells are read directly from the array, there is no per cell python
+    object. A 2-D array gives rows and columns, a 1-D structured (record)
+    array gives one column per field named after the field, any other 1-D
+    array is a single column.
+
+    Change blocks of cells through the values attribute or update_block,
+    each change emits one dataChanged covering the rectangle it touched.
+
+        model.values[:, 3] = new_column
+        model.values['price'] = prices
+        model.update_block(10, 2, block)
+
+    Keyword Args:
+        array (array_like): The data of the model, it is not copied if it is
+            already an ndarray.
+        formatters (Optional[dict]): Maps column numbers or field names to
+            callables that return the DisplayRole string of a cell value.
+        editable (bool): If True, views can edit the cells.
+
+    Attributes:
+        default_formatter (callable): Formats cells of columns without a formatter.
+    """
+    default_formatter = unicode
+
+    def __init__(self, array, formatters=None, editable=False):
+        super(ArrayTableModel, self).__init__()
+        self.editable = editable
+        self._formatters = {}
+        self._set_array(array)
+        for column, formatter in six.iteritems(formatters or {}):
+            self._formatters[self._column_number(column)] = formatter
+
+    def _set_array(self, array):
+        """Stores the array and the per column views used to read cells."""
+        array = numpy.asanyarray(array)
+        self._array = array
+        if array.dtype.names is not None:
+            if array.ndim != 1:
+                raise ValueError("structured arrays must be 1-D, not {}-D".format(array.ndim))
+            self.column_names = list(array.dtype.names)
+            self._columns = [array[name] for name in self.column_names]
+        else:
+            if array.ndim == 1:
+                array = array.reshape(-1, 1)
+            elif array.ndim != 2:
+                raise ValueError("arrays must be 1-D or 2-D, not {}-D".format(array.ndim))
+            self.column_names = None
+            self._columns = [array[:, column] for column in range(array.shape[1])]
+        self.values = _ArrayValues(self)
+
+    @property
+    def array(self):
+        """The numpy array of the model. Changing it directly does not update
+        views, use values, update_block or set_array."""
+        return self._array
+
+    def set_array(self, array):
+        """Replaces the array with a single model reset."""
+        self.beginResetModel()
+        self._set_array(array)
+        self.endResetModel()
+
+    def _column_number(self, column):
+        """Converts a field name to its column number."""
+        if isinstance(column, six.string_types):
+            if self.column_names is None:
+                raise KeyError("only structured arrays have named columns")
+            return self.column_names.index(column)
+        return column
+
+    def set_formatter(self, column, formatter):
+        """Sets the DisplayRole formatter of a column number or field name,
+        None restores the default formatter."""
+        column = self._column_number(column)
+        if formatter is None:
+            self._formatters.pop(column, None)
+        else:
+            self._formatters[column] = formatter
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, column), self.index(self.rowCount() - 1, column))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Returns the number of rows of the array.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return len(self._array)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """Returns the number of columns or fields of the array.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """Returns the field names of structured arrays, else the section number.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal and self.column_names is not None:
+            return self.column_names[section]
+        return unicode(section)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Returns the cell value for EditRole and the formatted value for DisplayRole.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            column = index.column()
+            value = self._columns[column][index.row()]
+            return self._formatters.get(column, self.default_formatter)(value)
+        elif role == QtCore.Qt.EditRole:
+            value = self._columns[index.column()][index.row()]
+            if isinstance(value, numpy.generic):
+                #Qt can not convert numpy scalars.
+                return value.item()
+            return value
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Sets a cell of the array.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        try:
+            self._columns[index.column()][index.row()] = value
+        except (TypeError, ValueError):
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        """Returns the QtCore.Qt.ItemFlags of the cells, editable if the model is.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self.editable:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def update_block(self, row, column, block):
+        """Writes a 2-D block of values with its top left corner at row, column
+        and emits one dataChanged for the block."""
+        block = numpy.asanyarray(block)
+        if block.ndim == 1:
+            block = block.reshape(1, -1)
+        rows, columns = block.shape
+        if self.column_names is None:
+            self._array_2d()[row:row + rows, column:column + columns] = block
+        else:
+            for offset in range(columns):
+                self._columns[column + offset][row:row + rows] = block[:, offset]
+        self._emit_block(row, row + rows - 1, column, column + columns - 1)
+
+    def _array_2d(self):
+        """Returns the array as a 2-D view."""
+        if self._array.ndim == 1:
+            return self._array.reshape(-1, 1)
+        return self._array
+
+    def _emit_block(self, first_row, last_row, first_column, last_column):
+        """Emits dataChanged for a rectangle of cells, clipped to the table."""
+        last_row = min(last_row, self.rowCount() - 1)
+        last_column = min(last_column, self.columnCount() - 1)
+        if first_row > last_row or first_column > last_column:
+            return
+        self.dataChanged.emit(self.index(first_row, first_column),
+                              self.index(last_row, last_column))
+
+    def _key_bounds(self, key):
+        """Returns the (first_row, last_row, first_column, last_column) rectangle
+        a numpy index touches. Falls back to the entire table."""
+        rows, columns = self.rowCount(), self.columnCount()
+        everything = (0, rows - 1, 0, columns - 1)
+        try:
+            if isinstance(key, numpy.ndarray) and key.dtype == bool and key.ndim == 2:
+                touched_rows, touched_columns = numpy.nonzero(key)
+            else:
+                if not isinstance(key, tuple):
+                    key = (key,)
+                if self.column_names is not None:
+                    row_key, column_key = self._split_field_key(key)
+                else:
+                    row_key = key[0]
+                    column_key = key[1] if len(key) > 1 else slice(None)
+                    if len(key) > 2 or row_key is Ellipsis or column_key is Ellipsis:
+                        return everything
+                touched_rows = numpy.arange(rows)[row_key]
+                touched_columns = numpy.arange(columns)[column_key]
+        except (IndexError, TypeError, ValueError):
+            return everything
+        touched_rows = numpy.atleast_1d(touched_rows)
+        touched_columns = numpy.atleast_1d(touched_columns)
+        if not touched_rows.size or not touched_columns.size:
+            return None
+        return (touched_rows.min(), touched_rows.max(),
+                touched_columns.min(), touched_columns.max())
+
+    def _split_field_key(self, key):
+        """Splits a structured array index into its row index and column numbers."""
+        names = [part for part in key if isinstance(part, six.string_types)]
+        row_parts = [part for part in key if not isinstance(part, six.string_types)]
+        if len(row_parts) > 1:
+            raise IndexError("structured arrays have one row dimension")
+        row_key = row_parts[0] if row_parts else slice(None)
+        if names:
+            column_key = [self.column_names.index(name) for name in names]
+        else:
+            column_key = slice(None)
+        return row_key, column_key
+
+
+class _ArrayValues(object):
+    """The values attribute of an ArrayTableModel.
+
+    Reading returns the same result as indexing the array. Writing
+    assigns to the array and emits one dataChanged for the bounding
+    rectangle of the cells that changed.
+    """
+
+    def __init__(self, model):
+        self._model = model
+
+    def __getitem__(self, key):
+        return self._model._array[key]
+
+    def __setitem__(self, key, value):
+        model = self._model
+        bounds = model._key_bounds(key)
+        if model.column_names is not None and isinstance(key, tuple):
+            #numpy wants the field first and the rows second, so assign per field.
+            row_key, column_key = model._split_field_key(key)
+            if not isinstance(column_key, list):
+                column_key = range(model.columnCount())
+            per_column = len(column_key) > 1 and numpy.ndim(value) == 2
+            for offset, column in enumerate(column_key):
+                column_value = numpy.asanyarray(value)[:, offset] if per_column else value
+                model._columns[column][row_key] = column_value
+        else:
+            model._array[key] = value
+        if bounds is not None:
+            model._emit_block(*bounds)
+
+    def __len__(self):
+        return len(self._model._array)
+
+    def __array__(self, dtype=None):
+        return numpy.asarray(self._model._array, dtype=dtype)
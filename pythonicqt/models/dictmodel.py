@@ -0,0 +1,378 @@
+"""This module contains the class and data structures that make
+the DictModel class.
+
+"""
+
+import six
+from collections import MutableMapping
+from pythonicqt.Qt import QtCore
+from pythonicqt.baseclasses import QtMetaStitch
+from pythonicqt.models.modelitems import ItemContainer
+
+
+@six.add_metaclass(QtMetaStitch)
+class BaseDictModel(QtCore.QAbstractTableModel):
+    """"A working implimentation of QAbstractTableModel for ordered key, value pairs.
+
+    Column 0 holds the keys and column 1 the values, in insertion order.
+    self._keys and self._values are python lists of the rows and
+    self._positions maps each key to a slot, its row when it was appended.
+    Removing a row leaves a tombstone in its slot and a Fenwick tree counts
+    the tombstones, so the row of a key is its slot minus the tombstones
+    before it and lookups stay O(log n) however deletes and upserts mix.
+    The slots are renumbered once half of them are tombstones.
+
+    Roles other than DisplayRole and EditRole are stored sparsely per
+    (key, column), so they follow their key when rows move.
+
+    Keyword Args:
+        items (Optional[mapping or iterable]): The starting key, value pairs.
+        headers (Optional[tuple]): The horizontal header text of the two columns.
+
+    Attributes:
+        default_data (dict): The default flags and roles of the cells.
+    """
+    default_data = ItemContainer.default_data
+    key_column = 0
+    value_column = 1
+
+    def __init__(self, items=None, headers=(u'Key', u'Value')):
+        super(BaseDictModel, self).__init__()
+        self.headers = headers
+        self._keys = []
+        self._values = []
+        self._positions = {}
+        self._tombstones = [0]
+        self._dead = 0
+        self._roles = {}
+        if items is not None:
+            if hasattr(items, 'keys'):
+                items = [(key, items[key]) for key in items.keys()]
+            for key, value in items:
+                if key in self._positions:
+                    self._values[self._positions[key]] = value
+                else:
+                    self._positions[key] = len(self._keys)
+                    self._keys.append(key)
+                    self._values.append(value)
+            self._tombstones = [0] * (len(self._keys) + 1)
+
+    def row_of(self, key):
+        """Returns the row of key.
+
+        Raises:
+            KeyError: if the key is not in the model.
+        """
+        slot = self._positions[key]
+        if not self._dead:
+            return slot
+        tree = self._tombstones
+        dead = 0
+        i = slot
+        while i:
+            dead += tree[i]
+            i &= i - 1
+        return slot - dead
+
+    def key_at(self, row):
+        """Returns the key of row."""
+        return self._keys[row]
+
+    def _new_slot(self):
+        """Returns the slot of a key appended after the last row."""
+        tree = self._tombstones
+        slot = len(tree) - 1
+        if self._dead:
+            #The new node of the Fenwick tree covers the tombstones of the
+            #slots in (slot + 1 - lowbit, slot].
+            low = (slot + 1) & slot
+            dead = 0
+            i = slot
+            while i > low:
+                dead += tree[i]
+                i &= i - 1
+            tree.append(dead)
+        else:
+            tree.append(0)
+        return slot
+
+    def _forget(self, key):
+        """Removes key from the positions and leaves a tombstone in its slot,
+        the key must be removed from the lists too."""
+        slot = self._positions.pop(key)
+        self._dead += 1
+        tree = self._tombstones
+        if self._dead * 2 > len(tree) - 1:
+            self._renumber()
+            return
+        i = slot + 1
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+
+    def _renumber(self):
+        """Sets the slot of every key to its row, dropping the tombstones."""
+        positions = self._positions
+        for row, key in enumerate(self._keys):
+            positions[key] = row
+        self._tombstones = [0] * (len(self._keys) + 1)
+        self._dead = 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """Returns 2, the key and the value column.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return 2
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Returns the number of keys.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return len(self._keys)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """Returns the column headers, or the row number.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal and 0 <= section < len(self.headers):
+            return self.headers[section]
+        return unicode(section)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Returns the key or value of a row for EditRole, a unicode version of it
+        for DisplayRole, else the role set for the cell or the default_data.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        column_values = self._keys if column == self.key_column else self._values
+        if self._roles:
+            roles = self._roles.get((self._keys[row], column))
+            if roles is not None and role in roles:
+                return roles[role]
+        if role == QtCore.Qt.EditRole:
+            return column_values[row]
+        elif role == QtCore.Qt.DisplayRole:
+            return unicode(column_values[row])
+        return self.default_data.get(role)
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Sets the value of a row, or any other role of a key or value cell.
+        Keys can not be changed through EditRole.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return False
+        row, column = index.row(), index.column()
+        if role == QtCore.Qt.EditRole:
+            if column == self.key_column:
+                return False
+            self._values[row] = value
+        else:
+            self._roles.setdefault((self._keys[row], column), {})[role] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        """Returns the QtCore.Qt.ItemFlags of a cell, keys are not editable.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = self.data(index, QtCore.Qt.ItemFlags)
+        if index.column() == self.key_column:
+            flags &= ~QtCore.Qt.ItemIsEditable
+        return flags
+
+
+class DictModel(MutableMapping, BaseDictModel):
+    """A python OrderedDict like implimentation of a QAbstractTableModel.
+
+    Instances of this class function as both a QAbstractTableModel and an
+    ordered python dictionary (MutableMapping specifically). Keys are kept
+    in insertion order, setting an existing key updates its row in place and
+    a new key is appended as a new row.
+
+        model = DictModel()
+        model['AAPL'] = 1.0
+        model.update({'MSFT': 2.0, 'AAPL': 1.5})
+
+    Note:
+        This object emits one signal in addition to the signals emited by
+            QAbstractTableModel.
+        DictCleared (Signal()): Emited when the dictionary is cleared.
+    """
+    DictCleared = QtCore.Signal()
+
+    def _value_changed(self, first, last):
+        """Emits dataChanged for the values of rows first through last."""
+        self.dataChanged.emit(self.index(first, self.value_column),
+                              self.index(last, self.value_column))
+
+    #MutableMapping Abstract Methods
+    def __getitem__(self, key):
+        """Returns the value of key.
+
+        Note:
+            This method is an abstract method required for MutableMapping.
+        """
+        return self._values[self.row_of(key)]
+
+    def __setitem__(self, key, value):
+        """Sets the value of key, appending a row if the key is new.
+
+        Note:
+            This method is an abstract method required for MutableMapping.
+        """
+        try:
+            row = self.row_of(key)
+        except KeyError:
+            self._append_items([(key, value)])
+            return
+        self._values[row] = value
+        self._value_changed(row, row)
+
+    def __delitem__(self, key):
+        """Removes key and its row.
+
+        Note:
+            This method is an abstract method required for MutableMapping.
+        """
+        row = self.row_of(key)
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._keys[row]
+        del self._values[row]
+        self._forget(key)
+        for column in (self.key_column, self.value_column):
+            self._roles.pop((key, column), None)
+        self.endRemoveRows()
+
+    def __iter__(self):
+        """Iterates over the keys in order.
+
+        Note:
+            This method is an abstract method required for MutableMapping.
+        """
+        return iter(list(self._keys))
+
+    def __len__(self):
+        """Returns the number of keys.
+
+        Note:
+            This method is an abstract method required for MutableMapping.
+        """
+        return len(self._keys)
+
+    def __contains__(self, key):
+        """Returns whether key is in the dictionary, without a lookup of its row."""
+        return key in self._positions
+
+    def _append_items(self, items):
+        """Appends new key, value pairs as one row range."""
+        if not items:
+            return
+        first = len(self._keys)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(items) - 1)
+        for key, value in items:
+            self._positions[key] = self._new_slot()
+            self._keys.append(key)
+            self._values.append(value)
+        self.endInsertRows()
+
+    def update(self, *args, **kwargs):
+        """Updates the dictionary like dict.update.
+
+        Existing keys are changed in place and emit one dataChanged per
+        contiguous run of rows, new keys are appended as one row range.
+        """
+        if len(args) > 1:
+            raise TypeError("update expected at most 1 arguments, got {}".format(len(args)))
+        items = []
+        if args:
+            other = args[0]
+            if hasattr(other, 'keys'):
+                items.extend((key, other[key]) for key in other.keys())
+            else:
+                items.extend(other)
+        items.extend(six.iteritems(kwargs))
+        changed = set()
+        new_items = []
+        new_rows = {}
+        for key, value in items:
+            if key in new_rows:
+                new_items[new_rows[key]] = (key, value)
+            elif key in self._positions:
+                row = self.row_of(key)
+                self._values[row] = value
+                changed.add(row)
+            else:
+                new_rows[key] = len(new_items)
+                new_items.append((key, value))
+        first = None
+        for row in sorted(changed):
+            if first is None:
+                first = last = row
+            elif row == last + 1:
+                last = row
+            else:
+                self._value_changed(first, last)
+                first = last = row
+        if first is not None:
+            self._value_changed(first, last)
+        self._append_items(new_items)
+
+    def clear(self):
+        """Removes every key with a single model reset and emits DictCleared."""
+        self.beginResetModel()
+        self._keys = []
+        self._values = []
+        self._positions = {}
+        self._tombstones = [0]
+        self._dead = 0
+        self._roles = {}
+        self.endResetModel()
+        self.DictCleared.emit()
+
+    #Index needs to use QAbstractTableModel Index
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        """Returns the QModelIndex from the underlying model.
+
+        Note:
+            This method overrides the virtual function of QAbstractTableModel.
+        """
+        return QtCore.QAbstractTableModel.index(self, row, column, parent)
+
+    def __repr__(self):
+        """The representation of the object, does not include roles and flags."""
+        return "{}({!r})".format(self.__class__.__name__, list(zip(self._keys, self._values)))
+
+    def __eq__(self, other):
+        """Returns whether the items equal another mapping, ignoring order like dict."""
+        try:
+            return dict(zip(self._keys, self._values)) == dict(other.items())
+        except (AttributeError, TypeError):
+            return NotImplemented
+
+    def __ne__(self, other):
+        """Returns whether the items do not equal another mapping."""
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
@@ -0,0 +1,516 @@
+"""This module contains the FilterListModel class, a filtering and
+sorting proxy of a ListModel that works on the python values.
+
+"""
+
+import six
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Sequence, namedtuple
+from pythonicqt.Qt import QtCore
+from pythonicqt.baseclasses import QtMetaStitch
+from pythonicqt.models.listmodel import ListModel
+
+#The key of source rows that are filtered out.
+_EXCLUDED = object()
+
+_Settings = namedtuple('_Settings', 'predicate predicate_batch key key_batch reverse')
+
+
+class _ReverseKey(object):
+    """Wraps a sort key so that bisect and sorted order it descending."""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __ne__(self, other):
+        return self.key != other.key
+
+
+def _evaluate(function, in_batch, values):
+    """Calls function on every value, or once on the list of values if in_batch."""
+    if in_batch:
+        return list(function(values))
+    return [function(value) for value in values]
+
+
+@six.add_metaclass(QtMetaStitch)
+class _BaseFilterListModel(QtCore.QAbstractListModel):
+    """Stitches the Qt metaclass so FilterListModel can mix in Sequence."""
+
+
+class FilterListModel(Sequence, _BaseFilterListModel):
+    """A proxy of a ListModel that shows the rows whose value passes a
+    predicate, optionally sorted by a key function.
+
+    Unlike QSortFilterProxyModel it never calls data() to filter, the
+    predicate and key are evaluated on the python values of the source,
+    and changes of the source only evaluate the rows that changed. Row
+    insertions and removals of the source become insertions and removals
+    of the proxy rows they affect, dataChanged re-filters the changed rows.
+
+    The predicate and key can evaluate a whole list of values at once,
+    pass batch=True to set_filter or set_sort, for example to use a
+    compiled regular expression or numpy on all of the values.
+
+        proxy = FilterListModel(model, lambda value: 'foo' in value)
+        view.setModel(proxy)
+        proxy.set_filter(lambda value: 'bar' in value, background=True)
+
+    The proxy is also a read only python sequence of the values it shows.
+
+    Note:
+        FilterListModel.index is the QAbstractListModel.index method,
+        use index_of for the Sequence method.
+
+    Keyword Args:
+        source (ListModel): The model to filter.
+        predicate (Optional[callable]): Returns whether a value is shown, every
+            value is shown if None.
+        key (Optional[callable]): Returns the sort key of a value, rows stay in
+            source order if None.
+        reverse (bool): If True, sorts in descending order.
+    """
+    _refiltered = QtCore.Signal(object)
+
+    def __init__(self, source, predicate=None, key=None, reverse=False):
+        super(FilterListModel, self).__init__()
+        self.source = source
+        #the settings of the shown rows, and the latest settings.
+        self._active = self._settings = _Settings(predicate, False, key, False, reverse)
+        self._generation = 0
+        self._worker_generation = None
+        #the row of every source row in the values of the running worker,
+        #None for the rows that changed since they were copied.
+        self._worker_rows = None
+        self._rows = []
+        self._keys = None
+        self._key_of = None
+        self._refiltered.connect(self._apply_refilter, QtCore.Qt.QueuedConnection)
+        source.rowsInserted.connect(self._source_inserted)
+        source.rowsRemoved.connect(self._source_removed)
+        source.rowsMoved.connect(self._source_moved)
+        source.dataChanged.connect(self._source_changed)
+        source.modelAboutToBeReset.connect(self._source_about_to_reset)
+        source.modelReset.connect(self._source_reset)
+        source.layoutChanged.connect(self.invalidate)
+        self._set_mapping(*self._filter_all())
+
+    #Settings
+    def set_filter(self, predicate, batch=False, background=False):
+        """Sets the predicate and re-filters every row.
+
+        Args:
+            predicate (Optional[callable]): Returns whether a value is shown.
+
+        Keyword Args:
+            batch (bool): If True, predicate is called with a list of values
+                and returns an iterable of booleans.
+            background (bool): If True, re-filters in a worker thread, see invalidate_async.
+        """
+        self._settings = self._settings._replace(predicate=predicate, predicate_batch=batch)
+        self._refilter(background)
+
+    def set_sort(self, key=None, reverse=False, batch=False, background=False):
+        """Sets the sort key and re-sorts every row. A key of None keeps the source order.
+
+        Keyword Args:
+            batch (bool): If True, key is called with a list of values and
+                returns an iterable of keys.
+            background (bool): If True, re-sorts in a worker thread, see invalidate_async.
+        """
+        self._settings = self._settings._replace(key=key, key_batch=batch, reverse=reverse)
+        self._refilter(background)
+
+    def _refilter(self, background):
+        if background:
+            self.invalidate_async()
+        else:
+            self.invalidate()
+
+    #Filtering
+    def _filter(self, first, values, settings=None):
+        """Returns the source rows of the values that pass the predicate and,
+        when sorting, their keys. values start at source row first. Uses the
+        settings of the shown rows by default."""
+        if settings is None:
+            settings = self._active
+        if settings.predicate is None:
+            rows = list(range(first, first + len(values)))
+        else:
+            passed = _evaluate(settings.predicate, settings.predicate_batch, values)
+            rows = [first + offset for offset, ok in enumerate(passed) if ok]
+        if settings.key is None:
+            return rows, None
+        keys = _evaluate(settings.key, settings.key_batch, [values[row - first] for row in rows])
+        if settings.reverse:
+            keys = [_ReverseKey(key) for key in keys]
+        return rows, keys
+
+    def _filter_all(self, values=None, settings=None):
+        """Returns (source row count, rows, keys) for all of the source values."""
+        if values is None:
+            values = self.source[:]
+        return (len(values),) + self._filter(0, values, settings)
+
+    def _set_mapping(self, count, rows, keys):
+        """Replaces the mapping without notifying views."""
+        if keys is None:
+            self._rows, self._keys, self._key_of = rows, None, None
+            return
+        order = sorted(range(len(rows)), key=keys.__getitem__)
+        self._rows = [rows[position] for position in order]
+        self._keys = [keys[position] for position in order]
+        self._key_of = [_EXCLUDED] * count
+        for row, key in zip(rows, keys):
+            self._key_of[row] = key
+
+    def invalidate(self):
+        """Re-filters and re-sorts every row with a single model reset."""
+        self._generation += 1
+        self._worker_generation = None
+        self._worker_rows = None
+        self._active = self._settings
+        mapping = self._filter_all()
+        self.beginResetModel()
+        self._set_mapping(*mapping)
+        self.endResetModel()
+
+    def invalidate_async(self):
+        """Re-filters and re-sorts every row in a worker thread.
+
+        The values are copied here, the predicate and key run in the worker
+        and the new mapping is swapped in with a model reset once the event
+        loop gets the result. Until then the proxy keeps showing, and
+        updating, the previous result with the previous settings. If the
+        source changes while the worker runs, the result is still used, only
+        the rows that were inserted or changed since the copy are filtered
+        again when it is swapped in.
+        """
+        self._generation += 1
+        self._worker_generation = self._generation
+        values = self.source[:]
+        self._worker_rows = list(range(len(values)))
+        worker = threading.Thread(target=self._filter_in_thread,
+                                  args=(self._generation, self._settings, values))
+        worker.daemon = True
+        worker.start()
+
+    def _filter_in_thread(self, generation, settings, values):
+        self._refiltered.emit((generation, settings, self._filter_all(values, settings)))
+
+    def _apply_refilter(self, result):
+        generation, settings, mapping = result
+        if generation != self._worker_generation:
+            #an invalidate or a newer worker replaced this one.
+            return
+        worker_rows = self._worker_rows
+        self._worker_generation = None
+        self._worker_rows = None
+        count, rows, keys = mapping
+        if worker_rows != list(range(count)):
+            mapping = self._catch_up(worker_rows, settings, count, rows, keys)
+        self._active = settings
+        self.beginResetModel()
+        self._set_mapping(*mapping)
+        self.endResetModel()
+
+    def _catch_up(self, worker_rows, settings, count, rows, keys):
+        """Returns the mapping of the current source rows from the mapping a
+        worker made of its copy, filtering only the rows that changed since."""
+        if keys is None:
+            keys = [None] * len(rows)
+        worker_keys = [_EXCLUDED] * count
+        for row, key in zip(rows, keys):
+            worker_keys[row] = key
+        changed = [row for row, worker_row in enumerate(worker_rows) if worker_row is None]
+        get_value = self.source._container.get_value
+        offsets, changed_keys = self._filter(0, [get_value(row) for row in changed], settings)
+        if changed_keys is None:
+            changed_keys = [None] * len(offsets)
+        for offset, key in zip(offsets, changed_keys):
+            worker_rows[changed[offset]] = len(worker_keys)
+            worker_keys.append(key)
+        rows, keys = [], []
+        for row, worker_row in enumerate(worker_rows):
+            if worker_row is not None and worker_keys[worker_row] is not _EXCLUDED:
+                rows.append(row)
+                keys.append(worker_keys[worker_row])
+        return len(worker_rows), rows, keys if settings.key is not None else None
+
+    #Mapping
+    def source_row(self, row):
+        """Returns the source row of a proxy row."""
+        return self._rows[row]
+
+    def proxy_row(self, source_row):
+        """Returns the proxy row of a source row, -1 if it is filtered out."""
+        if self._keys is None:
+            row = bisect_left(self._rows, source_row)
+            if row < len(self._rows) and self._rows[row] == source_row:
+                return row
+            return -1
+        key = self._key_of[source_row]
+        if key is _EXCLUDED:
+            return -1
+        row = bisect_left(self._keys, key)
+        #rows with equal keys are scanned.
+        while self._rows[row] != source_row:
+            row += 1
+        return row
+
+    def mapToSource(self, index):
+        """Returns the source QModelIndex of a proxy QModelIndex."""
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        return self.source.index(self._rows[index.row()], 0)
+
+    def mapFromSource(self, index):
+        """Returns the proxy QModelIndex of a source QModelIndex, invalid if
+        the row is filtered out."""
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        row = self.proxy_row(index.row())
+        if row < 0:
+            return QtCore.QModelIndex()
+        return self.index(row, 0)
+
+    def _insert_rows(self, rows, keys):
+        """Inserts source rows into the proxy, one beginInsertRows per run of
+        rows that go before the same proxy row."""
+        if not rows:
+            return
+        if self._keys is None:
+            entries = [(bisect_left(self._rows, row), row, None) for row in rows]
+        else:
+            for row, key in zip(rows, keys):
+                self._key_of[row] = key
+            order = sorted(range(len(rows)), key=keys.__getitem__)
+            entries = [(bisect_right(self._keys, keys[position]), rows[position], keys[position])
+                       for position in order]
+        runs = []
+        for position, row, key in entries:
+            if runs and runs[-1][0] == position:
+                runs[-1][1].append(row)
+                runs[-1][2].append(key)
+            else:
+                runs.append((position, [row], [key]))
+        #last run first so the positions of the earlier runs stay valid.
+        for position, run_rows, run_keys in reversed(runs):
+            self.beginInsertRows(QtCore.QModelIndex(), position, position + len(run_rows) - 1)
+            self._rows[position:position] = run_rows
+            if self._keys is not None:
+                self._keys[position:position] = run_keys
+            self.endInsertRows()
+
+    def _remove_rows(self, proxy_rows):
+        """Removes proxy rows, one beginRemoveRows per contiguous run."""
+        for first, last in reversed(ListModel._contiguous_runs(proxy_rows)):
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            if self._keys is not None:
+                del self._keys[first:last + 1]
+            self.endRemoveRows()
+
+    def _shift(self, first, count):
+        """Adds count to the source rows from first on."""
+        if self._keys is None:
+            start = bisect_left(self._rows, first)
+            if start < len(self._rows):
+                self._rows[start:] = [row + count for row in self._rows[start:]]
+        elif first < len(self._key_of):
+            self._rows = [row + count if row >= first else row for row in self._rows]
+
+    #Source signals
+    def _source_inserted(self, parent, first, last):
+        count = last - first + 1
+        if self._worker_rows is not None:
+            self._worker_rows[first:first] = [None] * count
+        self._shift(first, count)
+        if self._key_of is not None:
+            self._key_of[first:first] = [_EXCLUDED] * count
+        self._insert_rows(*self._filter(first, self.source[first:last + 1]))
+
+    def _source_removed(self, parent, first, last):
+        if self._worker_rows is not None:
+            del self._worker_rows[first:last + 1]
+        if self._keys is None:
+            proxy_rows = range(bisect_left(self._rows, first), bisect_right(self._rows, last))
+        else:
+            proxy_rows = [row for row in map(self.proxy_row, range(first, last + 1)) if row >= 0]
+        self._remove_rows(proxy_rows)
+        self._shift(last + 1, first - last - 1)
+        if self._key_of is not None:
+            del self._key_of[first:last + 1]
+
+    def _source_moved(self, parent, start, end, destination_parent, destination):
+        count = end - start + 1
+        to = destination if destination < start else destination - count
+        if self._worker_rows is not None:
+            block = self._worker_rows[start:end + 1]
+            del self._worker_rows[start:end + 1]
+            self._worker_rows[to:to] = block
+
+        def moved(row):
+            if start <= row <= end:
+                return to + row - start
+            if row > end:
+                row -= count
+            if row >= to:
+                row += count
+            return row
+
+        if self._keys is not None:
+            #the sort order does not depend on the source rows.
+            self._rows = [moved(row) for row in self._rows]
+            keys = self._key_of[start:end + 1]
+            del self._key_of[start:end + 1]
+            self._key_of[to:to] = keys
+            return
+        first = bisect_left(self._rows, start)
+        last = bisect_right(self._rows, end) - 1
+        proxy_destination = bisect_left(self._rows, destination)
+        announce = first <= last and not first <= proxy_destination <= last + 1
+        if announce:
+            self.beginMoveRows(QtCore.QModelIndex(), first, last,
+                               QtCore.QModelIndex(), proxy_destination)
+            block = self._rows[first:last + 1]
+            del self._rows[first:last + 1]
+            if proxy_destination > last:
+                proxy_destination -= len(block)
+            self._rows[proxy_destination:proxy_destination] = block
+        self._rows = [moved(row) for row in self._rows]
+        if announce:
+            self.endMoveRows()
+
+    def _source_changed(self, top, bottom, roles=None):
+        first, last = top.row(), bottom.row()
+        if self._worker_rows is not None:
+            self._worker_rows[first:last + 1] = [None] * (last - first + 1)
+        rows, keys = self._filter(first, self.source[first:last + 1])
+        if self._keys is None:
+            start = bisect_left(self._rows, first)
+            stop = bisect_right(self._rows, last)
+            old_rows = self._rows[start:stop]
+            if old_rows != rows:
+                shown = set(rows)
+                self._remove_rows([start + offset for offset, row in enumerate(old_rows)
+                                   if row not in shown])
+                old_rows = set(old_rows)
+                self._insert_rows([row for row in rows if row not in old_rows], None)
+                start = bisect_left(self._rows, first)
+                stop = bisect_right(self._rows, last)
+            changed = range(start, stop)
+        else:
+            new_keys = dict(zip(rows, keys))
+            removed, added, added_keys, stayed = [], [], [], []
+            for row in range(first, last + 1):
+                old_key = self._key_of[row]
+                new_key = new_keys.get(row, _EXCLUDED)
+                if old_key is not _EXCLUDED:
+                    if new_key is not _EXCLUDED and not new_key != old_key:
+                        stayed.append(row)
+                        continue
+                    removed.append(self.proxy_row(row))
+                    self._key_of[row] = _EXCLUDED
+                if new_key is not _EXCLUDED:
+                    added.append(row)
+                    added_keys.append(new_key)
+            self._remove_rows(removed)
+            self._insert_rows(added, added_keys)
+            changed = [self.proxy_row(row) for row in stayed]
+        if changed:
+            self.dataChanged.emit(self.index(min(changed), 0), self.index(max(changed), 0))
+
+    def _source_about_to_reset(self):
+        self.beginResetModel()
+
+    def _source_reset(self):
+        if self._worker_rows is not None:
+            self._worker_rows = [None] * len(self.source)
+        self._set_mapping(*self._filter_all())
+        self.endResetModel()
+
+    #QAbstractListModel methods
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Returns the number of rows that pass the filter.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Returns the data of the source row.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return None
+        return self.source.data(self.mapToSource(index), role)
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Sets the data of the source row.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return False
+        return self.source.setData(self.mapToSource(index), value, role)
+
+    def flags(self, index):
+        """Returns the flags of the source row.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return self.source.flags(self.mapToSource(index))
+
+    def index(self, row, column=0, parent=QtCore.QModelIndex()):
+        """Returns the QModelIndex of a proxy row.
+
+        Note:
+            This method overrides the virtual function of QAbstractListModel.
+            This is not the Sequence.index method. That is index_of.
+        """
+        return QtCore.QAbstractListModel.index(self, row, column, parent)
+
+    #Sequence Abstract Methods
+    def __getitem__(self, idx):
+        """Returns the value of a proxy row, or a list of values for a slice."""
+        get_value = self.source._container.get_value
+        if isinstance(idx, slice):
+            return [get_value(row) for row in self._rows[idx]]
+        return get_value(self._rows[idx])
+
+    def __len__(self):
+        """Returns the number of rows that pass the filter."""
+        return len(self._rows)
+
+    def index_of(self, value):
+        """Returns the first proxy row holding value, like list.index."""
+        return super(FilterListModel, self).index(value)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, list(self))
+
+    def __eq__(self, *args):
+        """Returns whether the shown values equal another list."""
+        return list(self).__eq__(*args)
+
+    def __ne__(self, *args):
+        """Returns whether the shown values are not equal to another list."""
+        return list(self).__ne__(*args)
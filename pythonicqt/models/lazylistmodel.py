@@ -0,0 +1,225 @@
+"""This module contains the LazyListModel class, a ListModel that
+is populated incrementally from an iterable.
+
+"""
+
+from itertools import chain, islice
+from pythonicqt.models.listmodel import ListModel
+from pythonicqt.models.modelitems import ItemContainer
+
+
+class LazyListModel(ListModel):
+    """A ListModel that pulls its values from an iterable as they are needed.
+
+    Views call canFetchMore and fetchMore as the user scrolls, each fetch
+    takes the next batch_size values from the source and inserts them as a
+    single range. Nothing is read from the source up front, so a model can
+    be built from a generator of millions of values and show its first rows
+    immediately.
+
+    The python list interface still behaves like a list of every value in
+    the source. Indexing and iterating read only as far into the source as
+    they need to, while len, negative indices, appending and comparisons
+    read the rest of the source first. rowCount is the number of rows read
+    so far.
+
+    Keyword Args:
+        source (Optional[iterable]): The values of the list, read lazily.
+        batch_size (int): The number of values fetchMore reads at a time.
+        chunked (bool): If True, source yields sequences of values instead of values.
+        item_factory(object): The item container that handles item roles and flags along
+            with the data.
+
+    """
+
+    def __init__(self, source=None, batch_size=256, chunked=False, item_factory=ItemContainer):
+        super(LazyListModel, self).__init__(item_factory=item_factory)
+        if source is None:
+            source = []
+        if chunked:
+            source = chain.from_iterable(source)
+        self._source = iter(source)
+        self.batch_size = batch_size
+
+    @property
+    def exhausted(self):
+        """True once every value of the source has been read."""
+        return self._source is None
+
+    def fetch(self, count):
+        """Reads up to count values from the source and appends them as one range.
+        Returns the number of values read."""
+        if self._source is None:
+            return 0
+        values = list(islice(self._source, count))
+        if len(values) < count:
+            self._source = None
+        if values:
+            self.insert_many(len(self._container), values)
+        return len(values)
+
+    def fetch_all(self):
+        """Reads every remaining value of the source."""
+        if self._source is None:
+            return
+        values = list(self._source)
+        self._source = None
+        if values:
+            self.insert_many(len(self._container), values)
+
+    def _ensure_loaded(self, count=None):
+        """Reads whole batches from the source until at least count rows are
+        loaded. If count is None, reads the entire source."""
+        if count is None:
+            self.fetch_all()
+            return
+        missing = count - len(self._container)
+        if missing > 0:
+            batches = -(-missing // self.batch_size)
+            self.fetch(batches * self.batch_size)
+
+    def _ensure_idx(self, idx):
+        """Loads the rows an int or slice index refers to."""
+        if isinstance(idx, slice):
+            start, stop, step = idx.start, idx.stop, idx.step
+            if (step is not None and step < 0) or stop is None or stop < 0 or \
+                    (start is not None and start < 0):
+                self._ensure_loaded()
+            else:
+                self._ensure_loaded(stop)
+        elif idx < 0:
+            self._ensure_loaded()
+        else:
+            self._ensure_loaded(idx + 1)
+
+    def canFetchMore(self, parent):
+        """Returns True while the source may have more values.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+
+        """
+        if parent.isValid():
+            return False
+        return self._source is not None
+
+    def fetchMore(self, parent):
+        """Reads the next batch_size values from the source.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+
+        """
+        if parent.isValid():
+            return
+        self.fetch(self.batch_size)
+
+    def __getitem__(self, idx):
+        """See ListModel.__getitem__, reads the source up to idx."""
+        self._ensure_idx(idx)
+        return super(LazyListModel, self).__getitem__(idx)
+
+    def __setitem__(self, idx, value):
+        """See ListModel.__setitem__, reads the source up to idx."""
+        self._ensure_idx(idx)
+        super(LazyListModel, self).__setitem__(idx, value)
+
+    def __delitem__(self, idx):
+        """See ListModel.__delitem__, reads the source up to idx."""
+        self._ensure_idx(idx)
+        super(LazyListModel, self).__delitem__(idx)
+
+    def __len__(self):
+        """Returns the length of the entire list, reading the rest of the source."""
+        self._ensure_loaded()
+        return len(self._container)
+
+    def __iter__(self):
+        """Iterates over the values, reading the source one batch at a time."""
+        row = 0
+        while True:
+            if row >= len(self._container):
+                self._ensure_loaded(row + 1)
+                if row >= len(self._container):
+                    return
+            yield self._container.get_value(row)
+            row += 1
+
+    def insert(self, idx, value):
+        """See ListModel.insert, reads the source up to idx."""
+        self._ensure_loaded(idx if idx >= 0 else None)
+        super(LazyListModel, self).insert(idx, value)
+
+    def insert_many(self, idx, values):
+        """See ListModel.insert_many, reads the source up to idx."""
+        self._ensure_loaded(idx if idx >= 0 else None)
+        super(LazyListModel, self).insert_many(idx, values)
+
+    def extend(self, values):
+        """Appends the values after every value of the source."""
+        if values is self:
+            values = list(values)
+        self._ensure_loaded()
+        super(LazyListModel, self).extend(values)
+
+    def index_of(self, item):
+        """See ListModel.index_of, the value index only knows loaded rows
+        so the rest of the source is read when it is in use."""
+        if self._value_index is not None:
+            self._ensure_loaded()
+        return super(LazyListModel, self).index_of(item)
+
+    def count(self, item):
+        """See ListModel.count."""
+        self._ensure_loaded()
+        return super(LazyListModel, self).count(item)
+
+    def sort(self, key=None, reverse=False):
+        """See ListModel.sort, the rest of the source is read first."""
+        self._ensure_loaded()
+        super(LazyListModel, self).sort(key, reverse)
+
+    def reverse(self):
+        """See ListModel.reverse, the rest of the source is read first."""
+        self._ensure_loaded()
+        super(LazyListModel, self).reverse()
+
+    def move(self, src, dst):
+        """See ListModel.move, the rest of the source is read first."""
+        self._ensure_loaded()
+        super(LazyListModel, self).move(src, dst)
+
+    def move_range(self, first, last, dst):
+        """See ListModel.move_range, the rest of the source is read first."""
+        self._ensure_loaded()
+        super(LazyListModel, self).move_range(first, last, dst)
+
+    def rotate(self, steps=1):
+        """See ListModel.rotate, the rest of the source is read first."""
+        self._ensure_loaded()
+        super(LazyListModel, self).rotate(steps)
+
+    def assign(self, values, key=None, reset_threshold=None):
+        """See ListModel.assign, the rest of the source is read first so the
+        whole list is compared with values."""
+        self._ensure_loaded()
+        super(LazyListModel, self).assign(values, key, reset_threshold)
+
+    def reset(self, values=()):
+        """See ListModel.reset, the rest of the source is discarded."""
+        self._source = None
+        super(LazyListModel, self).reset(values)
+
+    def snapshot(self):
+        """See ListModel.snapshot, the rest of the source is read first so the
+        snapshot holds every value."""
+        self._ensure_loaded()
+        return super(LazyListModel, self).snapshot()
+
+    def __copy__(self, deep_copy_memo=None):
+        """See BaseListModel.__copy__, the rest of the source is read first
+        so the copy holds every value."""
+        self._ensure_loaded()
+        new_instance = super(LazyListModel, self).__copy__(deep_copy_memo)
+        new_instance._source = None
+        return new_instance
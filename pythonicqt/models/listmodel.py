@@ -4,10 +4,14 @@ the ListModel class.
 """
 
 import six
-from collections import MutableSequence
+import threading
+import weakref
+from bisect import bisect_left
+from collections import MutableSequence, Sequence
+from contextlib import contextmanager
 from pythonicqt.Qt import QtCore
 from pythonicqt.baseclasses import QtMetaStitch
-from pythonicqt.models.modelitems import ItemContainer
+from pythonicqt.models.modelitems import ItemContainer, ItemList
 
 @six.add_metaclass(QtMetaStitch)
 class BaseListModel(QtCore.QAbstractListModel):
@@ -19,6 +23,10 @@ class BaseListModel(QtCore.QAbstractListModel):
     instance of item_factory. The intention of thie class is to impliment the Qt
     QAbstractList model methods fully. 
 
+    The type of self._container is the list_factory attribute of the item_factory,
+    ItemList by default. Pass item_factory=CompactItem to store the values in a
+    single list with sparse roles instead of one ItemContainer per row.
+
     You can use this model as-is, but in pythonicqt the primary purpose is 
     the ListModel subclass of it.
 
@@ -35,7 +43,12 @@ class BaseListModel(QtCore.QAbstractListModel):
         if container is None:
             container = []
         self._item_factory = item_factory
-        self._container = [item_factory(e) for e in container] 
+        self._container = self._new_container(container)
+
+    def _new_container(self, values):
+        """Returns a new storage container of the item_factory holding values."""
+        list_factory = getattr(self._item_factory, 'list_factory', ItemList)
+        return list_factory(values, item_factory=self._item_factory)
 
 
     def columnCount(self, parent=None):
@@ -90,10 +103,14 @@ class BaseListModel(QtCore.QAbstractListModel):
         if not index.isValid():
             return None
         row = index.row()
-        self._container[row][role] = value
-        self.dataChanged.emit(index, index)
+        self._container.set_role(row, role, value)
+        self._data_changed(row, row)
         return True
 
+    def _data_changed(self, first, last):
+        """Emits dataChanged for the rows first through last."""
+        self.dataChanged.emit(self.index(first, 0), self.index(last, 0))
+
     def data(self, index, role=QtCore.Qt.DisplayRole):
         """Returns the data of a role at a specific index of the list.
         If the role is DisplayRole or EditRole, returns the value located
@@ -113,7 +130,7 @@ class BaseListModel(QtCore.QAbstractListModel):
             return None
         row, column = index.row(), index.column()
         try:
-            return self._container[row][role]
+            return self._container.get_role(row, role)
         except KeyError as e:
             return None
     
@@ -131,26 +148,25 @@ class BaseListModel(QtCore.QAbstractListModel):
             return None
         row, column = index.row(), index.column()
         try:
-            return self._container[row][QtCore.Qt.ItemFlags]
+            return self._container.get_role(row, QtCore.Qt.ItemFlags)
         except KeyError as e:
             return None
 
     def __copy__(self, deep_copy_memo=None):
         """Makes a shallow copy of the list and returns a new model of it.
+        The new model has the same item_factory and a copy of every item,
+        so roles and flags can be changed independently.
         
         Keyword Args:
             deep_copy_memo (Optional[dict]): Only to be used by a __deepcopy__
                 implimentation. If deep_copy_memo is not None, it should be the 
-                memo argument of __deep__ copy. 
+                memo argument of __deep__ copy and the values are deep copied.
 
         """
-        cls = self.__class__
-        if deep_copy_memo is None:
-            #a bit redundant considerint __init__ copies anyway, but to be safe.
-            container = copy.copy(self._container)
-        else:
-            container = copy.deepcopy(self._container, deep_copy_memo)
-        new_instance = cls(self._container)
+        new_instance = self.__class__(item_factory=self._item_factory)
+        if deep_copy_memo is not None:
+            deep_copy_memo[id(self)] = new_instance
+        new_instance._container = self._container.copy(deep_copy_memo)
         return new_instance
 
     def __deepcopy__(self, memo):
@@ -172,64 +188,381 @@ class ListModel(MutableSequence, BaseListModel):
         ListModel.index_of is the method for MutableSequence.index. 
         ListModel.index is the QAbstractListModel.index method.
         
-        This object emits two signals in addition to the signals emited by
+        This object emits these signals in addition to the signals emited by
             QAbstractListModel.
         ListChanged (Signal(int, object)): A Qt Signal that emits when a value at
             an index in the list changes. Emits the index and previous value changed.
         ListCleared (Signal()): Emited when the list is cleared.
+        ListRangeInserted (Signal(int, int)): Emited once when a contiguous block
+            of values is inserted by extend, insert_many or +=. Emits the first
+            and last index of the new rows.
+        ListRangeRemoved (Signal(int, int)): Emited for each contiguous block
+            of rows removed by a slice operation. Emits the first and last index.
+        ListRangeChanged (Signal(int, int)): Emited once when the values of
+            several rows are replaced by a slice assignment. Emits the first and
+            last index of the rows that changed.
+        ListRangeMoved (Signal(int, int, int)): Emited when a block of rows is
+            moved. Emits the first and last index the rows had before the move
+            and the index the first row has after it.
+
+        Changes made inside a "with model.batch():" block are coalesced, see batch.
+
+    Attributes:
+        batch_range_threshold (int): The default number of separate changed
+            ranges a batch emits before emitting one dataChanged for the
+            bounding range instead.
+        batch_reset_threshold (int): The default number of row insertions and
+            removals a batch announces one by one before it switches to a
+            single model reset.
+        snapshot_chunk_size (int): The number of rows a snapshot copies at a
+            time when the list changes, see snapshot.
 
     """
     ListChanged = QtCore.Signal(int, object) 
     ListCleared = QtCore.Signal() 
+    ListRangeInserted = QtCore.Signal(int, int)
+    ListRangeRemoved = QtCore.Signal(int, int)
+    ListRangeChanged = QtCore.Signal(int, int)
+    ListRangeMoved = QtCore.Signal(int, int, int)
+    batch_range_threshold = 32
+    batch_reset_threshold = 32
+    snapshot_chunk_size = 1024
+    _batch = None
+    _value_index = None
+    _snapshots = ()
+
+    def use_value_index(self, enabled=True):
+        """Turns the hash index of values to rows on or off.
+
+        With the index on, index_of, count and the in operator look values up
+        in a dictionary instead of scanning the whole list. The index is updated
+        as values are set or appended. After rows are inserted or removed in the
+        middle of the list, lookups scan the list until a few of them happen in
+        a row, then the index is rebuilt. Unhashable values are still found,
+        they are compared one by one.
+        """
+        if not enabled:
+            self._value_index = None
+        elif self._value_index is None:
+            self._value_index = _ValueIndex(self)
+
+    def snapshot(self):
+        """Returns a read only ListSnapshot of the current values in constant time.
+
+        The snapshot shares the storage of the model. Before the model changes
+        rows that a snapshot still shares, the snapshot copies the values of
+        the chunks of snapshot_chunk_size rows that are about to change, so
+        only the parts of the list that change are ever copied. Appending
+        copies nothing. Snapshots can be read from other threads.
+
+            snapshot = model.snapshot()
+            threading.Thread(target=export, args=(snapshot,)).start()
+        """
+        snapshot = ListSnapshot(self._container, len(self._container), self.snapshot_chunk_size)
+        self._snapshots = list(self._snapshots) + [weakref.ref(snapshot)]
+        return snapshot
+
+    def _preserve(self, first, last=None):
+        """Lets the live snapshots copy rows first through last, or through the
+        end of the list if last is None, before they change. Forgets the
+        snapshots that are gone or no longer share the storage."""
+        sharing = []
+        for reference in self._snapshots:
+            snapshot = reference()
+            if snapshot is not None:
+                snapshot._preserve(first, last)
+                if snapshot._container is not None:
+                    sharing.append(reference)
+        self._snapshots = sharing
+
+    @contextmanager
+    def batch(self, range_threshold=None, reset_threshold=None):
+        """Context manager that coalesces the change notifications of the block.
+
+        Value changes inside the block are recorded and emitted on exit as
+        one dataChanged and ListRangeChanged per contiguous range of rows, or a
+        single bounding range when there are more than range_threshold of them.
+        ListChanged is not emitted for changes made inside a batch.
+
+        Row insertions and removals have to be announced while they happen, so
+        the first reset_threshold of them emit their usual row signals. After
+        that the batch switches to beginResetModel, makes the remaining changes
+        silently and calls endResetModel on exit.
+
+            with model.batch():
+                for row, value in updates:
+                    model[row] = value
 
+        Batches can be nested, only the outermost one emits.
+
+        Keyword Args:
+            range_threshold (Optional[int]): Overrides batch_range_threshold.
+            reset_threshold (Optional[int]): Overrides batch_reset_threshold.
+        """
+        if self._batch is None:
+            if range_threshold is None:
+                range_threshold = self.batch_range_threshold
+            if reset_threshold is None:
+                reset_threshold = self.batch_reset_threshold
+            self._batch = _ListBatch(range_threshold, reset_threshold)
+        self._batch.depth += 1
+        try:
+            yield self
+        finally:
+            self._batch.depth -= 1
+            if not self._batch.depth:
+                batch, self._batch = self._batch, None
+                self._flush_batch(batch)
+
+    def _flush_batch(self, batch):
+        """Emits the coalesced notifications of a finished batch."""
+        if batch.resetting:
+            self.endResetModel()
+            return
+        runs = self._contiguous_runs(batch.rows)
+        if len(runs) > batch.range_threshold:
+            runs = [(runs[0][0], runs[-1][1])]
+        for first, last in runs:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, 0))
+            self.ListRangeChanged.emit(first, last)
+
+    def _data_changed(self, first, last):
+        """Emits dataChanged for the rows, or records them in the current batch."""
+        if self._batch is None:
+            super(ListModel, self)._data_changed(first, last)
+        elif not self._batch.resetting:
+            self._batch.rows.update(range(first, last + 1))
+
+    def _announce_rows(self):
+        """Returns True if a row insertion or removal should emit its own row
+        signals. Switches the current batch to a model reset once it has seen
+        more than reset_threshold of them."""
+        batch = self._batch
+        if batch is None:
+            return True
+        if batch.resetting:
+            return False
+        batch.structural += 1
+        if batch.structural > batch.reset_threshold:
+            self.beginResetModel()
+            batch.resetting = True
+            batch.rows.clear()
+            return False
+        return True
+
+    def _begin_insert(self, first, last):
+        """Starts inserting rows first through last, returns whether they are announced."""
+        if self._snapshots:
+            self._preserve(first)
+        announce = self._announce_rows()
+        if announce:
+            self.beginInsertRows(QtCore.QModelIndex(), first, last)
+        return announce
+
+    def _end_insert(self, first, last, announce):
+        """Finishes inserting rows started with _begin_insert."""
+        if self._value_index is not None:
+            self._value_index.inserted(first, last)
+        if announce:
+            self.endInsertRows()
+            if self._batch is not None:
+                self._batch.inserted(first, last)
+
+    def _begin_remove(self, first, last):
+        """Starts removing rows first through last, returns whether they are announced."""
+        if self._snapshots:
+            self._preserve(first)
+        announce = self._announce_rows()
+        if announce:
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+        return announce
+
+    def _end_remove(self, first, last, announce):
+        """Finishes removing rows started with _begin_remove."""
+        if self._value_index is not None:
+            self._value_index.removed(first, last)
+        if announce:
+            self.endRemoveRows()
+            if self._batch is not None:
+                self._batch.removed(first, last)
+
+    def _clamp_insert_idx(self, idx):
+        """Converts an insert index to a row following list.insert rules."""
+        length = len(self._container)
+        if idx < 0:
+            idx = max(length + idx, 0)
+        return min(idx, length)
     
     def _convert_idx(self, idx):
         """To be compatable with Qt objects, ensure the index is a positive number.
         Used for python index operations."""
-        #TODO slicing
         if isinstance(idx, slice):
-            raise NotImplementedError("No slice setting functionality yet.")
+            raise TypeError("Slices must be converted with _slice_rows.")
         if idx < 0:
             #idx -1 on a length 10 list is the same as idx 9 (10 + -1)
             idx = len(self) + idx
         return idx
 
+    def _slice_rows(self, slc):
+        """Returns the positive row numbers a slice refers to, in slice order."""
+        return list(range(*slc.indices(len(self._container))))
+
+    @staticmethod
+    def _contiguous_runs(rows):
+        """Groups row numbers into sorted (first, last) runs of consecutive rows."""
+        runs = []
+        for row in sorted(rows):
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return [tuple(run) for run in runs]
+
+    def _replace_rows(self, rows, values):
+        """Sets the EditRole of each row to the matching value, keeping the
+        other roles and flags. Emits a single dataChanged for the bounding range."""
+        if not rows:
+            return
+        if self._snapshots:
+            self._preserve(min(rows), max(rows))
+        for row, value in zip(rows, values):
+            self._container.set_role(row, QtCore.Qt.EditRole, value)
+            if self._value_index is not None:
+                self._value_index.changed(row, value)
+        if self._batch is not None:
+            if not self._batch.resetting:
+                self._batch.rows.update(rows)
+            return
+        first, last = min(rows), max(rows)
+        self.dataChanged.emit(self.index(first, 0), self.index(last, 0))
+        self.ListRangeChanged.emit(first, last)
+
+    def _remove_runs(self, runs):
+        """Removes the (first, last) runs of rows, last run first so the
+        earlier row numbers stay valid."""
+        for first, last in reversed(runs):
+            announce = self._begin_remove(first, last)
+            del self._container[first:last + 1]
+            self._end_remove(first, last, announce)
+            if announce:
+                self.ListRangeRemoved.emit(first, last)
+
+    def _move_rows(self, first, last, to):
+        """Moves rows first through last, with their items, so that the first
+        row ends up at row to. Emits a single beginMoveRows/endMoveRows."""
+        if to == first:
+            return
+        if self._snapshots:
+            self._preserve(min(first, to))
+        count = last - first + 1
+        #beginMoveRows wants the row the block goes before, prior to the move.
+        destination = to if to < first else to + count
+        announce = self._announce_rows()
+        if announce:
+            parent = QtCore.QModelIndex()
+            self.beginMoveRows(parent, first, last, parent, destination)
+        items = self._container[first:last + 1]
+        del self._container[first:last + 1]
+        self._container[to:to] = items
+        if self._value_index is not None:
+            self._value_index.invalidate()
+        if announce:
+            self.endMoveRows()
+            if self._batch is not None:
+                self._batch.moved(first, last, to)
+            self.ListRangeMoved.emit(first, last, to)
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Sets the data of a role at a specific index of the list, see BaseListModel.setData.
+        Keeps the value index and snapshots up to date."""
+        if self._snapshots and index.isValid():
+            self._preserve(index.row(), index.row())
+        result = super(ListModel, self).setData(index, value, role)
+        if result and role == QtCore.Qt.EditRole and self._value_index is not None:
+            self._value_index.changed(index.row(), value)
+        return result
+
     #MutableSequence Abstract Methods
     def __getitem__(self, idx):
         """Gets the data located the the index or slice in the underlying list.
+        A slice returns a python list of the values.
         
         Note:
             This method is an abstract method required for MutableSequence.
         """
-        return self._container.__getitem__(idx).data
+        if isinstance(idx, slice):
+            return [item.data for item in self._container[idx]]
+        return self._container.get_value(idx)
 
     def __setitem__(self, idx, value):
         """Sets the data located the the index or slice in the underlying list.
+
+        Setting a slice keeps the roles and flags of the rows that are replaced.
+        Replaced rows emit one dataChanged, any extra rows are removed or
+        inserted as a single range, like a python list.
         
         Note:
             This method is an abstract method required for MutableSequence.
+
+        Raises:
+            ValueError: if an extended slice is assigned a sequence of a different size.
         """
+        if isinstance(idx, slice):
+            self._set_slice(idx, value)
+            return
         idx = self._convert_idx(idx)
-        index = self.index(idx, 0)
-        previous = self._container[idx].data
-        self.setData(index, value)
-        self.ListChanged.emit(idx, previous)
+        previous = self._container.get_value(idx)
+        idx = self._set_value(idx, value)
+        if self._batch is None:
+            self.ListChanged.emit(idx, previous)
         return 
 
+    def _set_value(self, row, value):
+        """Sets the value of row through setData and returns the row that
+        holds the value afterwards."""
+        self.setData(self.index(row, 0), value)
+        return row
+
+    def _set_slice(self, slc, values):
+        """Implimentation of slice assignment for __setitem__."""
+        values = list(values)
+        rows = self._slice_rows(slc)
+        if slc.step is not None and slc.step != 1:
+            if len(values) != len(rows):
+                raise ValueError("attempt to assign sequence of size {} to extended "
+                                 "slice of size {}".format(len(values), len(rows)))
+            self._replace_rows(rows, values)
+            return
+        if rows:
+            start = rows[0]
+        else:
+            #an empty slice still inserts at its clamped start position.
+            start = slc.indices(len(self._container))[0]
+        overlap = min(len(rows), len(values))
+        self._replace_rows(rows[:overlap], values[:overlap])
+        if len(rows) > overlap:
+            self._remove_runs([(rows[overlap], rows[-1])])
+        elif len(values) > overlap:
+            self.insert_many(start + overlap, values[overlap:])
+
     def __delitem__(self, idx):
-        """Deletes an item from the underlying list and any associated metadata,
-        then updates the model.
+        """Deletes an item or slice from the underlying list and any associated
+        metadata, then updates the model. A slice removes each contiguous run
+        of rows with a single beginRemoveRows/endRemoveRows.
         
         Note:
             This method is an abstract method required for MutableSequence.
         """
+        if isinstance(idx, slice):
+            self._remove_runs(self._contiguous_runs(self._slice_rows(idx)))
+            return
         idx = self._convert_idx(idx)
-        previous = self._container[idx].data
-        parent = QtCore.QModelIndex()
-        self.beginRemoveRows(parent, idx, idx) 
+        previous = self._container.get_value(idx)
+        announce = self._begin_remove(idx, idx)
         ret_value = self._container.__delitem__(idx)
-        self.endRemoveRows()
-        self.ListChanged.emit(idx, previous)
+        self._end_remove(idx, idx, announce)
+        if self._batch is None:
+            self.ListChanged.emit(idx, previous)
         return ret_value
     
     def __len__(self, *args):
@@ -245,18 +578,57 @@ class ListModel(MutableSequence, BaseListModel):
 
         Note:
             This method is an abstract method required for MutableSequence."""
+        idx = self._clamp_insert_idx(idx)
         previous = None
         try:
-            previous = self._container[idx].data
+            previous = self._container.get_value(idx)
         except IndexError:
             pass
-        parent = QtCore.QModelIndex()
-        self.beginInsertRows(parent, idx, idx)
+        announce = self._begin_insert(idx, idx)
         ret_value = self._container.insert(idx, self._item_factory(value))
-        self.endInsertRows()
-        self.ListChanged.emit(idx, previous)
+        self._end_insert(idx, idx, announce)
+        if self._batch is None:
+            self.ListChanged.emit(idx, previous)
         return ret_value
- 
+
+    def insert_many(self, idx, values):
+        """Inserts all of the values into the underlying list starting at idx.
+
+        Every value is wrapped by the item_factory before the model is
+        notified, so views receive a single beginInsertRows/endInsertRows
+        for the whole block and ListRangeInserted is emitted once.
+
+        Args:
+            idx (int): The index to insert at, follows list.insert rules.
+            values (iterable): The values to insert.
+        """
+        self._insert_run(self._clamp_insert_idx(idx), values)
+
+    def _insert_run(self, idx, values):
+        """Inserts values as one range before row idx, see insert_many. Used
+        where subclasses must not check or reorder the values."""
+        new_items = [self._item_factory(value) for value in values]
+        if not new_items:
+            return
+        last = idx + len(new_items) - 1
+        announce = self._begin_insert(idx, last)
+        self._container[idx:idx] = new_items
+        self._end_insert(idx, last, announce)
+        if announce:
+            self.ListRangeInserted.emit(idx, last)
+
+    def extend(self, values):
+        """Appends all of the values to the end of the underlying list
+        with a single row insertion."""
+        if values is self:
+            values = list(values)
+        self.insert_many(len(self._container), values)
+
+    def __iadd__(self, values):
+        """Extends the list in place, see extend."""
+        self.extend(values)
+        return self
+
     #Index needs to use QAbstractListModel Index
     def index(self, row, column, parent=QtCore.QModelIndex()):
         """Returns the QModelIndex from the underlying model.
@@ -270,14 +642,271 @@ class ListModel(MutableSequence, BaseListModel):
     #QListModel index method overrides Sequence index method
     def index_of(self, item):
         """Calls the python version of list.index.
-        Returns the index of the item that matches first."""
+        Returns the index of the item that matches first.
+        Uses the value index if it is turned on, see use_value_index."""
+        if self._value_index is not None:
+            rows = self._value_index.rows(item)
+            if rows is not None:
+                if not rows:
+                    raise ValueError("{!r} is not in list".format(item))
+                return rows[0]
         return super(ListModel, self).index(item)
+
+    def __contains__(self, item):
+        """Returns whether the item is in the list, see index_of."""
+        try:
+            self.index_of(item)
+        except ValueError:
+            return False
+        return True
+
+    def count(self, item):
+        """Returns the number of times item is in the list, see index_of."""
+        if self._value_index is not None:
+            rows = self._value_index.rows(item)
+            if rows is not None:
+                return len(rows)
+        return super(ListModel, self).count(item)
     
-    def clear(self):
-        """Clears entire model and emits layout changed"""
-        self.layoutAboutToBeChanged.emit()
-        self._container = self._container[:]
+    def assign(self, values, key=None, reset_threshold=None):
+        """Makes the list equal to values with the fewest row insertions,
+        removals and moves.
+
+        Rows are matched by key(value), or by the values themselves if key is
+        None. Rows without a match are removed, matched rows keep their roles
+        and flags and are moved with beginMoveRows only if they are out of
+        order, and the remaining values are inserted as contiguous ranges.
+        Matched rows whose value differs get the new value. Everything happens
+        inside a batch, see batch for reset_threshold.
+
+        If the keys are not hashable, falls back to assigning the whole slice.
+
+        Args:
+            values (iterable): The new values of the list.
+            key (Optional[callable]): Returns the identity of a value.
+            reset_threshold (Optional[int]): Passed on to batch.
+        """
+        values = list(values)
+        if key is None:
+            key = lambda value: value
+        old_keys = [key(self._container.get_value(row)) for row in range(len(self._container))]
+        new_keys = [key(value) for value in values]
+        try:
+            for match_key in old_keys + new_keys:
+                hash(match_key)
+        except TypeError:
+            self[:] = values
+            return
+        old_ids = self._occurrence_ids(old_keys)
+        new_ids = self._occurrence_ids(new_keys)
+        new_positions = dict((match_id, row) for row, match_id in enumerate(new_ids))
+        with self.batch(reset_threshold=reset_threshold):
+            removed = [row for row, match_id in enumerate(old_ids)
+                       if match_id not in new_positions]
+            self._remove_runs(self._contiguous_runs(removed))
+            current = [match_id for match_id in old_ids if match_id in new_positions]
+            self._reorder(current, new_positions)
+            survivors = set(current)
+            inserted = [row for row, match_id in enumerate(new_ids) if match_id not in survivors]
+            for first, last in self._contiguous_runs(inserted):
+                self._insert_run(first, values[first:last + 1])
+            changed = [row for row in range(len(values))
+                       if new_ids[row] in survivors and self._container.get_value(row) != values[row]]
+            self._replace_rows(changed, [values[row] for row in changed])
+
+    @staticmethod
+    def _occurrence_ids(keys):
+        """Pairs each key with its occurrence count so repeated keys are unique."""
+        seen = {}
+        ids = []
+        for match_key in keys:
+            occurrence = seen.get(match_key, 0)
+            seen[match_key] = occurrence + 1
+            ids.append((match_key, occurrence))
+        return ids
+
+    def _reorder(self, current, positions):
+        """Moves rows until the ids in current are in the order of positions.
+
+        current lists the id of every row. The rows on the longest increasing
+        run of target positions stay put, every other row is moved once,
+        right after the row that precedes it in the target order.
+
+        Every row gets a sort key, (row, 0) for the rows where they are and
+        (row of the anchor, n) for the n-th row moved after an anchor, so the
+        row of an id is the number of keys before its key, counted in a
+        Fenwick tree. Each move costs O(log n).
+        """
+        anchors = set(self._longest_increasing(current, positions))
+        slots = dict((match_id, (row, 0)) for row, match_id in enumerate(current))
+        moves = []
+        base, count = -1, 0
+        for match_id in sorted(current, key=positions.__getitem__):
+            if match_id in anchors:
+                base, count = slots[match_id][0], 0
+            else:
+                count += 1
+                moves.append((match_id, (base, count)))
+        if not moves:
+            return
+        ranks = sorted(set(slots.values()).union(slot for match_id, slot in moves))
+        ranks = dict((slot, rank) for rank, slot in enumerate(ranks))
+        tree = [0] * (len(ranks) + 1)
+
+        def add(rank, delta):
+            rank += 1
+            while rank < len(tree):
+                tree[rank] += delta
+                rank += rank & -rank
+
+        def before(rank):
+            total = 0
+            while rank:
+                total += tree[rank]
+                rank &= rank - 1
+            return total
+
+        for slot in slots.values():
+            add(ranks[slot], 1)
+        for match_id, slot in moves:
+            old_rank = ranks[slots[match_id]]
+            row = before(old_rank)
+            add(old_rank, -1)
+            new_rank = ranks[slot]
+            to = before(new_rank)
+            add(new_rank, 1)
+            slots[match_id] = slot
+            self._move_rows(row, row, to)
+
+    @staticmethod
+    def _longest_increasing(ids, positions):
+        """Returns the ids that form the longest run of increasing positions."""
+        tails, tail_rows, previous = [], [], [None] * len(ids)
+        for row, match_id in enumerate(ids):
+            position = positions[match_id]
+            length = bisect_left(tails, position)
+            if length == len(tails):
+                tails.append(position)
+                tail_rows.append(row)
+            else:
+                tails[length] = position
+                tail_rows[length] = row
+            previous[row] = tail_rows[length - 1] if length else None
+        result = []
+        row = tail_rows[-1] if tail_rows else None
+        while row is not None:
+            result.append(ids[row])
+            row = previous[row]
+        return result
+
+    def sort(self, key=None, reverse=False):
+        """Sorts the list in place like list.sort.
+
+        The items keep their roles and flags. Views get a single layout change
+        and persistent indexes, such as selections, follow their rows.
+        """
+        values = [self._container.get_value(row) for row in range(len(self._container))]
+        if key is None:
+            sort_key = values.__getitem__
+        else:
+            sort_key = lambda row: key(values[row])
+        self._permute(sorted(range(len(values)), key=sort_key, reverse=reverse))
+
+    def reverse(self):
+        """Reverses the list in place with a single layout change, see sort."""
+        self._permute(range(len(self._container) - 1, -1, -1))
+
+    def _permute(self, order):
+        """Reorders the rows so that row i holds the row that was at order[i],
+        remapping persistent indexes with one layoutChanged."""
+        order = list(order)
+        if not order:
+            return
+        new_rows = [0] * len(order)
+        for new_row, row in enumerate(order):
+            new_rows[row] = new_row
+        batch = self._batch
+        announce = batch is None or not batch.resetting
+        if self._snapshots:
+            self._preserve(0)
+        if announce:
+            self.layoutAboutToBeChanged.emit()
+        self._container.permute(order)
+        if self._value_index is not None:
+            self._value_index.invalidate()
+        if not announce:
+            return
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(new_rows[index.row()], index.column())
+                       for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
         self.layoutChanged.emit()
+        if batch is not None:
+            batch.rows = set(new_rows[row] for row in batch.rows)
+        else:
+            self.ListRangeChanged.emit(0, len(order) - 1)
+
+    def move(self, src, dst):
+        """Moves the value at src so that it ends up at dst, keeping its roles
+        and flags. Uses a single beginMoveRows/endMoveRows.
+
+        Raises:
+            IndexError: if src or dst is out of range.
+        """
+        self.move_range(src, src, dst)
+
+    def move_range(self, first, last, dst):
+        """Moves the values first through last (inclusive) so that the first
+        one ends up at dst, with a single beginMoveRows/endMoveRows.
+
+        Raises:
+            IndexError: if the rows or the destination are out of range.
+        """
+        length = len(self._container)
+        first, last, dst = [self._convert_idx(idx) for idx in (first, last, dst)]
+        count = last - first + 1
+        if not (0 <= first <= last < length) or not 0 <= dst <= length - count:
+            raise IndexError("move out of range")
+        self._move_rows(first, last, dst)
+
+    def rotate(self, steps=1):
+        """Rotates the list steps to the right like collections.deque.rotate,
+        with a single row move."""
+        length = len(self._container)
+        if not length:
+            return
+        steps %= length
+        if steps:
+            self._move_rows(length - steps, length - 1, 0)
+
+    def clear(self):
+        """Clears entire model with a single model reset and emits ListCleared."""
+        self.reset()
+
+    def reset(self, values=()):
+        """Replaces every value of the list with values.
+
+        The old items are dropped in one step and views are told with a single
+        beginResetModel/endResetModel, then ListCleared is emitted once. Roles
+        and flags of the old rows are not kept, see assign for that. Inside a
+        batch the reset is deferred to the end of the batch.
+
+        Keyword Args:
+            values (Optional[iterable]): The new values of the list.
+        """
+        container = self._new_container(values)
+        batch = self._batch
+        if batch is None:
+            self.beginResetModel()
+        elif not batch.resetting:
+            self.beginResetModel()
+            batch.resetting = True
+            batch.rows.clear()
+        self._container = container
+        if self._value_index is not None:
+            self._value_index.invalidate()
+        if batch is None:
+            self.endResetModel()
         self.ListCleared.emit()
 
     # Other Python Special Methods
@@ -299,4 +928,218 @@ class ListModel(MutableSequence, BaseListModel):
 
     def __ne__(self, *args):
         """Returns whether the underlying list is not equal to another list."""
-        return list(self).__ne__(*args)
\ No newline at end of file
+        return list(self).__ne__(*args)
+
+
+class ListSnapshot(Sequence):
+    """A read only sequence of the values a ListModel had when its snapshot
+    method was called, see ListModel.snapshot.
+
+    Rows are read from the storage of the model until the model is about
+    to change them, the chunks of rows that change are copied first. Once
+    every chunk is copied the snapshot no longer refers to the model storage.
+    """
+
+    def __init__(self, container, length, chunk_size):
+        self._container = container
+        self._length = length
+        self._chunk_size = chunk_size
+        self._chunks = {}
+        self._lock = threading.Lock()
+
+    def _preserve(self, first, last=None):
+        """Copies the chunks of rows first through last, or through the end."""
+        if last is None or last >= self._length:
+            last = self._length - 1
+        if self._container is None or first > last:
+            return
+        size = self._chunk_size
+        with self._lock:
+            for chunk in range(first // size, last // size + 1):
+                if chunk not in self._chunks:
+                    start = chunk * size
+                    self._chunks[chunk] = self._container.get_values(
+                        start, min(start + size, self._length))
+            if len(self._chunks) * size >= self._length:
+                self._container = None
+
+    def _chunk(self, chunk):
+        """Returns the values of a chunk."""
+        with self._lock:
+            values = self._chunks.get(chunk)
+            if values is None:
+                start = chunk * self._chunk_size
+                values = self._container.get_values(
+                    start, min(start + self._chunk_size, self._length))
+        return values
+
+    def __getitem__(self, idx):
+        """Returns the value of an index, or a list of values for a slice."""
+        if isinstance(idx, slice):
+            return [self[row] for row in range(*idx.indices(self._length))]
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError("list index out of range")
+        chunk, offset = divmod(idx, self._chunk_size)
+        with self._lock:
+            values = self._chunks.get(chunk)
+            if values is None:
+                return self._container.get_value(idx)
+        return values[offset]
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        """Iterates over the values, reading a chunk at a time."""
+        for chunk in range(-(-self._length // self._chunk_size)):
+            for value in self._chunk(chunk):
+                yield value
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, list(self))
+
+    def __eq__(self, other):
+        """Returns whether the values equal another list."""
+        return list(self).__eq__(other)
+
+    def __ne__(self, other):
+        """Returns whether the values are not equal to another list."""
+        return list(self).__ne__(other)
+
+
+class _ListBatch(object):
+    """Records the changes made to a ListModel inside a batch block."""
+
+    def __init__(self, range_threshold, reset_threshold):
+        self.range_threshold = range_threshold
+        self.reset_threshold = reset_threshold
+        self.depth = 0
+        self.structural = 0
+        self.resetting = False
+        self.rows = set()
+
+    def inserted(self, first, last):
+        """Moves the recorded rows after an insertion of rows first through last."""
+        count = last - first + 1
+        self.rows = set(row + count if row >= first else row for row in self.rows)
+
+    def removed(self, first, last):
+        """Forgets and moves the recorded rows after a removal of rows first through last."""
+        count = last - first + 1
+        self.rows = set(row - count if row > last else row
+                        for row in self.rows if not first <= row <= last)
+
+    def moved(self, first, last, to):
+        """Moves the recorded rows after rows first through last moved to row to."""
+        count = last - first + 1
+        rows = set()
+        for row in self.rows:
+            if first <= row <= last:
+                row = to + row - first
+            else:
+                if row > last:
+                    row -= count
+                if row >= to:
+                    row += count
+            rows.add(row)
+        self.rows = rows
+
+
+class _ValueIndex(object):
+    """A hash index from the values of a ListModel to the rows that hold them.
+
+    Entries are only ever added, so an entry can be stale. Lookups verify
+    every candidate row against the model, stale entries are skipped and the
+    index is rebuilt once there are too many of them. Rows inserted or removed
+    anywhere but the end of the list drop the index. While it is dropped,
+    lookups return None so the model scans the list, and the index is only
+    rebuilt once rebuild_after lookups happened without another insertion or
+    removal, so edits mixed with lookups cost no more than scanning.
+    """
+    rebuild_after = 4
+
+    def __init__(self, model):
+        self.model = model
+        self.rebuild()
+
+    def invalidate(self):
+        """Drops the index, it is rebuilt after rebuild_after more lookups."""
+        self.dirty = True
+        self.positions = {}
+        self.unhashable = []
+        self.stale = 0
+        self.dirty_lookups = 0
+
+    def rebuild(self):
+        """Rebuilds the index from the values of the model."""
+        self.invalidate()
+        self.dirty = False
+        container = self.model._container
+        for row in range(len(container)):
+            self.add(row, container.get_value(row))
+
+    def add(self, row, value):
+        """Records that row holds value."""
+        try:
+            self.positions.setdefault(value, []).append(row)
+        except TypeError:
+            self.unhashable.append(row)
+
+    def changed(self, row, value):
+        """Records the new value of row, the old entry becomes stale."""
+        if self.dirty:
+            return
+        self.add(row, value)
+        self.stale += 1
+        if self.stale > len(self.model._container):
+            self.invalidate()
+
+    def inserted(self, first, last):
+        """Updates the index after rows first through last were inserted."""
+        if self.dirty:
+            self.dirty_lookups = 0
+            return
+        container = self.model._container
+        if last != len(container) - 1:
+            self.invalidate()
+            return
+        for row in range(first, last + 1):
+            self.add(row, container.get_value(row))
+
+    def removed(self, first, last):
+        """Updates the index after rows first through last were removed.
+        Entries of rows removed from the end are left to go stale."""
+        if self.dirty:
+            self.dirty_lookups = 0
+        elif first != len(self.model._container):
+            self.invalidate()
+
+    def rows(self, value):
+        """Returns the sorted rows that hold value, or None if value is unhashable
+        or the index is dropped and the list has to be scanned."""
+        if self.dirty:
+            self.dirty_lookups += 1
+            if self.dirty_lookups <= self.rebuild_after:
+                return None
+            self.rebuild()
+        try:
+            candidates = self.positions.get(value, ())
+        except TypeError:
+            return None
+        container = self.model._container
+        length = len(container)
+        rows = set()
+        #like list.index, identity matches before equality, so a nan is found.
+        for row in candidates:
+            if row < length:
+                stored = container.get_value(row)
+                if stored is value or stored == value:
+                    rows.add(row)
+        for row in self.unhashable:
+            if row < length:
+                stored = container.get_value(row)
+                if stored is value or stored == value:
+                    rows.add(row)
+        return sorted(rows)
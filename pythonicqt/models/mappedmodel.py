@@ -0,0 +1,261 @@
+"""This module contains the MappedListModel class, a list model of the
+fixed size records of a memory mapped file.
+
+"""
+
+import mmap
+import os
+import six
+import struct
+from collections import OrderedDict, Sequence
+from pythonicqt.Qt import QtCore
+from pythonicqt.baseclasses import QtMetaStitch
+
+
+@six.add_metaclass(QtMetaStitch)
+class BaseMappedListModel(QtCore.QAbstractListModel):
+    """Stitches the Qt metaclass so MappedListModel can mix in Sequence."""
+
+
+class MappedListModel(Sequence, BaseMappedListModel):
+    """A read mostly QAbstractListModel of the records of a file.
+
+    The file is memory mapped, so only the pages that are read are loaded
+    and the operating system can drop them again, files much larger than
+    the memory can be browsed. Records are decoded when data() or the
+    python interface asks for them and the most recently used decoded rows
+    are kept in a bounded LRU.
+
+    Records are decoded with a struct format, a record of a single field is
+    that field and any other record is a tuple, or with a decoder that gets
+    the bytes of the record.
+
+        model = MappedListModel('capture.bin', '<dIf', header_size=64)
+        view.setModel(model)
+        last_minute = model[-60000:]
+
+    Instances are a python sequence of the decoded records. If the model is
+    writable and has a struct format, records can also be set.
+
+    Note:
+        MappedListModel.index is the QAbstractListModel.index method,
+        use index_of for the Sequence method.
+
+    Keyword Args:
+        path (str): The file to map.
+        record_format (Optional[str]): The struct format of a record.
+        decoder (Optional[callable]): Returns the value of a record from its bytes,
+            used instead of record_format.
+        record_size (Optional[int]): The size of a record, required with a decoder.
+        header_size (int): The number of bytes before the first record.
+        cache_size (int): The number of decoded rows to keep.
+        formatter (Optional[callable]): Returns the DisplayRole string of a value,
+            unicode by default.
+        writable (bool): If True, the file is mapped for writing and records
+            can be set.
+
+    Raises:
+        ValueError: if neither a record_format nor a decoder and record_size are given.
+    """
+
+    def __init__(self, path, record_format=None, decoder=None, record_size=None,
+                 header_size=0, cache_size=4096, formatter=None, writable=False):
+        super(MappedListModel, self).__init__()
+        if record_format is not None:
+            self._struct = struct.Struct(record_format)
+            record_size = self._struct.size
+        elif decoder is None or not record_size:
+            raise ValueError("give a record_format, or a decoder and a record_size")
+        else:
+            self._struct = None
+        self.path = path
+        self.decoder = decoder
+        self.record_size = record_size
+        self.header_size = header_size
+        self.cache_size = cache_size
+        self.formatter = unicode if formatter is None else formatter
+        self.writable = writable
+        self._cache = OrderedDict()
+        self._file = open(path, 'r+b' if writable else 'rb')
+        self._map = None
+        self._length = 0
+        self._map_file()
+
+    def _record_count(self, size=None):
+        """Returns the number of whole records in the file."""
+        if size is None:
+            size = os.fstat(self._file.fileno()).st_size
+        return max(0, (size - self.header_size) // self.record_size)
+
+    def _map_file(self):
+        """Maps the current size of the file and computes the number of records."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        size = os.fstat(self._file.fileno()).st_size
+        self._length = self._record_count(size)
+        if size:
+            access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+            self._map = mmap.mmap(self._file.fileno(), 0, access=access)
+
+    def refresh(self):
+        """Maps the file again after it changed size, for example a capture file
+        that is still being written. New records are announced as one row
+        insertion, a file that shrank resets the model."""
+        length = self._record_count()
+        if length < self._length:
+            self.beginResetModel()
+            self._map_file()
+            self._cache.clear()
+            self.endResetModel()
+        elif length > self._length:
+            self.beginInsertRows(QtCore.QModelIndex(), self._length, length - 1)
+            self._map_file()
+            self.endInsertRows()
+
+    def close(self):
+        """Unmaps and closes the file, the model becomes empty."""
+        self.beginResetModel()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+        self._length = 0
+        self._cache.clear()
+        self.endResetModel()
+
+    def _offset(self, row):
+        return self.header_size + row * self.record_size
+
+    def _decode(self, row):
+        """Decodes a record without the cache."""
+        offset = self._offset(row)
+        if self._struct is None:
+            return self.decoder(self._map[offset:offset + self.record_size])
+        value = self._struct.unpack_from(self._map, offset)
+        return value[0] if len(value) == 1 else value
+
+    def _value(self, row):
+        """Returns the decoded record of a positive row through the LRU."""
+        cache = self._cache
+        try:
+            value = cache.pop(row)
+        except KeyError:
+            value = self._decode(row)
+            if len(cache) >= self.cache_size:
+                cache.popitem(last=False)
+        cache[row] = value
+        return value
+
+    def _convert_idx(self, idx):
+        """Converts a python index to a row.
+
+        Raises:
+            IndexError: if the index is out of range.
+        """
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError("list index out of range")
+        return idx
+
+    #QAbstractListModel methods
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Returns the number of records.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return self._length
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Returns the decoded record for EditRole and its formatted string for DisplayRole.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return self.formatter(self._value(index.row()))
+        elif role == QtCore.Qt.EditRole:
+            return self._value(index.row())
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Writes a record if the model is writable, see __setitem__.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        try:
+            self[index.row()] = value
+        except (TypeError, struct.error):
+            return False
+        return True
+
+    def flags(self, index):
+        """Returns the QtCore.Qt.ItemFlags of the records, editable if the model can write.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self.writable and self._struct is not None:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def index(self, row, column=0, parent=QtCore.QModelIndex()):
+        """Returns the QModelIndex of a row.
+
+        Note:
+            This method overrides the virtual function of QAbstractListModel.
+            This is not the Sequence.index method. That is index_of.
+        """
+        return QtCore.QAbstractListModel.index(self, row, column, parent)
+
+    #Sequence Abstract Methods
+    def __getitem__(self, idx):
+        """Returns the decoded record of an index, or a list of them for a slice.
+        Slices are decoded without going through the LRU."""
+        if isinstance(idx, slice):
+            return [self._decode(row) for row in range(*idx.indices(self._length))]
+        return self._value(self._convert_idx(idx))
+
+    def __len__(self):
+        """Returns the number of records."""
+        return self._length
+
+    def __iter__(self):
+        """Decodes the records in order, without going through the LRU."""
+        for row in range(self._length):
+            yield self._decode(row)
+
+    def __setitem__(self, idx, value):
+        """Packs value with the struct format and writes it to the file.
+
+        Raises:
+            TypeError: if the model is not writable or has a decoder.
+        """
+        if not self.writable or self._struct is None:
+            raise TypeError("{} is read only".format(self.__class__.__name__))
+        row = self._convert_idx(idx)
+        if not isinstance(value, tuple):
+            value = (value,)
+        self._struct.pack_into(self._map, self._offset(row), *value)
+        self._cache.pop(row, None)
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def index_of(self, value):
+        """Returns the first row holding value, like list.index. Reads the file."""
+        return super(MappedListModel, self).index(value)
+
+    def __repr__(self):
+        return "{}({!r}, records={})".format(self.__class__.__name__, self.path, self._length)
@@ -3,9 +3,55 @@ hold the flags and data roles of items in models.
 
 """
 
+import copy
+from collections import OrderedDict
+import six
 from pythonicqt.Qt import QtCore
 
 
+class DisplayCache(object):
+    """A bounded LRU of DisplayRole strings shared by the items of a model.
+
+    Views ask for the DisplayRole of every visible item on every repaint,
+    formatting the data once and keeping the most recently displayed
+    strings avoids calling an expensive __str__ over and over.
+
+    Keyword Args:
+        maxsize (int): The number of display strings to keep.
+        formatter (Optional[callable]): Converts the data of an item to its
+            display string, unicode by default.
+    """
+
+    def __init__(self, maxsize=4096, formatter=None):
+        self.maxsize = maxsize
+        self.formatter = unicode if formatter is None else formatter
+        #id(item) -> (item, text), the item is kept so its id is not reused.
+        self._entries = OrderedDict()
+
+    def get(self, item):
+        """Returns the display string of the item, formatting it if needed."""
+        key = id(item)
+        try:
+            entry = self._entries.pop(key)
+        except KeyError:
+            entry = (item, self.formatter(item.data))
+            if len(self._entries) >= self.maxsize:
+                self._entries.popitem(last=False)
+        self._entries[key] = entry
+        return entry[1]
+
+    def discard(self, item):
+        """Forgets the display string of the item."""
+        self._entries.pop(id(item), None)
+
+    def clear(self):
+        """Forgets all of the display strings."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
 class ItemContainer(dict):
     """A dictionary used to hold a QAbstractModel item's data and flags.
 
@@ -21,12 +67,16 @@ class ItemContainer(dict):
         default_data (ItemFlag): The default flags and  roles that all of the items return.
             Change an instance variable of the same name, or subclass this class
             and redefine this attribute if you want to use different flags.
+        display_cache (Optional[DisplayCache]): Caches the DisplayRole strings of
+            the items, None by default. Use with_display_cache to create a
+            subclass that has one.
     """
     default_data = {
         QtCore.Qt.ItemFlags: 
             (QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | 
              QtCore.Qt.ItemIsEditable)
         }
+    display_cache = None
 
     def __init__(self, item_data, role=QtCore.Qt.EditRole):
         self[role] = item_data
@@ -50,6 +100,8 @@ class ItemContainer(dict):
         if key in self:
             return super(ItemContainer, self).__getitem__(key)
         elif key == QtCore.Qt.DisplayRole:
+            if self.display_cache is not None:
+                return self.display_cache.get(self)
             return unicode(self.data)
         else:
             #This raises a KeyError if no default exists.
@@ -61,4 +113,281 @@ class ItemContainer(dict):
         Raises:
             TypeError: if role is not a instance of ItemDataRole or specifically QtCore.Qt.ItemFlags
         """
-        super(ItemContainer, self).__setitem__(key, value)
\ No newline at end of file
+        if key == QtCore.Qt.EditRole and self.display_cache is not None:
+            self.display_cache.discard(self)
+        super(ItemContainer, self).__setitem__(key, value)
+
+    @classmethod
+    def with_display_cache(cls, maxsize=4096, formatter=None):
+        """Returns a subclass of this class whose items share a DisplayCache.
+
+        The display string of an item is formatted the first time it is
+        displayed and reused until its EditRole changes. Pass the subclass
+        as the item_factory of a model, each call creates a new cache.
+
+            model = ListModel(values, item_factory=ItemContainer.with_display_cache(10000))
+
+        Keyword Args:
+            maxsize (int): The number of display strings to keep.
+            formatter (Optional[callable]): Converts item data to its display string.
+        """
+        cache = DisplayCache(maxsize, formatter)
+        return type(cls.__name__, (cls,), {'display_cache': cache})
+
+class ItemList(list):
+    """The default storage of a list model, a python list of item_factory items.
+
+    Models read and write roles through get_value, get_role and set_role
+    so that other storage engines, such as CompactItemList, can be
+    swapped in without changing the model.
+
+    Keyword Args:
+        values (Optional[iterable]): The starting values, each is wrapped by item_factory.
+        item_factory (object): The item container that holds the roles of each value.
+    """
+
+    def __init__(self, values=(), item_factory=ItemContainer):
+        super(ItemList, self).__init__(item_factory(value) for value in values)
+
+    def get_value(self, row):
+        """Returns the EditRole data of the item at row."""
+        return self[row].data
+
+    def get_values(self, start, stop):
+        """Returns a list of the EditRole data of the rows start through stop - 1."""
+        return [item.data for item in self[start:stop]]
+
+    def get_role(self, row, role):
+        """Returns the role of the item at row, raises KeyError if it has none."""
+        return self[row][role]
+
+    def set_role(self, row, role, value):
+        """Sets the role of the item at row."""
+        self[row][role] = value
+
+    def permute(self, order):
+        """Reorders the items so that row i holds the item that was at order[i]."""
+        self[:] = [self[row] for row in order]
+
+    def copy(self, memo=None):
+        """Returns a new list with a copy of every item. The values are shared,
+        unless memo, the memo of a deepcopy, is given."""
+        new_list = self.__class__()
+        if memo is None:
+            new_list.extend(copy.copy(item) for item in self)
+        else:
+            new_list.extend(copy.deepcopy(item, memo) for item in self)
+        return new_list
+
+
+class CompactItem(object):
+    """A lightweight item used to move values in and out of a CompactItemList.
+
+    Unlike ItemContainer, a CompactItem is detached from its list. Changing
+    the roles of an item taken out of a CompactItemList does not change the
+    list, use CompactItemList.set_role for that.
+
+    Attributes:
+        default_data (dict): The default flags and roles of the items.
+        list_factory (type): The storage engine list models use for these items.
+    """
+    __slots__ = ('data', 'roles')
+    default_data = ItemContainer.default_data
+
+    def __init__(self, item_data, roles=None):
+        self.data = item_data
+        self.roles = roles
+
+    def __getitem__(self, key):
+        """Returns the data or flags of this item, see ItemContainer.__getitem__."""
+        if self.roles is not None and key in self.roles:
+            return self.roles[key]
+        elif key == QtCore.Qt.EditRole:
+            return self.data
+        elif key == QtCore.Qt.DisplayRole:
+            return unicode(self.data)
+        return self.default_data[key]
+
+    def __setitem__(self, key, value):
+        """Sets the data or flags of the item."""
+        if key == QtCore.Qt.EditRole:
+            self.data = value
+            return
+        if self.roles is None:
+            self.roles = {}
+        self.roles[key] = value
+
+
+class CompactItemList(object):
+    """A columnar storage engine for list models.
+
+    The values are kept in one plain python list and any roles or flags
+    that are set on individual items are kept in a sparse dictionary
+    keyed by row. Rows without custom roles cost one list slot instead
+    of one ItemContainer dictionary. Select it by passing
+    item_factory=CompactItem to a list model.
+
+    Indexing the list returns detached CompactItem instances, so moving
+    items around with slices keeps their roles.
+
+    Keyword Args:
+        values (Optional[iterable]): The starting values.
+        item_factory (object): The item class, CompactItem or a subclass of it.
+    """
+
+    def __init__(self, values=(), item_factory=CompactItem):
+        self.item_factory = item_factory
+        self.default_data = item_factory.default_data
+        self._values = list(values)
+        self._roles = {}
+
+    def get_value(self, row):
+        """Returns the EditRole data at row."""
+        return self._values[row]
+
+    def get_values(self, start, stop):
+        """Returns a list of the EditRole data of the rows start through stop - 1."""
+        return self._values[start:stop]
+
+    def get_role(self, row, role):
+        """Returns the role at row, raises KeyError if it has none."""
+        roles = self._roles.get(row)
+        if roles is not None and role in roles:
+            return roles[role]
+        elif role == QtCore.Qt.EditRole:
+            return self._values[row]
+        elif role == QtCore.Qt.DisplayRole:
+            return unicode(self._values[row])
+        return self.default_data[role]
+
+    def set_role(self, row, role, value):
+        """Sets the role at row, EditRole sets the value itself."""
+        if role == QtCore.Qt.EditRole:
+            self._values[row] = value
+        else:
+            self._roles.setdefault(row, {})[role] = value
+
+    def permute(self, order):
+        """Reorders the rows so that row i holds the row that was at order[i]."""
+        values = self._values
+        self._values = [values[row] for row in order]
+        if self._roles:
+            roles = self._roles
+            self._roles = dict((new_row, roles[row]) for new_row, row in enumerate(order)
+                               if row in roles)
+
+    def copy(self, memo=None):
+        """Returns a new list with the same values and a copy of the roles.
+        The values are shared, unless memo, the memo of a deepcopy, is given."""
+        new_list = self.__class__(item_factory=self.item_factory)
+        if memo is None:
+            new_list._values = list(self._values)
+            new_list._roles = dict((row, dict(roles)) for row, roles in six.iteritems(self._roles))
+        else:
+            new_list._values = copy.deepcopy(self._values, memo)
+            new_list._roles = copy.deepcopy(self._roles, memo)
+        return new_list
+
+    def _item(self, row):
+        """Returns a detached CompactItem of the row, with a copy of its roles."""
+        roles = self._roles.get(row)
+        return self.item_factory(self._values[row], dict(roles) if roles else None)
+
+    def _rows(self, idx):
+        """Returns the positive row numbers of an int or slice index."""
+        if isinstance(idx, slice):
+            return range(*idx.indices(len(self._values)))
+        if idx < 0:
+            idx += len(self._values)
+        if not 0 <= idx < len(self._values):
+            raise IndexError("list index out of range")
+        return range(idx, idx + 1)
+
+    def _shift_roles(self, start, offset):
+        """Moves the sparse roles of every row at or after start by offset."""
+        if not self._roles:
+            return
+        shifted = {}
+        for row, roles in six.iteritems(self._roles):
+            if row >= start:
+                row += offset
+            shifted[row] = roles
+        self._roles = shifted
+
+    def _store_roles(self, row, item):
+        """Stores the roles of an item being placed at row."""
+        roles = getattr(item, 'roles', None)
+        if roles:
+            self._roles[row] = roles
+        else:
+            self._roles.pop(row, None)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        for row in range(len(self._values)):
+            yield self._item(row)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._item(row) for row in self._rows(idx)]
+        return self._item(self._rows(idx)[0])
+
+    def __setitem__(self, idx, item):
+        if not isinstance(idx, slice):
+            row = self._rows(idx)[0]
+            self._values[row] = item.data
+            self._store_roles(row, item)
+            return
+        items = list(item)
+        start, stop, step = idx.indices(len(self._values))
+        if step != 1:
+            rows = self._rows(idx)
+            if len(rows) != len(items):
+                raise ValueError("attempt to assign sequence of size {} to extended "
+                                 "slice of size {}".format(len(items), len(rows)))
+            for row, new_item in zip(rows, items):
+                self[row] = new_item
+            return
+        stop = max(start, stop)
+        del self[start:stop]
+        self._shift_roles(start, len(items))
+        self._values[start:start] = [new_item.data for new_item in items]
+        for row, new_item in enumerate(items, start):
+            self._store_roles(row, new_item)
+
+    def __delitem__(self, idx):
+        rows = self._rows(idx)
+        if not rows:
+            return
+        if isinstance(idx, slice) and idx.step not in (None, 1):
+            #delete from the back so the remaining row numbers stay valid.
+            for row in sorted(rows, reverse=True):
+                del self[row]
+            return
+        start, stop = rows[0], rows[-1] + 1
+        del self._values[start:stop]
+        if self._roles:
+            for row in rows:
+                self._roles.pop(row, None)
+            self._shift_roles(stop, start - stop)
+
+    def insert(self, idx, item):
+        """Inserts an item before idx, follows list.insert rules."""
+        length = len(self._values)
+        if idx < 0:
+            idx = max(length + idx, 0)
+        idx = min(idx, length)
+        self[idx:idx] = [item]
+
+    def append(self, item):
+        """Appends an item to the end of the list."""
+        self.insert(len(self._values), item)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self._values)
+
+
+ItemContainer.list_factory = ItemList
+CompactItem.list_factory = CompactItemList
@@ -0,0 +1,225 @@
+"""This module contains the ListProducer class, used to feed a ListModel
+from worker threads.
+
+"""
+
+import time
+import threading
+from collections import deque
+from functools import partial
+from pythonicqt.Qt import QtCore
+
+#time.monotonic does not exist in python 2.
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class QueueFull(Exception):
+    """Raised when a blocking ListProducer stays full for longer than its timeout."""
+
+
+class ListProducer(QtCore.QObject):
+    """A thread safe handle that queues changes for a ListModel.
+
+    Any thread can call append, extend, insert and update. The changes are
+    kept in a locked buffer and applied on the model's thread, at most
+    max_per_drain of them every interval msecs, inside a model.batch() so
+    consecutive appends become one row range and updates are coalesced into
+    ranges of dataChanged. Only the first change after the buffer empties
+    posts an event to the model's thread, so bursts do not flood the event
+    queue.
+
+    The producer must be created on the model's thread, it becomes a child of
+    the model and is deleted with it.
+
+    Keyword Args:
+        model (ListModel): The model the changes are applied to.
+        max_size (int): The number of changes the buffer holds.
+        overflow (str): What happens when the buffer is full. 'block' waits for
+            the model's thread to drain it, 'drop_oldest' discards the oldest
+            queued change. Never use 'block' on the model's own thread.
+        timeout (Optional[float]): Seconds a blocked producer waits before
+            raising QueueFull, None waits forever.
+        interval (int): The msecs between drains while changes are queued.
+        max_per_drain (int): The number of changes applied per drain.
+
+    Attributes:
+        Drained (Signal(int)): Emited on the model's thread after each drain
+            with the number of changes applied.
+    """
+    Drained = QtCore.Signal(int)
+    _wake = QtCore.Signal(int)
+
+    overflow_modes = ('block', 'drop_oldest')
+
+    def __init__(self, model, max_size=10000, overflow='block', timeout=None,
+                 interval=16, max_per_drain=5000):
+        super(ListProducer, self).__init__(model)
+        if overflow not in self.overflow_modes:
+            raise ValueError("overflow must be one of {} not {!r}"
+                             "".format(self.overflow_modes, overflow))
+        self.model = model
+        self.max_size = max_size
+        self.overflow = overflow
+        self.timeout = timeout
+        self.interval = interval
+        self.max_per_drain = max_per_drain
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        #a drain is scheduled, only the one holding the latest token runs.
+        self._scheduled = False
+        self._token = 0
+        self._enqueued = 0
+        self._applied = 0
+        self._dropped = 0
+        self._errors = 0
+        self._max_depth = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._last_latency = 0.0
+        self._wake.connect(self._scheduled_drain, QtCore.Qt.QueuedConnection)
+
+    #Producer methods, safe to call from any thread.
+    def append(self, value):
+        """Queues appending value to the end of the model."""
+        self._put('insert', None, value)
+
+    def extend(self, values):
+        """Queues appending every value to the end of the model."""
+        for value in values:
+            self._put('insert', None, value)
+
+    def insert(self, idx, value):
+        """Queues inserting value before idx."""
+        self._put('insert', idx, value)
+
+    def update(self, idx, value):
+        """Queues setting the value at idx."""
+        self._put('set', idx, value)
+
+    def _put(self, kind, idx, value):
+        """Adds a change to the buffer, applying the overflow policy."""
+        with self._not_full:
+            if len(self._queue) >= self.max_size:
+                if self.overflow == 'drop_oldest':
+                    self._queue.popleft()
+                    self._dropped += 1
+                else:
+                    deadline = None if self.timeout is None else _clock() + self.timeout
+                    while len(self._queue) >= self.max_size:
+                        remaining = None if deadline is None else deadline - _clock()
+                        if remaining is not None and remaining <= 0:
+                            raise QueueFull("ListProducer buffer of {} changes is full."
+                                            "".format(self.max_size))
+                        self._not_full.wait(remaining)
+            self._queue.append((kind, idx, value, _clock()))
+            self._enqueued += 1
+            self._max_depth = max(self._max_depth, len(self._queue))
+            wake = not self._scheduled
+            if wake:
+                self._scheduled = True
+                self._token += 1
+                token = self._token
+        if wake:
+            self._wake.emit(token)
+
+    #Statistics, safe to call from any thread.
+    @property
+    def queue_depth(self):
+        """The number of changes waiting to be applied."""
+        with self._lock:
+            return len(self._queue)
+
+    def stats(self):
+        """Returns a dictionary of the producer statistics. Latencies are the
+        seconds between queueing a change and applying it, errors is the
+        number of drains that raised."""
+        with self._lock:
+            return {
+                'queue_depth': len(self._queue),
+                'max_depth': self._max_depth,
+                'enqueued': self._enqueued,
+                'applied': self._applied,
+                'dropped': self._dropped,
+                'errors': self._errors,
+                'last_latency': self._last_latency,
+                'max_latency': self._max_latency,
+                'mean_latency': self._total_latency / self._applied if self._applied else 0.0,
+                }
+
+    #Model thread methods.
+    def _take(self):
+        """Removes up to max_per_drain changes from the buffer."""
+        with self._not_full:
+            count = min(len(self._queue), self.max_per_drain)
+            changes = [self._queue.popleft() for _ in range(count)]
+            if changes:
+                self._not_full.notify_all()
+            return changes
+
+    def _scheduled_drain(self, token):
+        """Drains if token is the one of the latest scheduled drain. Wake ups
+        and timers that were replaced, for example by a flush, do nothing, so
+        there is never more than one chain of drains."""
+        with self._lock:
+            if token != self._token:
+                return
+        self._drain()
+
+    def _drain(self):
+        """Applies the queued changes to the model in one batch.
+
+        If a change fails, for example an update of a row that does not
+        exist, the error is raised after the next drain is scheduled, so the
+        rest of the buffer is still applied. The changes of the failed batch
+        that come after the failing one are lost.
+        """
+        changes = self._take()
+        failed = True
+        try:
+            if changes:
+                self._apply(changes)
+            failed = False
+        finally:
+            now = _clock()
+            with self._lock:
+                for change in changes:
+                    latency = now - change[3]
+                    self._total_latency += latency
+                    self._max_latency = max(self._max_latency, latency)
+                if changes:
+                    self._last_latency = now - changes[-1][3]
+                self._applied += len(changes)
+                self._errors += failed
+                more = bool(self._queue)
+                self._scheduled = more
+                self._token += 1
+                token = self._token
+            if more:
+                QtCore.QTimer.singleShot(self.interval, partial(self._scheduled_drain, token))
+        if changes:
+            self.Drained.emit(len(changes))
+
+    def _apply(self, changes):
+        """Applies changes to the model, consecutive appends become one extend."""
+        model = self.model
+        appends = []
+        with model.batch():
+            for kind, idx, value, queued in changes:
+                if kind == 'insert' and idx is None:
+                    appends.append(value)
+                    continue
+                if appends:
+                    model.extend(appends)
+                    appends = []
+                if kind == 'insert':
+                    model.insert(idx, value)
+                else:
+                    model[idx] = value
+            if appends:
+                model.extend(appends)
+
+    def flush(self):
+        """Applies every queued change now, must be called on the model's thread."""
+        while self.queue_depth:
+            self._drain()
@@ -0,0 +1,287 @@
+"""This module contains the SortedListModel class, a ListModel that
+keeps its values sorted.
+
+"""
+
+from bisect import bisect_left, bisect_right
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.listmodel import ListModel
+from pythonicqt.models.modelitems import ItemContainer
+
+
+def _identity(value):
+    return value
+
+
+class SortedListModel(ListModel):
+    """A ListModel whose values are always sorted by a key function.
+
+    The key of every row is kept in a python list next to the items, so the
+    row of a value is found by bisection. add places a single value, update
+    merges a batch of values with one row insertion per run of values that
+    land between the same two rows. Changing a value, from python or from a
+    view, moves its row to the new sorted position with beginMoveRows, so
+    the item keeps its roles and selections follow it.
+
+        model = SortedListModel(key=lambda order: order.price)
+        model.update(orders)
+        cheap = list(model.irange(None, 10.0))
+
+    Operations that would put values at an arbitrary position, like sort,
+    reverse, move and slice assignment, raise TypeError. insert
+    and insert_many only accept values that keep the list sorted, and
+    append and extend are add and update.
+
+    Keyword Args:
+        values (Optional[iterable]): The starting values, in any order.
+        key (Optional[callable]): Returns the sort key of a value, by default
+            the values are compared directly.
+        item_factory(object): The item container that handles item roles and flags along
+            with the data.
+
+    """
+    def __init__(self, values=None, key=None, item_factory=ItemContainer):
+        if key is None:
+            key = _identity
+        values = sorted(values or (), key=key)
+        super(SortedListModel, self).__init__(values, item_factory=item_factory)
+        self._key = key
+        self._keys = [key(value) for value in values]
+
+    @property
+    def key(self):
+        """The key function of the list."""
+        return self._key
+
+    def _not_supported(self, *args, **kwargs):
+        raise TypeError("{} keeps its values sorted, it can not put values at an "
+                        "arbitrary position, use add or update"
+                        "".format(self.__class__.__name__))
+
+    sort = reverse = move = move_range = rotate = _not_supported
+
+    #Keeping self._keys in step with the items.
+    def _end_insert(self, first, last, announce):
+        get_value = self._container.get_value
+        self._keys[first:first] = [self._key(get_value(row)) for row in range(first, last + 1)]
+        super(SortedListModel, self)._end_insert(first, last, announce)
+
+    def _end_remove(self, first, last, announce):
+        del self._keys[first:last + 1]
+        super(SortedListModel, self)._end_remove(first, last, announce)
+
+    def _move_rows(self, first, last, to):
+        keys = self._keys[first:last + 1]
+        del self._keys[first:last + 1]
+        self._keys[to:to] = keys
+        super(SortedListModel, self)._move_rows(first, last, to)
+
+    def _replace_rows(self, rows, values):
+        for row, value in zip(rows, values):
+            self._keys[row] = self._key(value)
+        super(SortedListModel, self)._replace_rows(rows, values)
+
+    def __copy__(self, deep_copy_memo=None):
+        """Makes a copy of the list with the same key function, see BaseListModel.__copy__."""
+        new_instance = super(SortedListModel, self).__copy__(deep_copy_memo)
+        new_instance._key = self._key
+        get_value = new_instance._container.get_value
+        new_instance._keys = [self._key(get_value(row)) for row in range(len(self._keys))]
+        return new_instance
+
+    def reset(self, values=()):
+        """Replaces every value of the list with values, in sorted order, see ListModel.reset."""
+        values = sorted(values, key=self._key)
+        self._keys = [self._key(value) for value in values]
+        super(SortedListModel, self).reset(values)
+
+    #Lookups
+    def bisect_key_left(self, key):
+        """Returns the first row whose key is not less than key."""
+        return bisect_left(self._keys, key)
+
+    def bisect_key_right(self, key):
+        """Returns the first row whose key is greater than key."""
+        return bisect_right(self._keys, key)
+
+    def rows_between(self, lo=None, hi=None, inclusive=(True, True)):
+        """Returns the range of rows whose keys are between lo and hi.
+        None leaves that side open.
+
+        Keyword Args:
+            inclusive (tuple): Whether rows with a key equal to lo and hi are included.
+        """
+        first = 0
+        last = len(self._keys)
+        if lo is not None:
+            first = (bisect_left if inclusive[0] else bisect_right)(self._keys, lo)
+        if hi is not None:
+            last = (bisect_right if inclusive[1] else bisect_left)(self._keys, hi)
+        return range(first, max(first, last))
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True)):
+        """Iterates over the values whose keys are between lo and hi, see rows_between."""
+        get_value = self._container.get_value
+        for row in self.rows_between(lo, hi, inclusive):
+            yield get_value(row)
+
+    def _key_rows(self, item):
+        """Returns the range of rows whose key equals the key of item. It is
+        empty if item has no key that compares with the keys of the list, like
+        a value of another type, so such values are simply not found."""
+        try:
+            key = self._key(item)
+            return range(bisect_left(self._keys, key), bisect_right(self._keys, key))
+        except (TypeError, AttributeError, KeyError, ValueError):
+            return range(0)
+
+    def index_of(self, item):
+        """Returns the first row holding item, searching only the rows with its key.
+
+        Raises:
+            ValueError: if the item is not in the list.
+        """
+        get_value = self._container.get_value
+        for row in self._key_rows(item):
+            if get_value(row) == item:
+                return row
+        raise ValueError("{!r} is not in list".format(item))
+
+    def count(self, item):
+        """Returns the number of times item is in the list, searching only the rows with its key."""
+        get_value = self._container.get_value
+        return sum(1 for row in self._key_rows(item) if get_value(row) == item)
+
+    #Changes
+    def add(self, value):
+        """Inserts value after the rows with an equal key and returns its row."""
+        row = bisect_right(self._keys, self._key(value))
+        self._insert_run(row, [value])
+        return row
+
+    def append(self, value):
+        """Adds value at its sorted position, see add."""
+        self.add(value)
+
+    def update(self, values):
+        """Adds every value of an iterable at its sorted position.
+
+        The values are sorted and merged with the list in one pass, every run
+        of values that goes between the same two rows is inserted as one range
+        with ListRangeInserted. The insertions happen inside a batch, so a
+        batch with many runs becomes a single model reset.
+        """
+        values = sorted(values, key=self._key)
+        if not values:
+            return
+        runs = []
+        row = 0
+        for value in values:
+            row = bisect_right(self._keys, self._key(value), row)
+            if runs and runs[-1][0] == row:
+                runs[-1][1].append(value)
+            else:
+                runs.append((row, [value]))
+        with self.batch():
+            #last run first so the rows of the earlier runs stay valid.
+            for row, run in reversed(runs):
+                self._insert_run(row, run)
+
+    def extend(self, values):
+        """Adds the values at their sorted positions, see update."""
+        if values is self:
+            values = list(values)
+        self.update(values)
+
+    def _fits(self, row, values):
+        """Returns whether values are sorted and can be inserted before row."""
+        keys = [self._key(value) for value in values]
+        if row > 0:
+            keys.insert(0, self._keys[row - 1])
+        if row < len(self._keys):
+            keys.append(self._keys[row])
+        return all(keys[offset] <= keys[offset + 1] for offset in range(len(keys) - 1))
+
+    def insert(self, idx, value):
+        """Inserts value before idx like list.insert.
+
+        Raises:
+            ValueError: if value does not belong at idx.
+        """
+        row = self._clamp_insert_idx(idx)
+        if not self._fits(row, [value]):
+            raise ValueError("{!r} does not belong at row {}".format(value, row))
+        return super(SortedListModel, self).insert(row, value)
+
+    def insert_many(self, idx, values):
+        """Inserts all of the values before idx, see ListModel.insert_many.
+
+        Raises:
+            ValueError: if the values are not sorted or do not belong at idx.
+        """
+        values = list(values)
+        row = self._clamp_insert_idx(idx)
+        if not self._fits(row, values):
+            raise ValueError("the values do not belong at row {}".format(row))
+        super(SortedListModel, self).insert_many(row, values)
+
+    def assign(self, values, key=None, reset_threshold=None):
+        """Makes the list equal to the sorted values, see ListModel.assign."""
+        super(SortedListModel, self).assign(sorted(values, key=self._key), key, reset_threshold)
+
+    def __setitem__(self, idx, value):
+        """Sets the value of a row, then moves the row to its sorted position.
+
+        Raises:
+            TypeError: for slices.
+        """
+        if isinstance(idx, slice):
+            self._not_supported()
+        super(SortedListModel, self).__setitem__(idx, value)
+
+    def _set_value(self, row, value):
+        """Sets the value of row and returns the sorted row it moved to."""
+        super(SortedListModel, self).setData(self.index(row, 0), value)
+        return self._reposition(row)
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Sets the data of a role at a row, see ListModel.setData. A new value
+        moves the row to its sorted position with beginMoveRows.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        result = super(SortedListModel, self).setData(index, value, role)
+        if result and role == QtCore.Qt.EditRole:
+            self._reposition(index.row())
+        return result
+
+    def _reposition(self, row):
+        """Moves row to the sorted position of its current value and returns
+        the new row."""
+        keys = self._keys
+        key = self._key(self._container.get_value(row))
+        keys[row] = key
+        if row > 0 and key < keys[row - 1]:
+            to = bisect_right(keys, key, 0, row)
+        elif row + 1 < len(keys) and keys[row + 1] < key:
+            to = bisect_right(keys, key, row + 1) - 1
+        else:
+            return row
+        self._move_rows(row, row, to)
+        return to
+
+    def remove(self, value):
+        """Removes the first row holding value.
+
+        Raises:
+            ValueError: if the value is not in the list.
+        """
+        del self[self.index_of(value)]
+
+    def discard(self, value):
+        """Removes the first row holding value, if there is one."""
+        try:
+            self.remove(value)
+        except ValueError:
+            pass
@@ -0,0 +1,302 @@
+"""This module contains the SparseTableModel class, a table model that
+only stores the cells that hold values.
+
+"""
+
+import six
+from collections import MutableMapping
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.basemodel import _BaseModel
+from pythonicqt.models.modelitems import ItemContainer
+
+#Shared by every empty row lookup so reading empty cells never allocates.
+_EMPTY_ROW = {}
+
+
+class SparseTableModel(MutableMapping, _BaseModel, QtCore.QAbstractTableModel):
+    """A QAbstractTableModel for huge grids where few cells hold values.
+
+    The row and column counts are declared, only populated cells are stored,
+    one item_factory instance per cell in a dictionary per populated row.
+    Empty cells return default_value without allocating anything.
+
+    Instances are also a mapping of (row, column) to the value of populated
+    cells. Reading an empty cell inside the grid returns default_value,
+    iterating, len and the in operator only see populated cells.
+
+    Writing default_value to a cell, with setData, item assignment or
+    update_block, empties it. A cell that has other roles, like a ToolTipRole
+    set on an empty cell, stays populated with default_value so the roles are
+    kept.
+
+        model = SparseTableModel(1000000, 1000)
+        model[5, 7] = 'x'
+        model.update_block(10, 0, [[1, 2], [3, 4]])
+
+    Keyword Args:
+        row_count (int): The number of rows of the grid.
+        column_count (int): The number of columns of the grid.
+        cells (Optional[dict]): Maps (row, column) to the starting values.
+        default_value (object): The value of empty cells.
+        item_factory(object): The item container that handles item roles and flags along
+            with the data.
+    """
+
+    def __init__(self, row_count=0, column_count=0, cells=None, default_value=None,
+                 item_factory=ItemContainer):
+        super(SparseTableModel, self).__init__()
+        self._row_count = row_count
+        self._column_count = column_count
+        self.default_value = default_value
+        self._item_factory = item_factory
+        self._rows = {}
+        self._cell_count = 0
+        for (row, column), value in six.iteritems(cells or {}):
+            self._check_cell(row, column)
+            self._write(row, column, value)
+
+    def _check_cell(self, row, column):
+        """Raises IndexError if the cell is outside of the grid."""
+        if not (0 <= row < self._row_count and 0 <= column < self._column_count):
+            raise IndexError("cell ({}, {}) is outside of the {}x{} grid"
+                             "".format(row, column, self._row_count, self._column_count))
+
+    def _store(self, row, column, value):
+        """Sets the value of a cell without notifying views, keeping its roles."""
+        cells = self._rows.setdefault(row, {})
+        item = cells.get(column)
+        if item is None:
+            cells[column] = self._item_factory(value)
+            self._cell_count += 1
+        else:
+            item[QtCore.Qt.EditRole] = value
+
+    def _write(self, row, column, value):
+        """Sets the value of a cell without notifying views. default_value
+        empties the cell, unless it has roles other than EditRole."""
+        if value != self.default_value:
+            self._store(row, column, value)
+            return
+        item = self._rows.get(row, _EMPTY_ROW).get(column)
+        if item is None:
+            return
+        if any(role != QtCore.Qt.EditRole for role in item):
+            item[QtCore.Qt.EditRole] = value
+        else:
+            self._discard(row, column)
+
+    def _discard(self, row, column):
+        """Removes a cell without notifying views, returns whether it existed."""
+        cells = self._rows.get(row)
+        if cells is None or column not in cells:
+            return False
+        del cells[column]
+        if not cells:
+            del self._rows[row]
+        self._cell_count -= 1
+        return True
+
+    def _emit_block(self, first_row, first_column, last_row, last_column):
+        """Emits one dataChanged for a rectangle of cells."""
+        self.dataChanged.emit(self.index(first_row, first_column),
+                              self.index(last_row, last_column))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Returns the declared number of rows.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """Returns the declared number of columns.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return self._column_count
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Returns the data of a role of a cell. Empty cells return default_value
+        for EditRole, an empty string for DisplayRole and the item_factory
+        default_data for other roles.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return None
+        item = self._rows.get(index.row(), _EMPTY_ROW).get(index.column())
+        if item is not None:
+            try:
+                return item[role]
+            except KeyError:
+                return None
+        if role == QtCore.Qt.EditRole:
+            return self.default_value
+        elif role == QtCore.Qt.DisplayRole:
+            return u'' if self.default_value is None else unicode(self.default_value)
+        return self._item_factory.default_data.get(role)
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Sets the data of a role of a cell, populating the cell if needed.
+        Setting the value of a cell to default_value empties it, unless the
+        cell has other roles. Setting another role of an empty cell populates
+        it with default_value.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return False
+        row, column = index.row(), index.column()
+        if role == QtCore.Qt.EditRole:
+            self._write(row, column, value)
+        else:
+            self._store(row, column, self.get((row, column)))
+            self._rows[row][column][role] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        """Returns the QtCore.Qt.ItemFlags of the cell at the index.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return self.data(index, QtCore.Qt.ItemFlags)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """Returns the section number of the header.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        return unicode(section)
+
+    def resize(self, row_count, column_count):
+        """Changes the declared size of the grid, dropping the cells outside of it.
+        Emits the row and column insert or remove signals for the change."""
+        parent = QtCore.QModelIndex()
+        if row_count < self._row_count:
+            self.beginRemoveRows(parent, row_count, self._row_count - 1)
+            for row in [row for row in self._rows if row >= row_count]:
+                self._cell_count -= len(self._rows.pop(row))
+            self._row_count = row_count
+            self.endRemoveRows()
+        elif row_count > self._row_count:
+            self.beginInsertRows(parent, self._row_count, row_count - 1)
+            self._row_count = row_count
+            self.endInsertRows()
+        if column_count < self._column_count:
+            self.beginRemoveColumns(parent, column_count, self._column_count - 1)
+            for row, cells in list(six.iteritems(self._rows)):
+                for column in [column for column in cells if column >= column_count]:
+                    self._discard(row, column)
+            self._column_count = column_count
+            self.endRemoveColumns()
+        elif column_count > self._column_count:
+            self.beginInsertColumns(parent, self._column_count, column_count - 1)
+            self._column_count = column_count
+            self.endInsertColumns()
+
+    def update_block(self, row, column, block):
+        """Writes a block of values, a list of rows, with its top left corner at
+        row, column. Cells set to default_value become empty, unless they have
+        other roles. Emits one dataChanged for the block.
+
+        Raises:
+            IndexError: if the block does not fit in the grid.
+        """
+        block = [list(values) for values in block]
+        if not block or not max(len(values) for values in block):
+            return
+        last_row = row + len(block) - 1
+        last_column = column + max(len(values) for values in block) - 1
+        self._check_cell(row, column)
+        self._check_cell(last_row, last_column)
+        for row_offset, values in enumerate(block):
+            for column_offset, value in enumerate(values):
+                self._write(row + row_offset, column + column_offset, value)
+        self._emit_block(row, column, last_row, last_column)
+
+    def clear_block(self, first_row, first_column, last_row, last_column):
+        """Empties every cell of the rectangle, roles included, with one dataChanged.
+
+        Raises:
+            IndexError: if the rectangle does not fit in the grid.
+        """
+        self._check_cell(first_row, first_column)
+        self._check_cell(last_row, last_column)
+        for row in [row for row in self._rows if first_row <= row <= last_row]:
+            for column in [column for column in self._rows[row]
+                           if first_column <= column <= last_column]:
+                self._discard(row, column)
+        self._emit_block(first_row, first_column, last_row, last_column)
+
+    def iter_cells(self):
+        """Iterates over (row, column, value) of the populated cells, in no order."""
+        for row, cells in six.iteritems(self._rows):
+            for column, item in six.iteritems(cells):
+                yield row, column, item.data
+
+    #MutableMapping Abstract Methods
+    def __getitem__(self, cell):
+        """Returns the value of a cell, default_value for empty cells.
+
+        Raises:
+            IndexError: if the cell is outside of the grid.
+        """
+        row, column = cell
+        item = self._rows.get(row, _EMPTY_ROW).get(column)
+        if item is not None:
+            return item.data
+        self._check_cell(row, column)
+        return self.default_value
+
+    def __setitem__(self, cell, value):
+        """Sets the value of a cell and emits dataChanged, default_value empties
+        the cell unless it has other roles."""
+        row, column = cell
+        self._check_cell(row, column)
+        self._write(row, column, value)
+        self._emit_block(row, column, row, column)
+
+    def __delitem__(self, cell):
+        """Empties a cell and emits dataChanged.
+
+        Raises:
+            KeyError: if the cell is not populated.
+        """
+        row, column = cell
+        if not self._discard(row, column):
+            raise KeyError(cell)
+        self._emit_block(row, column, row, column)
+
+    def __iter__(self):
+        """Iterates over the (row, column) of the populated cells."""
+        for row, cells in six.iteritems(self._rows):
+            for column in cells:
+                yield row, column
+
+    def __len__(self):
+        """Returns the number of populated cells."""
+        return self._cell_count
+
+    def __contains__(self, cell):
+        """Returns whether a cell is populated."""
+        row, column = cell
+        return column in self._rows.get(row, _EMPTY_ROW)
+
+    def __repr__(self):
+        return "{}({}, {}, cells={!r})".format(self.__class__.__name__, self._row_count,
+                                               self._column_count, dict(self.items()))
@@ -3,6 +3,7 @@ the TableModel class.
 """
 
 import six
+from array import array
 from collections import MutableSequence
 from pythonicqt.Qt import QtCore
 from six.moves import xrange
@@ -12,48 +13,125 @@ from pythonicqt.models.modelitems import ItemContainer
 
 @six.add_metaclass(QtMetaStitch)
 class BaseTableModel(QtCore.QAbstractTableModel):
-    """"A working implimentation of QAbstractTableModel."""
+    """"A working implimentation of QAbstractTableModel that stores its data by column.
 
-    def __init__(self, *args, **kwargs):
-        super(BaseTableModel, self).__init__(*args, **kwargs)
-        if not self._container:
-            self.column_count = 0
+    self._columns holds one python list, or array.array if a typecode is
+    given, per column. Roles other than DisplayRole and EditRole are kept in a
+    sparse dictionary keyed by (row, column), so a cell without custom roles
+    costs one slot in its column. Header data is computed when it is asked
+    for, only the header sections set with setHeaderData are stored.
+
+    Keyword Args:
+        rows (Optional[iterable]): The starting rows, each an iterable of cell values.
+        columns (Optional[list]): The names of the columns, shown in the horizontal
+            header. If not given, the columns are numbered and their count is taken
+            from the first row.
+        typecodes (Optional[list]): An array.array typecode or None per column.
+
+    Attributes:
+        default_data (dict): The default flags and roles of the cells.
+    """
+    default_data = ItemContainer.default_data
+
+    def __init__(self, rows=None, columns=None, typecodes=None):
+        super(BaseTableModel, self).__init__()
+        rows = [] if rows is None else [list(row) for row in rows]
+        if columns is None:
+            column_count = len(rows[0]) if rows else 0
+            self._column_names = [None] * column_count
         else:
-            self.column_count = len(self._container[0])
-        #Containers for the header data
-        self._header_data = {
-                QtCore.Qt.Horizontal: [item_factory(num) for num in xrange(self.column_count)],
-                QtCore.Qt.Vertical: [item_factory(num) for num in xrange(self._container)],
-                }
-
-    def columnCount(self, parent=None):
+            self._column_names = list(columns)
+            column_count = len(self._column_names)
+        if typecodes is None:
+            typecodes = [None] * column_count
+        self._columns = [self._new_column(typecode) for typecode in typecodes]
+        self._cell_roles = {}
+        self._header_data = {QtCore.Qt.Horizontal: {}, QtCore.Qt.Vertical: {}}
+        self._row_count = 0
+        self._check_rows(rows)
+        self._insert_slices(self._column_slices(rows), len(rows))
+
+    @staticmethod
+    def _new_column(typecode=None, values=()):
+        """Returns the storage of a column."""
+        if typecode is None:
+            return list(values)
+        return array(typecode, values)
+
+    def _check_rows(self, rows):
+        """Raises ValueError if a row does not have one value per column."""
+        for row in rows:
+            if len(row) != len(self._columns):
+                raise ValueError("rows must have {} values, not {}"
+                                 "".format(len(self._columns), len(row)))
+
+    def _column_slices(self, rows):
+        """Returns the values of rows as one slice per column, converted to the
+        storage of the column. Raises before anything changes if a value does not
+        fit its column."""
+        return [self._new_column(getattr(column, 'typecode', None), values)
+                for column, values in zip(self._columns, zip(*rows))]
+
+    def _insert_slices(self, slices, count, idx=None):
+        """Inserts count rows, given as column slices, without notifying views."""
+        if idx is None:
+            idx = self._row_count
+        for column, values in zip(self._columns, slices):
+            column[idx:idx] = values
+        self._row_count += count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
         """Returns the the column count.
         Note:
             This method overrides the virtual function of it's parent.
         """
-        return self.column_count
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Returns the the row count.
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid():
+            return 0
+        return self._row_count
 
-    def setHeaderData(self, section, orientation, value, role=QtCore.Qt.QEditRole):
-        """Sets the header data.
+    def setHeaderData(self, section, orientation, value, role=QtCore.Qt.EditRole):
+        """Sets the header data, only set sections are stored.
 
         Note:
             This method overrides the virtual function of it's parent.
         """
-        self._header_data[orientation][section][role] = value
+        if role == QtCore.Qt.EditRole:
+            role = QtCore.Qt.DisplayRole
+        self._header_data[orientation].setdefault(section, {})[role] = value
+        self.headerDataChanged.emit(orientation, section, section)
+        return True
 
     def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
-        """Returns the header data of the item, default is the column or list number.
+        """Returns the header data of the item, default is the column name or number.
 
         Note:
             This method overrides the virtual function of it's parent.
         """
-        return self._header_data[orientation][section][role]
+        overrides = self._header_data[orientation].get(section)
+        if overrides is not None and role in overrides:
+            return overrides[role]
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal and 0 <= section < len(self._column_names):
+            name = self._column_names[section]
+            if name is not None:
+                return unicode(name)
+        return unicode(section)
 
     def setData(self, index, value, role=QtCore.Qt.EditRole):
-        """Sets the data of a role at a specific index of the list.
-        If the role is DisplayRole or EditRole, sets the value located
-        in the underlying list at the index. Else sets the role of the
-        individual item specifically.
+        """Sets the data of a role at a specific index of the table.
+        EditRole sets the value in the column, any other role is stored
+        for the individual cell. Returns False if the value does not fit the
+        typecode of the column.
 
         This method is expanded to also accept a new role, you can set item
         flags by passing in the role QtCore.Qt.ItemFlags.
@@ -65,25 +143,26 @@ class BaseTableModel(QtCore.QAbstractTableModel):
         Note:
             This method overrides the virtual function of it's parent.
 
-        Raises:
-            TypeError: if role is not a instance of ItemDataRole or specifically QtCore.Qt.ItemFlags
-
         """
-        if not isinstance(role, QtCore.Qt.ItemDataRole) and role is not QtCore.Qt.ItemFlags:
-            raise TypeError("role parameter must be a instance of QtCore.Qt.ItemDataRole or QtCore.Qt.ItemFlags "
-                            "not {}".format(type(role)))
         if not index.isValid():
-            return None
+            return False
         row, column = index.row(), index.column()
-        self._container[row][role] = value
+        if role == QtCore.Qt.EditRole:
+            try:
+                self._columns[column][row] = value
+            except (TypeError, ValueError, OverflowError):
+                #the value does not fit the typecode of an array column.
+                return False
+        else:
+            self._cell_roles.setdefault((row, column), {})[role] = value
+        self.dataChanged.emit(index, index)
         return True
 
     def data(self, index, role=QtCore.Qt.DisplayRole):
-        """Returns the data of a role at a specific index of the list.
-        If the role is DisplayRole or EditRole, returns the value located
-        in the underlying list at the index. Else returns the role of the
-        individual item if the user has set it. Else returns the default
-        role data located in the class attribute if it exists.
+        """Returns the data of a role at a specific index of the table.
+        Returns the role of the individual cell if the user has set it,
+        else the value for EditRole, a unicode version of it for DisplayRole,
+        else the default role data located in the class attribute if it exists.
 
         Args:
             index (QModelIndex):
@@ -96,25 +175,306 @@ class BaseTableModel(QtCore.QAbstractTableModel):
         if not index.isValid():
             return None
         row, column = index.row(), index.column()
-        try:
-            return self._container[row][role]
-        except KeyError as e:
-            return None
-    
-    #todo docs
+        roles = self._cell_roles.get((row, column))
+        if roles is not None and role in roles:
+            return roles[role]
+        if role == QtCore.Qt.EditRole:
+            return self._columns[column][row]
+        elif role == QtCore.Qt.DisplayRole:
+            return unicode(self._columns[column][row])
+        return self.default_data.get(role)
+
     def flags(self, index):
         """Returns the QtCore.Qt.ItemFlags of the item at the index.
 
         You can set item flags using the setData method.
-        
+
         Note:
             This method overrides the virtual function of it's parent.
 
         """
         if not index.isValid():
-            return None
-        row, column = index.row(), index.column()
+            return QtCore.Qt.NoItemFlags
+        return self.data(index, QtCore.Qt.ItemFlags)
+
+    #Row and column structure changes.
+    def insert_rows(self, idx, rows):
+        """Inserts rows of values before row idx with a single beginInsertRows.
+
+        Raises:
+            ValueError: if a row does not have one value per column.
+        """
+        rows = [list(row) for row in rows]
+        if not rows:
+            return
+        if not self._columns and not self._row_count:
+            self._column_names = [None] * len(rows[0])
+            self._columns = [self._new_column() for _ in rows[0]]
+        self._check_rows(rows)
+        slices = self._column_slices(rows)
+        idx = max(0, min(idx, self._row_count))
+        self.beginInsertRows(QtCore.QModelIndex(), idx, idx + len(rows) - 1)
+        self._insert_slices(slices, len(rows), idx)
+        self._shift_sections(QtCore.Qt.Vertical, idx, len(rows))
+        self.endInsertRows()
+
+    def remove_rows(self, first, count=1):
+        """Removes count rows starting at first with a single beginRemoveRows."""
+        count = min(count, self._row_count - first)
+        if first < 0 or count <= 0:
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), first, first + count - 1)
+        for column in self._columns:
+            del column[first:first + count]
+        self._row_count -= count
+        self._shift_sections(QtCore.Qt.Vertical, first, -count)
+        self.endRemoveRows()
+
+    def insert_column(self, idx, name=None, values=None, typecode=None):
+        """Inserts a column before column idx with a single beginInsertColumns.
+        values defaults to a column of None, or zeros for a typecode.
+
+        Raises:
+            ValueError: if values does not have one value per row.
+        """
+        if values is None:
+            values = [None if typecode is None else 0] * self._row_count
+        column = self._new_column(typecode, values)
+        if len(column) != self._row_count:
+            raise ValueError("column must have {} values, not {}"
+                             "".format(self._row_count, len(column)))
+        idx = max(0, min(idx, len(self._columns)))
+        self.beginInsertColumns(QtCore.QModelIndex(), idx, idx)
+        self._columns.insert(idx, column)
+        self._column_names.insert(idx, name)
+        self._shift_sections(QtCore.Qt.Horizontal, idx, 1)
+        self.endInsertColumns()
+
+    def remove_column(self, idx):
+        """Removes column idx with a single beginRemoveColumns.
+
+        Raises:
+            IndexError: if there is no column idx.
+        """
+        if not 0 <= idx < len(self._columns):
+            raise IndexError("column index out of range")
+        self.beginRemoveColumns(QtCore.QModelIndex(), idx, idx)
+        del self._columns[idx]
+        del self._column_names[idx]
+        self._shift_sections(QtCore.Qt.Horizontal, idx, -1)
+        self.endRemoveColumns()
+
+    def _shift_sections(self, orientation, start, offset):
+        """Moves the header overrides and cell roles of the rows or columns at or
+        after start by offset, dropping the ones that were removed."""
+        removed_end = start - offset if offset < 0 else start
+        def shift(section):
+            if section < start:
+                return section
+            if section < removed_end:
+                return None
+            return section + offset
+        headers = {}
+        for section, roles in six.iteritems(self._header_data[orientation]):
+            section = shift(section)
+            if section is not None:
+                headers[section] = roles
+        self._header_data[orientation] = headers
+        if not self._cell_roles:
+            return
+        position = 0 if orientation == QtCore.Qt.Vertical else 1
+        cell_roles = {}
+        for cell, roles in six.iteritems(self._cell_roles):
+            section = shift(cell[position])
+            if section is not None:
+                cell = (section, cell[1]) if position == 0 else (cell[0], section)
+                cell_roles[cell] = roles
+        self._cell_roles = cell_roles
+
+
+class TableModel(MutableSequence, BaseTableModel):
+    """A python like implimentation of a QAbstractTableModel.
+
+    Instances of this class are a list of rows and a dictionary of columns.
+    Integer indices and slices read and write rows, each row is a list of cell
+    values. Column names (or numbers through column()) read and write entire
+    columns. Every change updates the connected views with range signals.
+
+        model = TableModel([('AAPL', 1.0), ('MSFT', 2.0)], columns=['symbol', 'price'])
+        model.append(('GOOG', 3.0))
+        model['price'] = [4.0, 5.0, 6.0]
+
+    Note:
+        TableModel.index is the QAbstractTableModel.index method.
+    """
+
+    def _column_number(self, name):
+        """Returns the number of a named column.
+
+        Raises:
+            KeyError: if there is no such column.
+        """
         try:
-            return self._container[row][QtCore.Qt.ItemFlags]
-        except KeyError as e:
-            return None
\ No newline at end of file
+            return self._column_names.index(name)
+        except ValueError:
+            raise KeyError(name)
+
+    @property
+    def column_names(self):
+        """A list of the column names, None for unnamed columns."""
+        return list(self._column_names)
+
+    def row(self, idx):
+        """Returns a list of the values of a row."""
+        return [column[idx] for column in self._columns]
+
+    def column(self, column):
+        """Returns a list of the values of a column number."""
+        return list(self._columns[column])
+
+    def set_column(self, column, values):
+        """Sets every value of a column number with one dataChanged.
+
+        Raises:
+            ValueError: if values does not have one value per row.
+        """
+        values = self._new_column(getattr(self._columns[column], 'typecode', None), values)
+        if len(values) != self._row_count:
+            raise ValueError("column must have {} values, not {}"
+                             "".format(self._row_count, len(values)))
+        self._columns[column] = values
+        if self._row_count:
+            self.dataChanged.emit(self.index(0, column), self.index(self._row_count - 1, column))
+
+    def as_dict(self):
+        """Returns a dictionary of column name (or number) to a list of its values."""
+        return dict((column if name is None else name, list(values))
+                    for column, (name, values) in enumerate(zip(self._column_names, self._columns)))
+
+    #MutableSequence Abstract Methods
+    def __getitem__(self, idx):
+        """Returns a row, a list of rows for a slice, or a column for a column name.
+
+        Note:
+            This method is an abstract method required for MutableSequence.
+        """
+        if isinstance(idx, six.string_types):
+            return self.column(self._column_number(idx))
+        if isinstance(idx, slice):
+            return [self.row(row) for row in xrange(*idx.indices(self._row_count))]
+        if idx < 0:
+            idx += self._row_count
+        if not 0 <= idx < self._row_count:
+            raise IndexError("table index out of range")
+        return self.row(idx)
+
+    def __setitem__(self, idx, value):
+        """Sets a row, or a column for a column name, emitting one dataChanged.
+
+        Note:
+            This method is an abstract method required for MutableSequence.
+        """
+        if isinstance(idx, six.string_types):
+            self.set_column(self._column_number(idx), value)
+            return
+        if isinstance(idx, slice):
+            raise TypeError("TableModel rows can not be set with a slice.")
+        if idx < 0:
+            idx += self._row_count
+        if not 0 <= idx < self._row_count:
+            raise IndexError("table index out of range")
+        value = list(value)
+        self._check_rows([value])
+        for column, cells in zip(self._columns, self._column_slices([value])):
+            column[idx] = cells[0]
+        if self._columns:
+            self.dataChanged.emit(self.index(idx, 0), self.index(idx, len(self._columns) - 1))
+
+    def __delitem__(self, idx):
+        """Deletes a row, a contiguous slice of rows, or a column for a column name.
+
+        Note:
+            This method is an abstract method required for MutableSequence.
+        """
+        if isinstance(idx, six.string_types):
+            self.remove_column(self._column_number(idx))
+            return
+        if isinstance(idx, slice):
+            rows = sorted(xrange(*idx.indices(self._row_count)))
+            #remove each contiguous run from the back so row numbers stay valid.
+            while rows:
+                last = rows.pop()
+                first = last
+                while rows and rows[-1] == first - 1:
+                    first = rows.pop()
+                self.remove_rows(first, last - first + 1)
+            return
+        if idx < 0:
+            idx += self._row_count
+        if not 0 <= idx < self._row_count:
+            raise IndexError("table index out of range")
+        self.remove_rows(idx)
+
+    def __len__(self):
+        """Returns the number of rows.
+
+        Note:
+            This method is an abstract method required for MutableSequence.
+        """
+        return self._row_count
+
+    def insert(self, idx, value):
+        """Inserts a row before idx.
+
+        Note:
+            This method is an abstract method required for MutableSequence."""
+        if idx < 0:
+            idx = max(self._row_count + idx, 0)
+        self.insert_rows(idx, [value])
+
+    def extend(self, rows):
+        """Appends all of the rows with a single row insertion."""
+        if rows is self:
+            rows = list(rows)
+        self.insert_rows(self._row_count, rows)
+
+    def __iter__(self):
+        """Iterates over the rows."""
+        for row in xrange(self._row_count):
+            yield self.row(row)
+
+    #Index needs to use QAbstractTableModel Index
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        """Returns the QModelIndex from the underlying model.
+
+        Note:
+            This method overrides the virtual function of QAbstractTableModel.
+            This is not the MutableSequence.index method. That is index_of.
+        """
+        return QtCore.QAbstractTableModel.index(self, row, column, parent)
+
+    def index_of(self, row):
+        """Returns the index of the first row equal to row."""
+        return super(TableModel, self).index(list(row))
+
+    def __contains__(self, row):
+        """Returns whether a row equal to row is in the table."""
+        row = list(row)
+        return any(existing == row for existing in self)
+
+    def __repr__(self):
+        """The representation of the object, does not include roles and flags."""
+        return "{}({!r}, columns={!r})".format(self.__class__.__name__, list(self),
+                                               self._column_names)
+
+    def __eq__(self, other):
+        """Returns whether the rows equal another list of rows."""
+        try:
+            return [list(row) for row in self] == [list(row) for row in other]
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        """Returns whether the rows do not equal another list of rows."""
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
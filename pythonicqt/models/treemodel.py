@@ -0,0 +1,459 @@
+"""This module contains the class and data structures that make
+the TreeModel class.
+
+"""
+
+import six
+from pythonicqt.Qt import QtCore
+from pythonicqt.baseclasses import QtMetaStitch
+from pythonicqt.models.modelitems import ItemContainer
+
+
+def _default_key(value):
+    """Strings are their own key, other values are only reachable by position."""
+    if isinstance(value, six.string_types):
+        return value
+    return None
+
+
+class TreeNode(object):
+    """A node of a TreeModel, a list of child nodes that can also be
+    indexed by key.
+
+    Integer indices are positions, any other index is a child key.
+    Children of nodes that load lazily are loaded the first time they
+    are accessed through this interface.
+
+        model['config']['paths'].append('/usr/lib')
+
+    Attributes:
+        item (ItemContainer): Holds the value, roles and flags of the node.
+        key (object): The key the parent uses for this node, or None.
+        parent (Optional[TreeNode]): The parent node, None for the root.
+        row (int): The position of this node in its parent.
+        children (Optional[list]): The child nodes, None until they are loaded.
+    """
+    __slots__ = ('model', 'item', 'key', 'parent', 'row', 'children', '_keys', '__weakref__')
+
+    def __init__(self, model, item, key=None, parent=None, row=0):
+        self.model = model
+        self.item = item
+        self.key = key
+        self.parent = parent
+        self.row = row
+        self.children = None
+        self._keys = {}
+
+    @property
+    def value(self):
+        """The EditRole data of the node, setting it updates the views."""
+        return self.item.data
+
+    @value.setter
+    def value(self, value):
+        self.item[QtCore.Qt.EditRole] = value
+        self.model._node_changed(self)
+
+    @property
+    def loaded(self):
+        """True once the children of the node are loaded."""
+        return self.children is not None
+
+    def _loaded_children(self):
+        """Returns the children, loading them first if needed."""
+        if self.children is None:
+            self.model._load(self)
+        return self.children
+
+    def child(self, idx):
+        """Returns the child node at a position or with a key.
+
+        Raises:
+            IndexError: if there is no child at the position.
+            KeyError: if no child has the key.
+        """
+        children = self._loaded_children()
+        if isinstance(idx, six.integer_types):
+            return children[idx]
+        return self._keys[idx]
+
+    def __getitem__(self, idx):
+        return self.child(idx)
+
+    def __delitem__(self, idx):
+        child = self.child(idx)
+        self.model._remove(self, child.row, child.row)
+
+    def __len__(self):
+        return len(self._loaded_children())
+
+    def __iter__(self):
+        return iter(list(self._loaded_children()))
+
+    def __contains__(self, key):
+        self._loaded_children()
+        return key in self._keys
+
+    def keys(self):
+        """Returns the keys of the children that have one."""
+        return [child.key for child in self._loaded_children() if child.key is not None]
+
+    def values(self):
+        """Returns the values of the children."""
+        return [child.value for child in self._loaded_children()]
+
+    def insert(self, idx, value, key=None):
+        """Inserts a child with value before position idx and returns it.
+        If key is None, the model key function gives its key.
+
+        Raises:
+            ValueError: if key is given and another child already has it.
+        """
+        return self.model._insert(self, idx, [(key, value)])[0]
+
+    def append(self, value, key=None):
+        """Appends a child with value and returns it, see insert."""
+        return self.insert(len(self._loaded_children()), value, key)
+
+    def extend(self, values):
+        """Appends a child for each value with a single row insertion."""
+        self.model._insert(self, len(self._loaded_children()), [(None, value) for value in values])
+
+    def pop(self, idx=-1):
+        """Removes the child at position idx and returns its value."""
+        child = self.child(idx)
+        self.model._remove(self, child.row, child.row)
+        return child.value
+
+    def clear(self):
+        """Removes every child."""
+        children = self._loaded_children()
+        if children:
+            self.model._remove(self, 0, len(children) - 1)
+
+    def path(self):
+        """Returns the list of rows from the root to this node."""
+        rows = []
+        node = self
+        while node.parent is not None:
+            rows.append(node.row)
+            node = node.parent
+        return rows[::-1]
+
+    def __repr__(self):
+        return "{}({!r}, key={!r})".format(self.__class__.__name__, self.value, self.key)
+
+
+@six.add_metaclass(QtMetaStitch)
+class TreeModel(QtCore.QAbstractItemModel):
+    """A pythonic hierarchical QAbstractItemModel.
+
+    Every node stores its parent and its row, so parent() and index() are
+    constant time. The top level nodes are the children of model.root, and
+    the model itself can be indexed like the root node.
+
+    If a loader is given, the children of a node are only created when a
+    view expands it (hasChildren, canFetchMore and fetchMore) or when they
+    are accessed in python. Call unload to free the children of a branch,
+    for example from the collapsed signal of a QTreeView.
+
+    Keyword Args:
+        data (Optional[dict or list]): Nested dictionaries and lists to build the
+            tree from. A dictionary entry whose value is a dictionary or list becomes
+            a node with the key as its value and children built from the value, any
+            other entry becomes a node with the entry value. List elements become
+            nodes with the element as value.
+        loader (Optional[callable]): Called with a TreeNode, returns an iterable of
+            the values of its children.
+        has_children (Optional[callable]): Called with an unloaded TreeNode, returns
+            whether it may have children. Views only show an expander for, and
+            only fetch, the nodes it returns True for. It is not asked about the
+            root. Without it every unloaded node may have children.
+        key (Optional[callable]): Returns the key of a child from its value. By
+            default strings are their own key. Several children may get the same
+            key from it, the key then finds the one that got it first.
+        item_factory(object): The item container that handles item roles and flags along
+            with the data.
+    """
+
+    def __init__(self, data=None, loader=None, has_children=None, key=None,
+                 item_factory=ItemContainer):
+        super(TreeModel, self).__init__()
+        self._item_factory = item_factory
+        self.loader = loader
+        self.has_children = has_children
+        self.key = _default_key if key is None else key
+        self.root = TreeNode(self, item_factory(None))
+        if loader is None or data is not None:
+            self.root.children = []
+        if data is not None:
+            self._build(self.root, data)
+
+    def _build(self, node, data):
+        """Adds the nested dictionaries and lists of data below node, without signals."""
+        if isinstance(data, dict):
+            entries = []
+            for key, value in six.iteritems(data):
+                if isinstance(value, (dict, list)):
+                    entries.append((key, key, value))
+                else:
+                    entries.append((key, value, None))
+        else:
+            entries = [(None, value, None) for value in data]
+        for key, value, children in entries:
+            child = self._new_node(node, len(node.children), key, value)
+            node.children.append(child)
+            if children is not None:
+                child.children = []
+                self._build(child, children)
+
+    def _new_node(self, parent, row, key, value):
+        """Creates a child node, registering its key with the parent. Keys
+        given explicitly must be unique, keys from the key function may repeat."""
+        if key is None:
+            key = self.key(value)
+        elif key in parent._keys:
+            raise ValueError("{!r} already has a child with the key {!r}".format(parent, key))
+        node = TreeNode(self, self._item_factory(value), key, parent, row)
+        if key is not None:
+            parent._keys.setdefault(key, node)
+        if self.loader is None:
+            node.children = []
+        return node
+
+    #Python interface of the root node.
+    def __getitem__(self, idx):
+        return self.root.child(idx)
+
+    def __delitem__(self, idx):
+        del self.root[idx]
+
+    def __len__(self):
+        return len(self.root)
+
+    def __iter__(self):
+        return iter(self.root)
+
+    def __contains__(self, key):
+        return key in self.root
+
+    def append(self, value, key=None):
+        """Appends a top level node, see TreeNode.append."""
+        return self.root.append(value, key)
+
+    def insert(self, idx, value, key=None):
+        """Inserts a top level node, see TreeNode.insert."""
+        return self.root.insert(idx, value, key)
+
+    def extend(self, values):
+        """Appends top level nodes, see TreeNode.extend."""
+        self.root.extend(values)
+
+    #Node changes.
+    def node_index(self, node, column=0):
+        """Returns the QModelIndex of a node, an invalid index for the root."""
+        if node.parent is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.row, column, node)
+
+    def node(self, index):
+        """Returns the TreeNode of a QModelIndex, the root for an invalid index."""
+        if not index.isValid():
+            return self.root
+        return index.internalPointer()
+
+    def _node_changed(self, node):
+        index = self.node_index(node)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    def _renumber(self, node, start):
+        """Updates the rows of the children of node from start on."""
+        children = node.children
+        for row in range(start, len(children)):
+            children[row].row = row
+
+    def _insert(self, node, idx, entries):
+        """Inserts (key, value) children before idx with one beginInsertRows."""
+        children = node._loaded_children()
+        idx = max(0, min(idx, len(children)))
+        new_nodes = []
+        try:
+            for offset, (key, value) in enumerate(entries):
+                new_nodes.append(self._new_node(node, idx + offset, key, value))
+        except ValueError:
+            for new_node in new_nodes:
+                if node._keys.get(new_node.key) is new_node:
+                    del node._keys[new_node.key]
+            raise
+        if not new_nodes:
+            return new_nodes
+        self.beginInsertRows(self.node_index(node), idx, idx + len(new_nodes) - 1)
+        children[idx:idx] = new_nodes
+        self._renumber(node, idx + len(new_nodes))
+        self.endInsertRows()
+        return new_nodes
+
+    def _remove(self, node, first, last):
+        """Removes the children first through last of node with one beginRemoveRows."""
+        children = node.children
+        self.beginRemoveRows(self.node_index(node), first, last)
+        freed = set()
+        for child in children[first:last + 1]:
+            if child.key is not None and node._keys.get(child.key) is child:
+                del node._keys[child.key]
+                freed.add(child.key)
+            child.parent = None
+        del children[first:last + 1]
+        if freed:
+            #another child may share a freed key.
+            for child in children:
+                if child.key in freed and child.key not in node._keys:
+                    node._keys[child.key] = child
+        self._renumber(node, first)
+        self.endRemoveRows()
+
+    def _load(self, node):
+        """Loads the children of node from the loader."""
+        if node.children is not None:
+            return
+        node.children = []
+        if self.loader is not None:
+            try:
+                self._insert(node, 0, [(None, value) for value in self.loader(node)])
+            except Exception:
+                #leave the node unloaded so it can be loaded again.
+                node.children = None
+                node._keys = {}
+                raise
+
+    def unload(self, node_or_index):
+        """Drops the children of a lazily loaded node, they are loaded again
+        the next time they are needed."""
+        node = node_or_index
+        if isinstance(node_or_index, QtCore.QModelIndex):
+            node = self.node(node_or_index)
+        if self.loader is None or node.children is None:
+            return
+        if node.children:
+            self._remove(node, 0, len(node.children) - 1)
+        node.children = None
+        node._keys = {}
+
+    #QAbstractItemModel methods.
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        """Returns the QModelIndex of the child at row of parent.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        node = self.node(parent)
+        if node.children is None or not 0 <= row < len(node.children) or column != 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=None):
+        """Returns the QModelIndex of the parent of index using the stored parent.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if index is None:
+            #QObject.parent
+            return super(TreeModel, self).parent()
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent.parent is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Returns the number of loaded children of parent.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        children = self.node(parent).children
+        return 0 if children is None else len(children)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """Returns 1, every node has a single value.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        return 1
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        """Returns whether parent has, or may load, children.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        node = self.node(parent)
+        if node.children is not None:
+            return bool(node.children)
+        return self._may_have_children(node)
+
+    def _may_have_children(self, node):
+        """Returns whether an unloaded node may have children, asking
+        has_children if it was given. The root always may."""
+        if self.has_children is not None and node is not self.root:
+            return bool(self.has_children(node))
+        return True
+
+    def canFetchMore(self, parent):
+        """Returns True if the children of parent are not loaded yet and it
+        may have some, see has_children.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        node = self.node(parent)
+        return node.children is None and self._may_have_children(node)
+
+    def fetchMore(self, parent):
+        """Loads the children of parent.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        self._load(self.node(parent))
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Returns the data of a role of the node at index.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return None
+        try:
+            return index.internalPointer().item[role]
+        except KeyError:
+            return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Sets the data of a role of the node at index.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return False
+        index.internalPointer().item[role] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        """Returns the QtCore.Qt.ItemFlags of the node at index.
+
+        Note:
+            This method overrides the virtual function of it's parent.
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return self.data(index, QtCore.Qt.ItemFlags)
@@ -0,0 +1,42 @@
+"""This module contains all of the tests for the ArrayTableModel class in arraymodel.py"""
+import pytest
+numpy = pytest.importorskip("numpy")
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.arraymodel import ArrayTableModel
+
+class TestArrayTableModel:
+    """This class has all the tests that should run for ArrayTableModel."""
+
+    def test_2d_array(self):
+        """Test reading cells and vectorized writes of a 2-D array."""
+        model = ArrayTableModel(numpy.zeros((20, 5)), formatters={1: u'{:.2f}'.format})
+        changed = []
+        model.dataChanged.connect(
+            lambda top, bottom, *args: changed.append((top.row(), top.column(),
+                                                       bottom.row(), bottom.column())))
+        assert (model.rowCount(), model.columnCount()) == (20, 5)
+        model.values[:, 3] = numpy.arange(20)
+        assert changed == [(0, 3, 19, 3)]
+        assert model.data(model.index(7, 3), QtCore.Qt.EditRole) == 7.0
+        assert model.data(model.index(7, 1)) == u'0.00'
+        model.update_block(2, 1, numpy.ones((3, 2)))
+        assert changed[-1] == (2, 1, 4, 2)
+        assert model.array[2:5, 1:3].sum() == 6
+        model.values[5, 4] = 1
+        assert changed[-1] == (5, 4, 5, 4)
+
+    def test_structured_array(self):
+        """Test named columns of a record array."""
+        array = numpy.zeros(4, dtype=[('symbol', 'U8'), ('price', float)])
+        model = ArrayTableModel(array)
+        assert model.columnCount() == 2
+        assert model.headerData(1, QtCore.Qt.Horizontal) == 'price'
+        changed = []
+        model.dataChanged.connect(
+            lambda top, bottom, *args: changed.append((top.row(), top.column(),
+                                                       bottom.row(), bottom.column())))
+        model.values['price'] = [1.0, 2.0, 3.0, 4.0]
+        model.values[1:3, 'symbol'] = u'ABC'
+        assert changed == [(0, 1, 3, 1), (1, 0, 2, 0)]
+        assert model.data(model.index(2, 0)) == u'ABC'
+        assert model.data(model.index(3, 1), QtCore.Qt.EditRole) == 4.0
@@ -0,0 +1,377 @@
+"""This module contains all of the tests for the debounce decorator in debounce.py"""
+import gc
+import weakref
+import pytest
+from pythonicqt.Qt import QtCore
+from pythonicqt.debounce import (debounce, throttle, coalesce, connect_debounced, TimerQueue,
+                                 BaseTimerQueue, ManualTimerQueue, get_queue, debounce_stats)
+
+#QTimers need an application.
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+def wait(msecs):
+    """Runs the event loop for msecs."""
+    timer = QtCore.QElapsedTimer()
+    timer.start()
+    while timer.elapsed() < msecs:
+        app.processEvents()
+        QtCore.QThread.msleep(1)
+
+class Receiver(QtCore.QObject):
+    """A QObject with debounced methods."""
+
+    def __init__(self):
+        super(Receiver, self).__init__()
+        self.calls = []
+
+    @debounce(msecs=20)
+    def trailing(self, value):
+        self.calls.append(value)
+
+    @debounce(msecs=50, fire_on_first=True)
+    def leading(self, value):
+        self.calls.append(value)
+
+    @debounce(msecs=20)
+    def trailing_reset(self):
+        self.calls.append('reset')
+
+    @coalesce(msecs=20, key=lambda entry: entry[0])
+    def rows_changed(self, batch):
+        self.calls.append(batch)
+
+class TestDebounce:
+    """This class has all the tests that should run for debounce."""
+
+    def test_trailing(self):
+        """Test that only the last call runs and the timer is idle afterwards."""
+        receiver = Receiver()
+        for value in range(5):
+            receiver.trailing(value)
+        assert receiver.calls == [] and receiver.trailing.pending
+        assert TimerQueue.for_thread().active
+        wait(60)
+        assert receiver.calls == [4]
+        assert not TimerQueue.for_thread().active
+        assert len(TimerQueue.for_thread()) == 0
+
+    def test_fire_on_first(self):
+        """Test that the first call runs right away and later calls are delayed."""
+        receiver = Receiver()
+        receiver.leading(1)
+        receiver.leading(2)
+        receiver.leading(3)
+        assert receiver.calls == [1]
+        wait(100)
+        assert receiver.calls == [1, 3]
+
+    def test_cancel_flush(self):
+        """Test the cancel and flush handles of methods and functions."""
+        receiver, other = Receiver(), Receiver()
+        receiver.trailing('a')
+        other.trailing('b')
+        receiver.trailing.cancel()
+        assert not receiver.trailing.pending and other.trailing.pending
+        other.trailing.flush()
+        assert other.calls == ['b']
+        calls = []
+        @debounce(msecs=10)
+        def function(value):
+            calls.append(value)
+        function(1)
+        function.flush()
+        wait(30)
+        assert calls == [1] and receiver.calls == []
+
+
+    def test_signal_connections(self):
+        """Test that debounced methods disconnect like methods and follow their receiver."""
+        model = QtCore.QStringListModel(['a'])
+        receiver = Receiver()
+        assert receiver.trailing == receiver.trailing
+        model.modelReset.connect(receiver.trailing_reset)
+        model.setStringList(['b'])
+        model.modelReset.disconnect(receiver.trailing_reset)
+        model.setStringList(['c'])
+        wait(40)
+        assert receiver.calls == ['reset']
+        model.modelReset.connect(receiver.trailing_reset)
+        receiver.deleteLater()
+        app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+        del receiver
+        model.setStringList(['d'])
+        wait(40)
+
+    def test_unbound_calls(self):
+        """Test that calls through the class use the timer of the instance."""
+        first, second = Receiver(), Receiver()
+        Receiver.trailing(first, 1)
+        Receiver.trailing(second, 2)
+        assert first.trailing.pending and second.trailing.pending
+        wait(60)
+        assert first.calls == [1] and second.calls == [2]
+
+
+class TestCoalesce:
+    """This class has all the tests that should run for coalesce."""
+
+    def test_batch(self):
+        """Test that the calls are delivered once, deduplicated by key."""
+        receiver = Receiver()
+        receiver.rows_changed(4, 'a')
+        receiver.rows_changed(9, 'b')
+        receiver.rows_changed(4, 'c')
+        assert receiver.calls == [] and receiver.rows_changed.pending
+        wait(60)
+        assert receiver.calls == [[(4, 'c'), (9, 'b')]]
+        assert not receiver.rows_changed.pending
+        with pytest.raises(TypeError):
+            receiver.rows_changed(row=1)
+
+    def test_max_batch_max_wait(self):
+        """Test that max_batch delivers right away and max_wait caps the delay."""
+        batches = []
+        @coalesce(msecs=10, max_batch=3)
+        def by_size(batch):
+            batches.append(batch)
+        for value in range(7):
+            by_size(value)
+        assert batches == [[0, 1, 2], [3, 4, 5]]
+        assert by_size.flush() is None and batches[-1] == [6]
+        del batches[:]
+        @coalesce(msecs=40, max_wait=60)
+        def by_time(batch):
+            batches.append(batch)
+        for value in range(10):
+            by_time(value)
+            wait(15)
+        assert batches and batches[0][0] == 0 and len(batches[0]) < 10
+
+
+class TestConnectDebounced:
+    """This class has all the tests that should run for connect_debounced."""
+
+    def test_modes(self):
+        """Test the trailing, leading and throttle modes on one signal."""
+        model = QtCore.QStringListModel(['a', 'b'])
+        calls = dict((mode, []) for mode in ('trailing', 'leading', 'throttle'))
+        connections = [connect_debounced(model.modelReset, lambda mode=mode: calls[mode].append(1),
+                                         40, mode=mode)
+                       for mode in calls]
+        for _ in range(3):
+            model.setStringList(['c'])
+        assert calls == {'trailing': [], 'leading': [1], 'throttle': [1]}
+        wait(100)
+        assert calls == {'trailing': [1], 'leading': [1], 'throttle': [1, 1]}
+        for connection in connections:
+            connection.disconnect()
+        model.setStringList(['d'])
+        wait(60)
+        assert calls == {'trailing': [1], 'leading': [1], 'throttle': [1, 1]}
+        with pytest.raises(ValueError):
+            connect_debounced(model.modelReset, len, 10, mode='sometimes')
+
+    def test_data_changed(self):
+        """Test that dataChanged ranges are merged into their bounding range."""
+        model = QtCore.QStringListModel(list('abcdefgh'))
+        ranges = []
+        def changed(top_left, bottom_right):
+            ranges.append((top_left.row(), bottom_right.row()))
+        connection = connect_debounced(model.dataChanged, changed, 20)
+        model.setData(model.index(5), 'x')
+        model.setData(model.index(2), 'y')
+        assert connection.pending
+        wait(60)
+        assert ranges == [(2, 5)]
+        connection.disconnect()
+
+    def test_receiver_destroyed(self):
+        """Test that the connections of a receiver go away with it."""
+        model = QtCore.QStringListModel(['a'])
+        receiver = Receiver()
+        calls = []
+        connection = connect_debounced(model.modelReset, lambda: calls.append(1), 10,
+                                       receiver=receiver)
+        method_connection = connect_debounced(model.modelReset, receiver.deleteLater, 10)
+        model.setStringList(['b'])
+        assert connection.pending and method_connection.pending
+        method_connection.flush()
+        app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+        assert not connection.pending
+        assert connection not in connection._connected
+        assert method_connection not in method_connection._connected
+        model.setStringList(['c'])
+        wait(30)
+        assert calls == []
+
+    def test_receiver_not_kept(self):
+        """Test that a connection does not keep its receiver alive."""
+        model = QtCore.QStringListModel(['a'])
+        receiver = Receiver()
+        calls = []
+        connection = connect_debounced(model.modelReset, receiver.deleteLater, 10)
+        lambda_connection = connect_debounced(model.modelReset, lambda: calls.append(1), 10,
+                                              receiver=receiver)
+        receiver_ref = weakref.ref(receiver)
+        del receiver
+        gc.collect()
+        assert receiver_ref() is None
+        assert connection not in connection._connected
+        assert lambda_connection not in lambda_connection._connected
+        model.setStringList(['b'])
+        wait(30)
+        assert calls == []
+
+    def test_sender_destroyed(self):
+        """Test that a connection goes away with its sender."""
+        model = QtCore.QStringListModel(['a'])
+        calls = []
+        connection = connect_debounced(model.modelReset, lambda: calls.append(1), 10)
+        connection_ref = weakref.ref(connection)
+        del connection
+        model.setStringList(['b'])
+        wait(30)
+        assert calls == [1] and connection_ref() is not None
+        del model
+        gc.collect()
+        assert connection_ref() is None
+
+
+class TestBackends:
+    """This class has all the tests for the timer queue backends."""
+
+    def test_manual_queue(self):
+        """Test debounce and throttle on a queue whose time is advanced by hand."""
+        queue = ManualTimerQueue()
+        calls = []
+        debounced = debounce(msecs=250, backend=queue)(calls.append)
+        throttled = throttle(msecs=250, backend=queue)(lambda value: calls.append(-value))
+        debounced(1)
+        throttled(1)
+        throttled(2)
+        throttled(3)
+        queue.advance(125)
+        debounced(2)
+        assert calls == [-1] and len(queue) == 2
+        queue.advance(125)
+        assert calls == [-1, -3]
+        queue.advance(125)
+        assert calls == [-1, -3, 2]
+        assert not queue.active and len(queue) == 0
+        leading = debounce(msecs=250, fire_on_first=True, ignore_delayed=True,
+                           backend=queue)(calls.append)
+        leading('a')
+        leading('b')
+        queue.advance(500)
+        leading('c')
+        assert calls[3:] == ['a', 'c']
+
+    def test_cancel_disarms(self):
+        """Test that cancel and flush drop the wake up of the queue."""
+        queue = ManualTimerQueue()
+        calls = []
+        early = debounce(msecs=100, backend=queue)(calls.append)
+        late = debounce(msecs=300, backend=queue)(calls.append)
+        early(1)
+        late(2)
+        assert queue._wakeup == 0.1 and early.pending
+        early.cancel()
+        assert queue._wakeup == 0.3 and not early.pending
+        late.flush()
+        assert not queue.active and calls == [2]
+        receiver = Receiver()
+        method = receiver.trailing
+        method(1)
+        assert method.pending and method.pending()
+        receiver.trailing.timer.cancel()
+        assert not method.pending and not method.pending()
+
+    def test_asyncio(self):
+        """Test that awaitable results run on a running asyncio loop, picked automatically."""
+        asyncio = pytest.importorskip('asyncio')
+        calls = []
+        @debounce(msecs=10)
+        def target(value):
+            calls.append(value)
+            return asyncio.sleep(0, result=value)
+        loop = asyncio.new_event_loop()
+        queues = []
+        def start():
+            queues.append(get_queue())
+            target(1)
+            target(2)
+        try:
+            loop.call_soon(start)
+            loop.run_until_complete(asyncio.sleep(0.05))
+            assert queues[0].loop is loop
+            tasks = []
+            loop.call_soon(target, 3)
+            loop.call_soon(lambda: tasks.append(target.flush()))
+            loop.run_until_complete(asyncio.sleep(0.01))
+            assert tasks[0].result() == 3
+        finally:
+            loop.close()
+        assert calls == [2, 3]
+        with pytest.raises(ValueError):
+            get_queue('gtk')
+
+    def test_async_without_loop(self):
+        """Test that async targets and the asyncio backend need a running or explicit loop."""
+        asyncio = pytest.importorskip('asyncio')
+        @debounce(msecs=10)
+        def target(value):
+            return asyncio.sleep(0, result=value)
+        target(1)
+        with pytest.raises(TypeError):
+            target.flush()
+        with pytest.raises(RuntimeError):
+            get_queue('asyncio')
+        loop = asyncio.new_event_loop()
+        try:
+            assert get_queue(loop).loop is loop
+        finally:
+            loop.close()
+
+    def test_incomplete_backend(self):
+        """Test that a queue without the wake up hooks can not be created."""
+        class HalfQueue(BaseTimerQueue):
+            def _start(self, seconds):
+                pass
+        with pytest.raises(TypeError):
+            HalfQueue()
+
+
+class TestStats:
+    """This class has all the tests for the statistics of debounced calls."""
+
+    def test_counters(self):
+        """Test the counters and histograms of a debounced function."""
+        queue = ManualTimerQueue()
+        def search(text):
+            pass
+        debounced = debounce(msecs=250, backend=queue)(search)
+        leading = debounce(msecs=250, fire_on_first=True, ignore_delayed=True,
+                           backend=queue)(search)
+        debounced('a')
+        assert len(debounce_stats) == 0
+        debounce_stats.enable()
+        try:
+            debounced('b')
+            queue.advance(125)
+            debounced('c')
+            queue.advance(250)
+            debounced('d')
+            debounced.cancel()
+            leading('e')
+            leading('f')
+        finally:
+            debounce_stats.disable()
+        leading('g')
+        stats = debounce_stats.snapshot()[debounced.stats_name]
+        assert stats['calls'] == 5 and stats['msecs'] == 250
+        assert stats['executed'] == 2 and stats['immediate'] == 1
+        assert stats['replaced'] == 2 and stats['dropped'] == 1 and stats['cancelled'] == 1
+        assert stats['delay']['count'] == 2 and stats['delay']['max'] == 375
+        assert stats['delay']['buckets'][500] == 1 and stats['delay']['buckets'][1] == 1
+        debounce_stats.reset()
+        assert debounce_stats.snapshot()[debounced.stats_name]['calls'] == 0
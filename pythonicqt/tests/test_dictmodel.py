@@ -0,0 +1,66 @@
+"""This module contains all of the tests for the DictModel class in dictmodel.py"""
+import pytest
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.dictmodel import DictModel
+
+class TestDictModel:
+    """This class has all the tests that should run for DictModel."""
+
+    def test_mapping(self):
+        """Test that the model behaves like an ordered dictionary."""
+        model = DictModel([('a', 1), ('b', 2), ('c', 3)])
+        assert list(model) == ['a', 'b', 'c']
+        assert model['b'] == 2
+        assert (model.rowCount(), model.columnCount()) == (3, 2)
+        assert model.data(model.index(2, 0)) == u'c'
+        assert model.data(model.index(2, 1), QtCore.Qt.EditRole) == 3
+        model['d'] = 4
+        assert model.row_of('d') == 3
+        del model['a']
+        assert model.row_of('d') == 2 and model.key_at(0) == 'b'
+        assert model == {'b': 2, 'c': 3, 'd': 4}
+        assert model.pop('c') == 3
+        assert list(model.items()) == [('b', 2), ('d', 4)]
+        with pytest.raises(KeyError):
+            model['a']
+        model.clear()
+        assert len(model) == 0 and model.rowCount() == 0
+
+    def test_update_signals(self):
+        """Test that update coalesces changes and inserts into range signals."""
+        model = DictModel((key, 0) for key in 'abcdef')
+        changed, inserted = [], []
+        model.dataChanged.connect(
+            lambda top, bottom, *args: changed.append((top.row(), bottom.row())))
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.update([('b', 1), ('c', 1), ('e', 1), ('x', 1), ('y', 1)], z=2)
+        assert changed == [(1, 2), (4, 4)]
+        assert inserted == [(6, 8)]
+        assert model['z'] == 2 and model.row_of('y') == 7
+
+    def test_set_data(self):
+        """Test that views can edit values but not keys."""
+        model = DictModel({'a': 1})
+        assert not model.flags(model.index(0, 0)) & QtCore.Qt.ItemIsEditable
+        assert not model.setData(model.index(0, 0), 'b')
+        assert model.setData(model.index(0, 1), 5)
+        assert model['a'] == 5
+        model.setData(model.index(0, 1), 'tip', QtCore.Qt.ToolTipRole)
+        model['b'] = 2
+        del model['b']
+        assert model.data(model.index(0, 1), QtCore.Qt.ToolTipRole) == 'tip'
+
+    def test_rows_after_deletes(self):
+        """Test that rows stay right while deletes, upserts and lookups mix."""
+        model = DictModel((key, key) for key in range(50))
+        expected = list(range(50))
+        for step in range(200):
+            key = expected[(step * 7) % len(expected)]
+            del model[key]
+            expected.remove(key)
+            model[100 + step] = step
+            expected.append(100 + step)
+            model[expected[0]] = step
+            assert model.row_of(expected[-2]) == len(expected) - 2
+        assert [model.row_of(key) for key in expected] == list(range(len(expected)))
+        assert list(model) == expected and model._dead <= len(expected)
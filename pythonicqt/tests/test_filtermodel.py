@@ -0,0 +1,95 @@
+"""This module contains all of the tests for the FilterListModel class in filtermodel.py"""
+import threading
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.listmodel import ListModel
+from pythonicqt.models.filtermodel import FilterListModel
+
+class TestFilterListModel:
+    """This class has all the tests that should run for FilterListModel."""
+
+    def test_filter(self):
+        """Test that the proxy follows changes of the source row by row."""
+        source = ListModel(list(range(10)))
+        proxy = FilterListModel(source, lambda value: value % 2 == 0)
+        assert proxy == [0, 2, 4, 6, 8]
+        inserted, removed = [], []
+        proxy.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        proxy.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        source.insert_many(3, [20, 21, 22])
+        assert proxy == [0, 2, 20, 22, 4, 6, 8]
+        assert inserted == [(2, 3)]
+        del source[0:5]
+        assert proxy == [22, 4, 6, 8]
+        assert removed == [(0, 2)]
+        source[0] = 5
+        source[1] = 7
+        assert proxy == [4, 6, 8]
+        assert proxy.proxy_row(source.index_of(6)) == 1
+        assert proxy.proxy_row(0) == -1
+        source.move(source.index_of(8), 0)
+        assert proxy == [8, 4, 6]
+        source.clear()
+        assert len(proxy) == 0
+
+    def test_sort(self):
+        """Test that the sorted proxy places changed rows by key."""
+        source = ListModel([5, 3, 8, 1])
+        proxy = FilterListModel(source, key=lambda value: value, reverse=True)
+        assert proxy == [8, 5, 3, 1]
+        source.append(4)
+        source[0] = 0
+        assert proxy == [8, 4, 3, 1, 0]
+        proxy.set_filter(lambda values: [value > 2 for value in values], batch=True)
+        assert proxy == [8, 4, 3]
+        del source[2]
+        assert proxy == [4, 3]
+        assert proxy.data(proxy.index(0, 0)) == u'4'
+        proxy.setData(proxy.index(1, 0), 9)
+        assert proxy == [9, 4] and source[1] == 9
+        proxy.set_sort(None)
+        assert proxy == [9, 4]
+
+    def test_background(self):
+        """Test that a background re-filter swaps in its result."""
+        app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+        source = ListModel(list(range(1000)))
+        proxy = FilterListModel(source)
+        proxy.set_filter(lambda value: value < 10, background=True)
+        assert len(proxy) == 1000
+        for _ in range(1000):
+            app.processEvents()
+            if len(proxy) != 1000:
+                break
+            QtCore.QThread.msleep(1)
+        assert proxy == list(range(10))
+
+    def test_background_while_changing(self):
+        """Test that a background re-filter is used even if the source changes
+        while it runs, the changed rows are filtered when it is swapped in."""
+        app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+        source = ListModel(list(range(100)))
+        proxy = FilterListModel(source)
+        resets = []
+        proxy.modelReset.connect(lambda: resets.append(len(proxy)))
+        started = threading.Event()
+        gate = threading.Event()
+        def predicate(value):
+            started.set()
+            return gate.wait() and value < 10
+        proxy.set_filter(predicate, background=True)
+        started.wait()
+        source[0] = 50
+        source.insert(1, 5)
+        del source[50]
+        source.move(90, 2)
+        source.append(3)
+        gate.set()
+        for _ in range(1000):
+            app.processEvents()
+            if resets:
+                break
+            QtCore.QThread.msleep(1)
+        assert proxy == [value for value in source if value < 10]
+        assert resets == [len(proxy)]
+        source.insert(0, 1)
+        assert proxy[0] == 1
@@ -0,0 +1,73 @@
+"""This module contains all of the tests for the LazyListModel class in lazylistmodel.py"""
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.lazylistmodel import LazyListModel
+
+class TestLazyListModel:
+    """This class has all the tests that should run for LazyListModel."""
+
+    def test_fetch_more(self):
+        """Test that views pull rows in batches."""
+        read = []
+        def source():
+            for value in range(10):
+                read.append(value)
+                yield value
+        test_list = LazyListModel(source(), batch_size=4)
+        parent = QtCore.QModelIndex()
+        assert read == []
+        assert test_list.canFetchMore(parent)
+        test_list.fetchMore(parent)
+        assert test_list.rowCount(parent) == 4
+        test_list.fetchMore(parent)
+        test_list.fetchMore(parent)
+        assert test_list.rowCount(parent) == 10
+        assert not test_list.canFetchMore(parent)
+
+    def test_list_interface(self):
+        """Test that the list interface reads only what it needs."""
+        test_list = LazyListModel(iter(range(100)), batch_size=10)
+        assert test_list[15] == 15
+        assert test_list.rowCount(QtCore.QModelIndex()) == 20
+        for value in test_list:
+            if value == 25:
+                break
+        assert test_list.rowCount(QtCore.QModelIndex()) == 30
+        assert test_list[-1] == 99
+        assert len(test_list) == 100
+        test_list.append(100)
+        assert test_list == list(range(101))
+
+    def test_chunked(self):
+        """Test a source that yields chunks of values."""
+        test_list = LazyListModel([[1, 2], [3], [], [4, 5]], chunked=True)
+        assert list(test_list) == [1, 2, 3, 4, 5]
+
+    def test_assign(self):
+        """Test that assign replaces every value, not only the loaded ones."""
+        test_list = LazyListModel(iter(range(6)), batch_size=2)
+        assert test_list[0] == 0
+        test_list.assign(['a', 'b'])
+        assert test_list == ['a', 'b'] and test_list.exhausted
+
+    def test_reordering(self):
+        """Test that reordering methods work on every value of the source."""
+        test_list = LazyListModel(iter(range(6)), batch_size=2)
+        assert test_list[0] == 0
+        test_list.sort(reverse=True)
+        assert test_list == [5, 4, 3, 2, 1, 0]
+        for method, args, expected in [('reverse', (), [5, 4, 3, 2, 1, 0]),
+                                       ('move', (0, 3), [1, 2, 3, 0, 4, 5]),
+                                       ('move_range', (4, 5, 0), [4, 5, 0, 1, 2, 3]),
+                                       ('rotate', (2,), [4, 5, 0, 1, 2, 3])]:
+            test_list = LazyListModel(iter(range(6)), batch_size=2)
+            assert test_list[0] == 0
+            getattr(test_list, method)(*args)
+            assert test_list == expected
+
+    def test_snapshot(self):
+        """Test that a snapshot holds the values that were not read yet."""
+        test_list = LazyListModel(iter(range(6)), batch_size=2)
+        assert test_list[0] == 0
+        snapshot = test_list.snapshot()
+        test_list[5] = 'x'
+        assert list(snapshot) == [0, 1, 2, 3, 4, 5]
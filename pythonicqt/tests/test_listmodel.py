@@ -1,6 +1,10 @@
 """This module contains all of the tests for the ListModel class in listmodel.py"""
+import copy
+import threading
 import pytest
+from pythonicqt.Qt import QtCore
 from pythonicqt.models.listmodel import ListModel
+from pythonicqt.models.modelitems import CompactItem, ItemContainer
 
 class TestListModel:
     """This class has all the tests that should run for ListModel."""
@@ -33,4 +37,311 @@ class TestListModel:
         assert test_list[-1] != 3
         
 
-        
\ No newline at end of file
+        
+    def test_extend_insert_many(self):
+        """Test that bulk inserts behave like list and emit one range."""
+        test_list = ListModel([1, 2])
+        ranges = []
+        test_list.ListRangeInserted.connect(lambda first, last: ranges.append((first, last)))
+        test_list.extend([3, 4, 5])
+        assert test_list == [1, 2, 3, 4, 5]
+        assert ranges == [(2, 4)]
+        test_list.insert_many(1, ['a', 'b'])
+        assert test_list == [1, 'a', 'b', 2, 3, 4, 5]
+        assert ranges[-1] == (1, 2)
+        test_list += [6]
+        assert test_list[-1] == 6
+        test_list.extend([])
+        assert len(ranges) == 3
+
+    def test_slices(self):
+        """Test getting, setting and deleting slices like a normal list."""
+        normal_list = list(range(10))
+        test_list = ListModel(normal_list)
+        assert test_list[2:5] == normal_list[2:5]
+        assert test_list[::-3] == normal_list[::-3]
+        for key, values in [(slice(1, 3), ['a', 'b']),
+                            (slice(0, 4), ['c']),
+                            (slice(5, 5), ['d', 'e', 'f']),
+                            (slice(None, None, 2), list('ghijk')),
+                            (slice(-1, -4, -1), [1, 2, 3])]:
+            normal_list[key] = values
+            test_list[key] = values
+            assert test_list == normal_list
+        for key in [slice(8, None), slice(None, None, 3), slice(-1, 0, -2)]:
+            del normal_list[key]
+            del test_list[key]
+            assert test_list == normal_list
+        with pytest.raises(ValueError):
+            test_list[::2] = [1]
+
+    def test_slice_signals(self):
+        """Test that slice operations emit range level notifications."""
+        test_list = ListModel(range(10))
+        changed, removed = [], []
+        test_list.dataChanged.connect(
+            lambda top, bottom, *args: changed.append((top.row(), bottom.row())))
+        test_list.rowsRemoved.connect(
+            lambda parent, first, last: removed.append((first, last)))
+        test_list[2:6] = 'abcd'
+        assert changed == [(2, 5)]
+        del test_list[::2]
+        assert len(removed) == 5
+        removed[:] = []
+        del test_list[1:4]
+        assert removed == [(1, 3)]
+
+    def test_compact_storage(self):
+        """Test that the compact storage engine behaves like the default one."""
+        normal_list = list(range(6))
+        test_list = ListModel(normal_list, item_factory=CompactItem)
+        assert test_list == normal_list
+        index = test_list.index(2, 0)
+        assert test_list.data(index) == u'2'
+        test_list.setData(index, 'blue', QtCore.Qt.ToolTipRole)
+        test_list.insert(0, 'first')
+        del test_list[4]
+        normal_list.insert(0, 'first')
+        del normal_list[4]
+        assert test_list == normal_list
+        #the role moved with its value
+        assert test_list.data(test_list.index(3, 0), QtCore.Qt.ToolTipRole) == 'blue'
+        assert test_list.data(test_list.index(2, 0), QtCore.Qt.ToolTipRole) is None
+        test_list[1:4] = test_list[1:4][::-1]
+        normal_list[1:4] = normal_list[1:4][::-1]
+        assert test_list == normal_list
+        assert test_list.flags(index) == CompactItem.default_data[QtCore.Qt.ItemFlags]
+
+    def test_compact_items_detached(self):
+        """Test that changing an item taken out of compact storage leaves the list alone."""
+        test_list = ListModel(['a'], item_factory=CompactItem)
+        test_list.setData(test_list.index(0, 0), 'tip', QtCore.Qt.ToolTipRole)
+        item = test_list._container[0]
+        item[QtCore.Qt.ToolTipRole] = 'changed'
+        item[QtCore.Qt.EditRole] = 'b'
+        assert test_list == ['a']
+        assert test_list.data(test_list.index(0, 0), QtCore.Qt.ToolTipRole) == 'tip'
+        test_list._container[0] = item
+        assert test_list.data(test_list.index(0, 0), QtCore.Qt.ToolTipRole) == 'changed'
+
+    def test_display_cache(self):
+        """Test that display strings are cached until the value changes."""
+        calls = []
+        def formatter(value):
+            calls.append(value)
+            return u'<{}>'.format(value)
+        factory = ItemContainer.with_display_cache(maxsize=2, formatter=formatter)
+        test_list = ListModel([1, 2, 3], item_factory=factory)
+        index = test_list.index(0, 0)
+        assert test_list.data(index) == u'<1>'
+        assert test_list.data(index) == u'<1>'
+        assert calls == [1]
+        test_list[0] = 5
+        assert test_list.data(index) == u'<5>'
+        test_list.data(test_list.index(1, 0))
+        test_list.data(test_list.index(2, 0))
+        assert len(factory.display_cache) == 2
+
+    def test_batch(self):
+        """Test that a batch coalesces its change notifications."""
+        test_list = ListModel(range(10))
+        changed, inserted, resets = [], [], []
+        test_list.dataChanged.connect(
+            lambda top, bottom, *args: changed.append((top.row(), bottom.row())))
+        test_list.rowsInserted.connect(lambda *args: inserted.append(args))
+        test_list.modelReset.connect(lambda: resets.append(True))
+        with test_list.batch():
+            test_list[2] = 'a'
+            test_list[3] = 'b'
+            test_list[7] = 'c'
+            test_list.insert(0, 'first')
+            assert changed == []
+        assert changed == [(3, 4), (8, 8)]
+        assert len(inserted) == 1
+        with test_list.batch(range_threshold=1, reset_threshold=2):
+            test_list[0] = 1
+            test_list[5] = 5
+            for value in range(5):
+                test_list.append(value)
+        assert test_list[-5:] == list(range(5))
+        assert len(inserted) == 3
+        assert resets == [True]
+        del changed[:]
+        with test_list.batch(range_threshold=1):
+            test_list[1] = 1
+            test_list[4] = 4
+        assert changed == [(1, 4)]
+
+    def test_value_index(self):
+        """Test that the value index stays correct through changes."""
+        normal_list = [1, 2, 3, 2, [4]]
+        test_list = ListModel(normal_list)
+        test_list.use_value_index()
+        assert test_list.index_of(2) == 1
+        assert test_list.count(2) == 2
+        assert [4] in test_list
+        operations = [lambda l: l.append(2),
+                      lambda l: l.insert(0, 2),
+                      lambda l: l.__setitem__(2, 'x'),
+                      lambda l: l.__delitem__(1),
+                      lambda l: l.__setitem__(slice(0, 2), [[4], 7]),
+                      lambda l: l.pop()]
+        for operation in operations:
+            operation(normal_list)
+            operation(test_list)
+            assert test_list == normal_list
+            for value in [1, 2, 3, 'x', 7, [4], 'missing']:
+                assert (value in test_list) == (value in normal_list)
+                assert test_list.count(value) == normal_list.count(value)
+                if value in normal_list:
+                    assert test_list.index_of(value) == normal_list.index(value)
+        with pytest.raises(ValueError):
+            test_list.index_of('missing')
+
+    def test_value_index_identity(self):
+        """Test that the value index finds values by identity first, like list."""
+        nan = float('nan')
+        test_list = ListModel([1.0, nan, 2.0])
+        test_list.use_value_index()
+        assert nan in test_list and test_list.index_of(nan) == 1
+        assert test_list.count(nan) == 1 and float('nan') not in test_list
+
+    def test_value_index_rebuild(self):
+        """Test that edits in the middle scan until lookups repeat, then rebuild."""
+        test_list = ListModel(range(10))
+        test_list.use_value_index()
+        value_index = test_list._value_index
+        assert test_list.index_of(9) == 9 and not value_index.dirty
+        for value in range(3):
+            test_list.insert(0, 'new')
+            assert test_list.index_of(9) == 10 + value
+            assert value_index.dirty
+        for _ in range(value_index.rebuild_after):
+            assert test_list.count('new') == 3
+        assert not value_index.dirty and value_index.positions['new'] == [0, 1, 2]
+
+    def test_assign(self):
+        """Test that assign reaches the new list with few row operations."""
+        test_list = ListModel(['a', 'b', 'c', 'd', 'e'])
+        index = test_list.index(1, 0)
+        test_list.setData(index, 'tip', QtCore.Qt.ToolTipRole)
+        moves, removes, inserts = [], [], []
+        test_list.rowsMoved.connect(lambda *args: moves.append(args))
+        test_list.rowsRemoved.connect(lambda *args: removes.append(args))
+        test_list.rowsInserted.connect(lambda *args: inserts.append(args))
+        test_list.assign(['c', 'd', 'x', 'y', 'e', 'b'])
+        assert test_list == ['c', 'd', 'x', 'y', 'e', 'b']
+        assert len(moves) == 1 and len(removes) == 1 and len(inserts) == 1
+        #'b' kept its role through the move
+        assert test_list.data(test_list.index(5, 0), QtCore.Qt.ToolTipRole) == 'tip'
+        records = [{'id': 1, 'v': 'one'}, {'id': 2, 'v': 'two'}, {'id': 1, 'v': 'uno'}]
+        #errors raised by key are not mistaken for unhashable keys.
+        with pytest.raises(TypeError):
+            test_list.assign(records[:2], key=lambda record: record['id'])
+        test_list.assign(records[:2])
+        test_list.assign([records[1], records[2]], key=lambda record: record['id'])
+        assert test_list == [records[1], records[2]]
+        test_list.assign([[1], [2]])
+        assert test_list == [[1], [2]]
+
+    def test_assign_large_reorder(self):
+        """Test that assign reaches a shuffled order of many rows, moving each
+        row that is not on the longest increasing run once."""
+        values = list(range(2000))
+        test_list = ListModel(values)
+        test_list.setData(test_list.index(0, 0), 'tip', QtCore.Qt.ToolTipRole)
+        moves = []
+        move_rows = test_list._move_rows
+        def counted_move_rows(first, last, to):
+            moves.append(first)
+            move_rows(first, last, to)
+        test_list._move_rows = counted_move_rows
+        shuffled = values[1::2] + values[::2][::-1]
+        test_list.assign(shuffled)
+        assert test_list == shuffled
+        assert len(moves) == 1000
+        assert test_list.data(test_list.index(1999, 0), QtCore.Qt.ToolTipRole) == 'tip'
+
+    def test_clear_reset(self):
+        """Test that clear and reset use one model reset."""
+        test_list = ListModel(range(5))
+        resets, cleared = [], []
+        test_list.modelReset.connect(lambda: resets.append(True))
+        test_list.ListCleared.connect(lambda: cleared.append(True))
+        test_list.clear()
+        assert test_list == []
+        assert len(resets) == len(cleared) == 1
+        test_list.reset(['a', 'b'])
+        assert test_list == ['a', 'b']
+        with test_list.batch():
+            test_list.append('c')
+            test_list.clear()
+            test_list.append('d')
+        assert test_list == ['d']
+        assert len(resets) == 3
+
+    def test_reorder(self):
+        """Test sort, reverse, move and rotate keep roles and persistent indexes."""
+        normal_list = [3, 1, 4, 1, 5, 9, 2, 6]
+        test_list = ListModel(normal_list)
+        test_list.setData(test_list.index(5, 0), 'nine', QtCore.Qt.ToolTipRole)
+        persistent = QtCore.QPersistentModelIndex(test_list.index(5, 0))
+        test_list.sort()
+        normal_list.sort()
+        assert test_list == normal_list
+        assert persistent.row() == 7
+        assert test_list.data(test_list.index(7, 0), QtCore.Qt.ToolTipRole) == 'nine'
+        test_list.sort(key=lambda value: -value, reverse=True)
+        test_list.reverse()
+        normal_list.reverse()
+        assert test_list == normal_list
+        assert persistent.row() == 0
+        test_list.move(0, 3)
+        normal_list.insert(3, normal_list.pop(0))
+        assert test_list == normal_list
+        assert persistent.row() == 3
+        test_list.move_range(0, 1, 6)
+        normal_list[6:6] = [normal_list.pop(0), normal_list.pop(0)]
+        assert test_list == normal_list
+        test_list.rotate(3)
+        normal_list = normal_list[-3:] + normal_list[:-3]
+        assert test_list == normal_list
+        with pytest.raises(IndexError):
+            test_list.move_range(5, 7, 6)
+
+    def test_copy(self):
+        """Test that copies keep the item_factory and have their own items."""
+        model = ListModel([[1], [2]], item_factory=CompactItem)
+        model.setData(model.index(0, 0), 'tip', QtCore.Qt.ToolTipRole)
+        shallow = copy.copy(model)
+        deep = copy.deepcopy(model)
+        assert shallow == [[1], [2]] and deep == [[1], [2]]
+        assert shallow._item_factory is CompactItem
+        assert deep.data(deep.index(0, 0), QtCore.Qt.ToolTipRole) == 'tip'
+        shallow.setData(shallow.index(0, 0), 'other', QtCore.Qt.ToolTipRole)
+        assert model.data(model.index(0, 0), QtCore.Qt.ToolTipRole) == 'tip'
+        model[1].append(3)
+        assert shallow[1] == [2, 3] and deep[1] == [2]
+
+    def test_snapshot(self):
+        """Test that snapshots keep their values and only copy changed chunks."""
+        model = ListModel(range(10))
+        model.snapshot_chunk_size = 4
+        snapshot = model.snapshot()
+        model.append(10)
+        assert snapshot._chunks == {}
+        model[5] = 'five'
+        assert sorted(snapshot._chunks) == [1]
+        model.insert(9, 'nine')
+        del model[0]
+        model.sort(key=str)
+        assert snapshot == list(range(10))
+        assert snapshot._container is None
+        later = model.snapshot()
+        values = list(model)
+        results = []
+        worker = threading.Thread(target=lambda: results.append(list(later)))
+        worker.start()
+        model.reverse()
+        worker.join()
+        assert results == [values] and later[-1] == values[-1]
@@ -0,0 +1,61 @@
+"""This module contains all of the tests for the MappedListModel class in mappedmodel.py"""
+import struct
+import pytest
+from pythonicqt.models.mappedmodel import MappedListModel
+
+def write_records(path, values, header=b''):
+    """Writes a header and one '<i' record per value."""
+    with open(str(path), 'wb') as capture:
+        capture.write(header)
+        for value in values:
+            capture.write(struct.pack('<i', value))
+
+class TestMappedListModel:
+    """This class has all the tests that should run for MappedListModel."""
+
+    def test_records(self, tmpdir):
+        """Test that records are decoded on demand and cached."""
+        path = tmpdir.join('capture.bin')
+        write_records(path, range(100), header=b'HEAD')
+        model = MappedListModel(str(path), '<i', header_size=4, cache_size=8)
+        assert len(model) == model.rowCount() == 100
+        assert model[5] == 5 and model[-1] == 99
+        assert model[10:20:5] == [10, 15]
+        assert model.data(model.index(42, 0)) == u'42'
+        assert len(model._cache) == 3
+        for row in range(20):
+            model[row]
+        assert len(model._cache) == 8
+        assert list(model)[:3] == [0, 1, 2]
+        assert model.index_of(7) == 7
+        with pytest.raises(IndexError):
+            model[100]
+        with pytest.raises(TypeError):
+            model[0] = 1
+        model.close()
+
+    def test_decoder_refresh(self, tmpdir):
+        """Test a custom decoder and reading records appended to the file."""
+        path = tmpdir.join('capture.bin')
+        write_records(path, range(3))
+        model = MappedListModel(str(path), decoder=lambda data: data[::-1], record_size=4)
+        assert model[1] == struct.pack('>i', 1)
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        with open(str(path), 'ab') as capture:
+            capture.write(struct.pack('<i', 3) * 2)
+        model.refresh()
+        assert inserted == [(3, 4)] and len(model) == 5
+        model.close()
+
+    def test_writable(self, tmpdir):
+        """Test that a writable model writes records back to the file."""
+        path = tmpdir.join('capture.bin')
+        write_records(path, range(4))
+        model = MappedListModel(str(path), '<i', writable=True)
+        assert model.setData(model.index(2, 0), 20)
+        model[-1] = 30
+        model.close()
+        reopened = MappedListModel(str(path), '<i')
+        assert reopened[:] == [0, 1, 20, 30]
+        reopened.close()
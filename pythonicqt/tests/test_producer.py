@@ -0,0 +1,84 @@
+"""This module contains all of the tests for the ListProducer class in producer.py"""
+import threading
+import pytest
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.listmodel import ListModel
+from pythonicqt.models.producer import ListProducer, QueueFull
+
+#QTimers need an application.
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+class TestListProducer:
+    """This class has all the tests that should run for ListProducer."""
+
+    def test_worker_threads(self):
+        """Test that changes from worker threads are applied in batches."""
+        model = ListModel([0, 0])
+        producer = ListProducer(model)
+        drains = []
+        producer.Drained.connect(drains.append)
+        def work(offset):
+            for value in range(100):
+                producer.append(offset + value)
+        workers = [threading.Thread(target=work, args=(offset,)) for offset in (0, 1000)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        producer.update(0, 'first')
+        producer.insert(1, 'second')
+        producer.flush()
+        assert model[:2] == ['first', 'second']
+        assert sorted(model[3:]) == list(range(100)) + list(range(1000, 1100))
+        assert drains == [202]
+        stats = producer.stats()
+        assert stats['applied'] == stats['enqueued'] == 202
+        assert stats['queue_depth'] == 0
+
+    def test_overflow(self):
+        """Test the drop_oldest and blocking overflow policies."""
+        model = ListModel()
+        producer = ListProducer(model, max_size=3, overflow='drop_oldest')
+        producer.extend(range(5))
+        producer.flush()
+        assert model == [2, 3, 4]
+        assert producer.stats()['dropped'] == 2
+        blocking = ListProducer(model, max_size=1, timeout=0.01)
+        blocking.append(5)
+        with pytest.raises(QueueFull):
+            blocking.append(6)
+
+    def test_failed_change(self):
+        """Test that a change that raises does not stop the producer."""
+        model = ListModel()
+        producer = ListProducer(model, max_per_drain=1, interval=0)
+        producer.update(5, 'missing row')
+        producer.append(1)
+        with pytest.raises(IndexError):
+            producer.flush()
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        while model != [1] and timer.elapsed() < 1000:
+            app.processEvents()
+        assert model == [1] and producer.stats()['errors'] == 1
+        producer.append(2)
+        app.processEvents()
+        assert model == [1, 2]
+
+    def test_single_chain(self):
+        """Test that wake ups queued before a flush do not start extra drains."""
+        model = ListModel()
+        producer = ListProducer(model, max_per_drain=1, interval=50)
+        drains = []
+        producer.Drained.connect(drains.append)
+        producer.extend('ab')
+        producer.flush()
+        producer.extend('cde')
+        del drains[:]
+        app.processEvents()
+        assert drains == [1] and model == list('abc')
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        while len(model) < 5 and timer.elapsed() < 1000:
+            app.processEvents()
+        assert model == list('abcde') and drains == [1, 1, 1]
@@ -0,0 +1,75 @@
+"""This module contains all of the tests for the SortedListModel class in sortedlistmodel.py"""
+import pytest
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.sortedlistmodel import SortedListModel
+
+class TestSortedListModel:
+    """This class has all the tests that should run for SortedListModel."""
+
+    def test_sorted(self):
+        """Test that values are kept in key order."""
+        model = SortedListModel([5, 1, 3], key=lambda value: -value)
+        assert model == [5, 3, 1]
+        assert model.add(4) == 1
+        model.append(0)
+        assert model == [5, 4, 3, 1, 0]
+        assert model.index_of(3) == 2 and model.count(3) == 1 and 2 not in model
+        model.remove(4)
+        model.discard(42)
+        assert model == [5, 3, 1, 0]
+        with pytest.raises(ValueError):
+            model.insert(0, 1)
+        model.insert(0, 9)
+        assert model[0] == 9
+        with pytest.raises(TypeError):
+            model.reverse()
+        with pytest.raises(TypeError):
+            model[0:1] = [9]
+
+    def test_update_ranges(self):
+        """Test that update inserts each run of values as one range."""
+        model = SortedListModel([10, 20, 30])
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.update([25, 1, 2, 22, 40])
+        assert model == [1, 2, 10, 20, 22, 25, 30, 40]
+        #the last run is inserted first, so every range is in the rows before the update.
+        assert inserted == [(3, 3), (2, 3), (0, 1)]
+
+    def test_reposition(self):
+        """Test that changing a value moves its row and keeps its roles."""
+        model = SortedListModel(range(0, 50, 10))
+        moved, changed = [], []
+        model.rowsMoved.connect(lambda parent, first, last, dest, row: moved.append((first, row)))
+        model.ListChanged.connect(lambda row, previous: changed.append((row, previous)))
+        model.setData(model.index(0, 0), 'tip', QtCore.Qt.ToolTipRole)
+        model[0] = 35
+        assert model == [10, 20, 30, 35, 40]
+        assert moved == [(0, 4)]
+        assert changed == [(3, 0)]
+        assert model.data(model.index(3, 0), QtCore.Qt.ToolTipRole) == 'tip'
+        model.setData(model.index(4, 0), 15)
+        assert model == [10, 15, 20, 30, 35]
+        model.assign([35, 5, 30])
+        assert model == [5, 30, 35]
+        assert model.data(model.index(2, 0), QtCore.Qt.ToolTipRole) == 'tip'
+
+    def test_irange(self):
+        """Test the range queries between keys."""
+        model = SortedListModel([1, 3, 3, 5, 7, 9])
+        assert list(model.irange(3, 7)) == [3, 3, 5, 7]
+        assert list(model.irange(3, 7, inclusive=(False, False))) == [5]
+        assert list(model.irange(None, 2)) == [1]
+        assert list(model.rows_between(8)) == [5]
+
+    def test_foreign_values(self):
+        """Test that values without a comparable key are reported missing."""
+        model = SortedListModel([{'price': 2}, {'price': 1}], key=lambda order: order['price'])
+        assert {'price': 1} in model and model.index_of({'price': 2}) == 1
+        assert 'AAPL' not in model and model.count(None) == 0
+        numbers = SortedListModel([3, 1, 2])
+        assert 'two' not in numbers
+        with pytest.raises(ValueError):
+            numbers.index_of('two')
+        numbers.assign([5, 1, 4])
+        assert numbers == [1, 4, 5]
@@ -0,0 +1,61 @@
+"""This module contains all of the tests for the SparseTableModel class in sparsemodel.py"""
+import pytest
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.sparsemodel import SparseTableModel
+
+class TestSparseTableModel:
+    """This class has all the tests that should run for SparseTableModel."""
+
+    def test_sparse_cells(self):
+        """Test that only populated cells are stored."""
+        model = SparseTableModel(1000000, 1000, cells={(3, 4): 'a'})
+        assert (model.rowCount(), model.columnCount()) == (1000000, 1000)
+        assert model[3, 4] == 'a'
+        assert model[999999, 999] is None
+        assert model.data(model.index(10, 10)) == u''
+        assert len(model) == 1
+        model[500000, 7] = 'b'
+        assert sorted(model.iter_cells()) == [(3, 4, 'a'), (500000, 7, 'b')]
+        assert (3, 4) in model and (4, 3) not in model
+        del model[3, 4]
+        assert len(model) == 1
+        with pytest.raises(IndexError):
+            model[1000000, 0] = 'outside'
+
+    def test_blocks(self):
+        """Test that block updates emit one dataChanged each."""
+        model = SparseTableModel(100, 100)
+        changed = []
+        model.dataChanged.connect(
+            lambda top, bottom, *args: changed.append((top.row(), top.column(),
+                                                       bottom.row(), bottom.column())))
+        model.update_block(10, 20, [[1, 2, 3], [4, None, 6]])
+        assert changed == [(10, 20, 11, 22)]
+        assert len(model) == 5
+        model.setData(model.index(11, 21), 'tip', QtCore.Qt.ToolTipRole)
+        assert model.data(model.index(11, 21), QtCore.Qt.ToolTipRole) == 'tip'
+        model.clear_block(10, 20, 10, 22)
+        assert len(model) == 3
+        model.resize(12, 21)
+        assert sorted(model) == [(11, 20)]
+
+    def test_set_default(self):
+        """Test that writing default_value empties a cell unless it has other roles."""
+        model = SparseTableModel(10, 10, cells={(1, 1): 'a', (2, 2): 'b', (3, 3): 'c'},
+                                 default_value=0)
+        changed = []
+        model.dataChanged.connect(
+            lambda top, bottom, *args: changed.append((top.row(), top.column())))
+        assert model.setData(model.index(1, 1), 0)
+        model[2, 2] = 0
+        model.update_block(3, 3, [[0]])
+        assert len(model) == 0 and model[1, 1] == 0
+        assert changed == [(1, 1), (2, 2), (3, 3)]
+        model.setData(model.index(4, 4), 'tip', QtCore.Qt.ToolTipRole)
+        assert (4, 4) in model and model[4, 4] == 0
+        model[4, 4] = 5
+        model[4, 4] = 0
+        assert (4, 4) in model
+        assert model.data(model.index(4, 4), QtCore.Qt.ToolTipRole) == 'tip'
+        with pytest.raises(IndexError):
+            model.clear_block(0, 0, 10, 10)
@@ -0,0 +1,65 @@
+"""This module contains all of the tests for the TableModel class in table_model.py"""
+import pytest
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.table_model import TableModel
+
+class TestTableModel:
+    """This class has all the tests that should run for TableModel."""
+
+    def test_rows_and_columns(self):
+        """Test the list of rows and dictionary of columns interface."""
+        test_table = TableModel([('a', 1.0), ('b', 2.0)], columns=['symbol', 'price'],
+                                typecodes=[None, 'd'])
+        assert test_table == [['a', 1.0], ['b', 2.0]]
+        assert (test_table.rowCount(), test_table.columnCount()) == (2, 2)
+        test_table.append(('c', 3.0))
+        assert test_table['price'] == [1.0, 2.0, 3.0]
+        test_table['price'] = [4, 5, 6]
+        assert test_table[-1] == ['c', 6.0]
+        test_table[0] = ('z', 0)
+        assert test_table.as_dict() == {'symbol': ['z', 'b', 'c'], 'price': [0.0, 5.0, 6.0]}
+        with pytest.raises(ValueError):
+            test_table.append(('too', 'many', 'values'))
+        test_table.insert_column(1, 'size', [10, 20, 30])
+        assert test_table[1] == ['b', 20, 5.0]
+        del test_table['symbol']
+        del test_table[::2]
+        assert test_table == [[20, 5.0]]
+
+    def test_headers(self):
+        """Test that headers are computed and overrides follow their sections."""
+        test_table = TableModel([[1, 2], [3, 4], [5, 6]], columns=['x', None])
+        assert test_table.headerData(0, QtCore.Qt.Horizontal) == u'x'
+        assert test_table.headerData(1, QtCore.Qt.Horizontal) == u'1'
+        assert test_table.headerData(2, QtCore.Qt.Vertical) == u'2'
+        test_table.setHeaderData(2, QtCore.Qt.Vertical, 'last')
+        test_table.setData(test_table.index(2, 1), 'tip', QtCore.Qt.ToolTipRole)
+        del test_table[0]
+        assert test_table.headerData(1, QtCore.Qt.Vertical) == 'last'
+        assert test_table.data(test_table.index(1, 1), QtCore.Qt.ToolTipRole) == 'tip'
+        assert test_table.data(test_table.index(1, 1)) == u'6'
+
+    def test_bad_value_changes_nothing(self):
+        """Test that a value that does not fit a typed column leaves the table unchanged."""
+        test_table = TableModel([('a', 1.0)], columns=['symbol', 'price'], typecodes=[None, 'd'])
+        inserted = []
+        test_table.rowsInserted.connect(lambda parent, first, last: inserted.append(first))
+        with pytest.raises(TypeError):
+            test_table.append(('b', 'not a number'))
+        with pytest.raises(TypeError):
+            test_table[0] = ('z', 'not a number')
+        assert test_table.as_dict() == {'symbol': ['a'], 'price': [1.0]}
+        test_table.append(('c', 3.0))
+        assert test_table == [['a', 1.0], ['c', 3.0]] and inserted == [1]
+
+    def test_set_data_rejects(self):
+        """Test that setData returns False for values a typed column can not hold."""
+        test_table = TableModel([('a', 1)], columns=['symbol', 'size'], typecodes=[None, 'b'])
+        assert not test_table.setData(test_table.index(0, 1), 'x')
+        assert not test_table.setData(test_table.index(0, 1), 1000)
+        assert test_table.setData(test_table.index(0, 1), 7)
+        assert test_table == [['a', 7]]
+        test_table.remove_column(0)
+        assert test_table == [[7]]
+        with pytest.raises(IndexError):
+            test_table.remove_column(1)
@@ -0,0 +1,61 @@
+"""This module contains all of the tests for the TreeModel class in treemodel.py"""
+import pytest
+from pythonicqt.Qt import QtCore
+from pythonicqt.models.treemodel import TreeModel
+
+class TestTreeModel:
+    """This class has all the tests that should run for TreeModel."""
+
+    def test_nested_interface(self):
+        """Test the nested dictionary and list interface."""
+        model = TreeModel({'a': {'b': [1, 2]}, 'c': 3})
+        assert model['a']['b'].values() == [1, 2]
+        assert model['c'].value == 3
+        model['a']['b'].append(4)
+        assert model['a']['b'][-1].value == 4
+        b_index = model.node_index(model['a']['b'])
+        assert model.rowCount(b_index) == 3
+        child_index = model.index(2, 0, b_index)
+        assert model.data(child_index) == u'4'
+        assert model.parent(child_index) == b_index
+        assert model.parent(b_index) == model.node_index(model['a'])
+        with pytest.raises(ValueError):
+            model['a'].append('c', key='b')
+        del model['a']['b'][0]
+        assert model['a']['b'].values() == [2, 4]
+        assert model['a']['b'][1].row == 1
+
+    def test_lazy_loading(self):
+        """Test that children are loaded only when they are needed."""
+        loaded = []
+        def loader(node):
+            loaded.append(node.value)
+            return ['{}/{}'.format(node.value or '', name) for name in 'xyz']
+        model = TreeModel(loader=loader, has_children=lambda node: node.value.count('/') < 2)
+        root = QtCore.QModelIndex()
+        assert model.rowCount(root) == 0
+        assert model.canFetchMore(root)
+        model.fetchMore(root)
+        assert model.rowCount(root) == 3 and loaded == [None]
+        x_index = model.index(0, 0, root)
+        assert model.hasChildren(x_index) and model.canFetchMore(x_index)
+        assert model['/x']['/x/y'].value == '/x/y'
+        leaf_index = model.node_index(model['/x']['/x/y'])
+        assert not model.hasChildren(leaf_index) and not model.canFetchMore(leaf_index)
+        assert loaded == [None, '/x']
+        plain = TreeModel(loader=lambda node: [])
+        plain.fetchMore(root)
+        assert plain.rowCount(root) == 0 and not plain.hasChildren(root)
+        model.unload(x_index)
+        assert model.rowCount(x_index) == 0 and model.canFetchMore(x_index)
+
+    def test_duplicate_values(self):
+        """Test that children with the same value are kept and found by key."""
+        model = TreeModel({'a': ['x', 'x', 'y']}, loader=lambda node: ['z', 'z'])
+        assert model['a'].values() == ['x', 'x', 'y']
+        assert model['a']['x'] is model['a'][0]
+        del model['a'][0]
+        assert model['a']['x'] is model['a'][0]
+        assert model['a']['y'].values() == ['z', 'z']
+        with pytest.raises(ValueError):
+            model['a'].append('w', key='y')
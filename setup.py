@@ -71,6 +71,7 @@ setup(
     tests_require=['pytest'],
     cmdclass = {'test': PyTest},
     install_requires=['PySide>=1.2.1', 'six>=1.8.0'],
+    extras_require={'numpy': ['numpy']},
     license='MIT License',
     zip_safe=False,
     classifiers=(